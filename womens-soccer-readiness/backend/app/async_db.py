@@ -0,0 +1,66 @@
+"""
+Async database path (asyncpg for PostgreSQL, aiosqlite for local SQLite).
+
+Why bother? Dashboard reads are mostly waiting on the database. A sync route
+holds a threadpool worker for that whole wait; an async route gives the event
+loop back, so one worker can serve many concurrent dashboards.
+
+Enabled with USE_ASYNC_DB=true. The engine is only created then, so the
+async drivers are not needed for the default sync deployment.
+"""
+import time
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from .config import settings
+from . import metrics
+from .db import DATABASE_URL, REPLICA_URL, _engine_options, configure_sqlite
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def to_async_url(url: str) -> str:
+    """Swap the sync driver in a database URL for its async counterpart."""
+    scheme, sep, rest = url.partition("://")
+    return ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
+def _create_async_engine(url: str) -> AsyncEngine:
+    options = _engine_options(url)
+    # check_same_thread is a sqlite3 option; aiosqlite runs its own thread
+    options.pop("connect_args", None)
+    async_engine = create_async_engine(to_async_url(url), **options)
+    configure_sqlite(async_engine.sync_engine)
+    metrics.instrument_engine(async_engine.sync_engine)
+    return async_engine
+
+async_engine: Optional[AsyncEngine] = None
+async_read_engine: Optional[AsyncEngine] = None
+AsyncSessionLocal: Optional[async_sessionmaker] = None
+AsyncReadSessionLocal: Optional[async_sessionmaker] = None
+
+if settings.use_async_db:
+    async_engine = _create_async_engine(DATABASE_URL)
+    async_read_engine = _create_async_engine(REPLICA_URL) if REPLICA_URL else async_engine
+    # expire_on_commit=False: attribute access after commit would need
+    # an implicit (sync) refresh, which async sessions cannot do
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+
+async def _async_session_for_request(session_factory, pool_name: str):
+    async with session_factory() as db:
+        start = time.perf_counter()
+        await db.connection()
+        metrics.observe_pool_wait(time.perf_counter() - start, pool_name)
+        yield db
+
+async def get_async_db():
+    """Async counterpart of db.get_db."""
+    async for db in _async_session_for_request(AsyncSessionLocal, "primary"):
+        yield db
+
+async def get_async_read_db():
+    """Async counterpart of db.get_read_db."""
+    async for db in _async_session_for_request(AsyncReadSessionLocal, "replica" if REPLICA_URL else "primary"):
+        yield db
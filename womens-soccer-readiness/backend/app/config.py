@@ -11,7 +11,70 @@ class Settings(BaseSettings):
     
     # For local development with SQLite (can be toggled)
     use_sqlite: bool = os.getenv("USE_SQLITE", "false").lower() == "true"
-    sqlite_url: str = "sqlite:///./soccer_app.db"
+    sqlite_url: str = os.getenv("SQLITE_URL", "sqlite:///./soccer_app.db")
+    
+    # SQLite tuning (applied to every new connection, see db.py).
+    # WAL lets dashboards read while an import writes; synchronous=NORMAL
+    # is durable in WAL mode except for the last commits on power loss.
+    sqlite_synchronous: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    sqlite_cache_size_mb: int = int(os.getenv("SQLITE_CACHE_SIZE_MB", "64"))
+    sqlite_mmap_size_mb: int = int(os.getenv("SQLITE_MMAP_SIZE_MB", "256"))
+    sqlite_busy_timeout_ms: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    
+    # Connection pool (PostgreSQL only). The SQLAlchemy default of 5 + 10
+    # overflow is exhausted on match days and requests start queueing.
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    db_pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", "10"))  # seconds to wait for a connection
+    db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds before a connection is replaced
+    db_pool_pre_ping: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    
+    # Serve list and readiness routes through the async engine
+    # (asyncpg / aiosqlite) instead of the threadpool
+    use_async_db: bool = os.getenv("USE_ASYNC_DB", "false").lower() == "true"
+    
+    # Optional read replica for list, export and readiness-read routes.
+    # Unset means reads go to the primary.
+    database_replica_url: Optional[str] = os.getenv("DATABASE_REPLICA_URL")
+    
+    # Monthly partitions of training_sessions / wellness_checks (PostgreSQL).
+    # Detach is off (0) unless a retention window in months is set.
+    partition_months_ahead: int = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+    partition_detach_after_months: int = int(os.getenv("PARTITION_DETACH_AFTER_MONTHS", "0"))
+    
+    # Retention (database/run_retention.py). Seasons older than the newest
+    # `retention_seasons` move to per-team Parquet files; 0 keeps everything.
+    retention_seasons: int = int(os.getenv("RETENTION_SEASONS", "0"))
+    season_start_month: int = int(os.getenv("SEASON_START_MONTH", "1"))  # 1 = calendar-year seasons
+    archive_dir: str = os.getenv("ARCHIVE_DIR", "./archive")
+    retention_batch_size: int = int(os.getenv("RETENTION_BATCH_SIZE", "2000"))  # rows per DELETE
+    
+    # Nightly readiness for every team (database/run_readiness.py): worker
+    # processes, connections each worker may hold, and tries per team
+    scheduler_workers: int = int(os.getenv("SCHEDULER_WORKERS", str(min(os.cpu_count() or 1, 8))))
+    scheduler_worker_connections: int = int(os.getenv("SCHEDULER_WORKER_CONNECTIONS", "1"))
+    scheduler_max_attempts: int = int(os.getenv("SCHEDULER_MAX_ATTEMPTS", "3"))
+    
+    # Season snapshots (Arrow files per team) rewritten after each team
+    # readiness refresh and memory-mapped by GET /teams/{id}/snapshot
+    snapshot_dir: str = os.getenv("SNAPSHOT_DIR", "./snapshots")
+    
+    # Per-team season arrays (app/services/season_store.py) cached by read
+    # paths such as plan simulation; reloaded after this many seconds so
+    # writes made by other workers show up
+    season_store_ttl: int = int(os.getenv("SEASON_STORE_TTL", "300"))
+    # Memory-mapped season cube files, shared by all processes on a host
+    cube_dir: str = os.getenv("CUBE_DIR", "./cubes")
+    
+    # Readiness flag changes reach SSE streams through the flag_events table:
+    # each API process polls it this often (0 disables) and prunes old rows
+    flag_event_poll_seconds: float = float(os.getenv("FLAG_EVENT_POLL_SECONDS", "1"))
+    flag_event_retention_hours: int = int(os.getenv("FLAG_EVENT_RETENTION_HOURS", "24"))
+    
+    # N+1 query detection per API request (app/nplusone.py): off, warn or
+    # raise when one statement shape runs more than the threshold times
+    n_plus_one_mode: str = os.getenv("N_PLUS_ONE_MODE", "off")
+    n_plus_one_threshold: int = int(os.getenv("N_PLUS_ONE_THRESHOLD", "10"))
     
     # JWT Settings
     secret_key: str = os.getenv("SECRET_KEY", "your-secret-key-here-change-in-production")
@@ -1,16 +1,139 @@
-from sqlalchemy import create_engine
+import math
+import sqlite3
+import time
+from typing import Dict
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
 from .config import settings
+from . import metrics
 
 # Use PostgreSQL by default, SQLite for local dev if specified
 if settings.use_sqlite:
     DATABASE_URL = settings.sqlite_url
-    connect_args = {"check_same_thread": False}
+    REPLICA_URL = None
 else:
     DATABASE_URL = settings.database_url
-    connect_args = {}
+    REPLICA_URL = settings.database_replica_url
 
-engine = create_engine(DATABASE_URL, connect_args=connect_args)
+def _engine_options(url: str) -> Dict:
+    """Pool settings from Settings; SQLite keeps SQLAlchemy's own pooling."""
+    if url.startswith("sqlite"):
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+def _sqlite_pragmas() -> Dict[str, object]:
+    return {
+        "journal_mode": "WAL",
+        "synchronous": settings.sqlite_synchronous,
+        # Negative cache_size is in KiB rather than pages
+        "cache_size": -settings.sqlite_cache_size_mb * 1024,
+        "mmap_size": settings.sqlite_mmap_size_mb * 1024 * 1024,
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+        "temp_store": "MEMORY",
+        # Off by default in SQLite; the ON DELETE CASCADE rules rely on it
+        "foreign_keys": "ON",
+    }
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in _sqlite_pragmas().items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        # SQLite builds without the math functions lack sqrt() (team trends)
+        try:
+            cursor.execute("SELECT sqrt(1)")
+        except sqlite3.OperationalError:
+            dbapi_connection.create_function("sqrt", 1, _sqrt, deterministic=True)
+    finally:
+        cursor.close()
+
+def _sqrt(value):
+    return None if value is None or value < 0 else math.sqrt(value)
+
+def configure_sqlite(engine: Engine) -> None:
+    """Tune every connection of a SQLite engine (WAL, page cache, memory-mapped reads)."""
+    if engine.dialect.name == "sqlite" and not event.contains(engine, "connect", _apply_sqlite_pragmas):
+        event.listen(engine, "connect", _apply_sqlite_pragmas)
+
+engine = create_engine(DATABASE_URL, **_engine_options(DATABASE_URL))
+configure_sqlite(engine)
+metrics.instrument_engine(engine)
+
+# Reads that tolerate replica lag (lists, exports, stored readiness) go here.
+# Without a replica this is simply the primary engine.
+if REPLICA_URL:
+    read_engine = create_engine(REPLICA_URL, **_engine_options(REPLICA_URL))
+    metrics.instrument_engine(read_engine)
+else:
+    read_engine = engine
+
+def create_worker_engine(connections: int, url: str = DATABASE_URL) -> Engine:
+    """
+    A separate engine for a worker process, holding at most `connections`.
+
+    Pooled connections must never cross a fork - parent and child would
+    share one socket. Worker processes (app/services/scheduler.py) build
+    their own engine instead of using `engine`.
+    """
+    options = _engine_options(url)
+    if not url.startswith("sqlite"):
+        options.update(pool_size=connections, max_overflow=0)
+    worker_engine = create_engine(url, **options)
+    configure_sqlite(worker_engine)
+    return worker_engine
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 Base = declarative_base()
+
+def _session_for_request(session_factory, pool_name: str):
+    db = session_factory()
+    try:
+        start = time.perf_counter()
+        db.connection()
+        metrics.observe_pool_wait(time.perf_counter() - start, pool_name)
+        yield db
+    finally:
+        db.close()
+
+# Dependency for DB session
+def get_db():
+    """
+    Yield a primary (read-write) session for one request.
+
+    The connection is checked out up front so the pool wait shows up
+    in /metrics - under load that queue is usually the real latency.
+    """
+    yield from _session_for_request(SessionLocal, "primary")
+
+def get_read_db():
+    """Yield a read-only session, served by the replica when one is configured."""
+    yield from _session_for_request(ReadSessionLocal, "replica" if REPLICA_URL else "primary")
+
+def pool_stats() -> Dict[str, Dict[str, int]]:
+    """Checked-out / idle / overflow counts per pool, for /metrics."""
+    engines = {"primary": engine}
+    if REPLICA_URL:
+        engines["replica"] = read_engine
+
+    stats = {}
+    for name, eng in engines.items():
+        pool = eng.pool
+        if not isinstance(pool, QueuePool):
+            continue
+        stats[name] = {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": settings.db_max_overflow,
+        }
+    return stats
@@ -1,24 +1,57 @@
-from fastapi import FastAPI, Depends
-from app.routes import players
-from . import models
-from .db import engine, SessionLocal, Base
-from sqlalchemy.orm import Session
-from .schemas.player import PlayerCreate
+import time
+_import_started = time.perf_counter()
 
-models.Base.metadata.create_all(bind=engine)
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from app.routes import players, readiness, teams, events, monitoring
+from . import startup
+from .config import settings
+from .metrics import MetricsMiddleware
+from .nplusone import NPlusOneMiddleware
 
-# Dependency for DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# No create_all() here: the schema is owned by Alembic migrations
+# (`alembic upgrade head`, run once per deploy - see database/README.md).
+# Replicas coming up under autoscaling should not race each other on DDL.
 
-app = FastAPI(title="Women's Soccer Readiness App")
-app.include_router(players.router)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.startup_report = startup.report(_import_started, _startup_started)
+    relay = None
+    if settings.flag_event_poll_seconds > 0:
+        # Flag changes scored by any process -> this process's SSE streams
+        from .db import SessionLocal
+        from .services.events import FlagEventRelay, broker
+        relay = FlagEventRelay(SessionLocal, broker, settings.flag_event_poll_seconds,
+                               settings.flag_event_retention_hours)
+        relay.start()
+    yield
+    if relay is not None:
+        relay.stop()
 
-Base.metadata.create_all(bind=engine)
+# orjson encodes UUIDs, dates and datetimes natively and is several
+# times faster than the stdlib encoder on our list endpoints
+app = FastAPI(
+    title="Women's Soccer Readiness App",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
+app.add_middleware(MetricsMiddleware)
+if settings.n_plus_one_mode != "off":
+    app.add_middleware(NPlusOneMiddleware, threshold=settings.n_plus_one_threshold,
+                       mode=settings.n_plus_one_mode)
+
+if settings.use_async_db:
+    app.include_router(players.async_router)
+    app.include_router(readiness.async_router)
+else:
+    app.include_router(players.router)
+    app.include_router(readiness.router)
+app.include_router(teams.router)
+app.include_router(events.router)
+app.include_router(monitoring.router)
+
+_startup_started = time.perf_counter()
 
 
 """ def create_player(name: str, position: str, db: Session = Depends(get_db)):
@@ -27,18 +60,3 @@ Base.metadata.create_all(bind=engine)
     db.commit()
     db.refresh(player)
     return player """
-@app.post("/players/")
-def create_player(player: PlayerCreate, db: Session = Depends(get_db)):
-    new_player = models.Player(
-        name = player.name,
-        position = player.position,
-        baseline_metrics = {}
-    )
-    db.add(new_player)
-    db.commit()
-    db.refresh(new_player)
-    return(new_player)
-
-@app.get("/players/")
-def read_players(db: Session = Depends(get_db)):
-    return db.query(models.Player).all()
@@ -0,0 +1,269 @@
+"""
+Request and database instrumentation, rendered in Prometheus text format.
+
+A handful of counters, gauges and histograms, without prometheus_client.
+"""
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Bucket boundaries (upper bounds, inclusive)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 250)
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        super().__init__(name, help_text, label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = self._header()
+        for labels, value in items:
+            lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        super().__init__(name, help_text, label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = self._header()
+        for labels, value in items:
+            lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float],
+                 label_names: Sequence[str] = ()):
+        super().__init__(name, help_text, label_names)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # labels -> [per-bucket counts..., sum, count]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = [0.0] * (len(self.buckets) + 2)
+                self._series[labels] = series
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._series.items())
+        lines = self._header()
+        bucket_labels = self.label_names + ("le",)
+        for labels, series in items:
+            cumulative = 0.0
+            for i, bound in enumerate(self.buckets):
+                cumulative += series[i]
+                label_str = _format_labels(bucket_labels, labels + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{label_str} {_format_value(cumulative)}")
+            label_str = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{label_str} {_format_value(series[-1])}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds every metric the app exposes, in registration order."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+REQUESTS_TOTAL = registry.register(Counter(
+    "http_requests_total", "HTTP requests by route and status code",
+    ("method", "route", "status"),
+))
+REQUEST_LATENCY = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route",
+    LATENCY_BUCKETS, ("method", "route"),
+))
+REQUESTS_IN_FLIGHT = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served",
+))
+REQUEST_STATEMENTS = registry.register(Histogram(
+    "http_request_db_statements", "SQL statements executed per request",
+    STATEMENT_BUCKETS, ("method", "route"),
+))
+DB_STATEMENTS_TOTAL = registry.register(Counter(
+    "db_statements_total", "SQL statements executed, including outside requests",
+))
+POOL_CHECKOUT_WAIT = registry.register(Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled DB connection",
+    POOL_WAIT_BUCKETS, ("pool",),
+))
+POOL_CONNECTIONS = registry.register(Gauge(
+    "db_pool_connections", "Pooled DB connections by state (refreshed on scrape)",
+    ("pool", "state"),
+))
+
+
+# Per-request counters. The middleware sets a fresh dict; sync routes run in
+# the threadpool with a copy of the context, which still points at the same dict.
+_request_stats: ContextVar[Optional[Dict[str, int]]] = ContextVar("request_stats", default=None)
+
+
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    DB_STATEMENTS_TOTAL.inc()
+    stats = _request_stats.get()
+    if stats is not None:
+        stats["statements"] += 1
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count every statement issued through this engine."""
+    if not event.contains(engine, "before_cursor_execute", _count_statement):
+        event.listen(engine, "before_cursor_execute", _count_statement)
+
+
+def observe_pool_wait(seconds: float, pool: str = "primary") -> None:
+    POOL_CHECKOUT_WAIT.observe(seconds, pool)
+
+
+def update_pool_stats(stats: Dict[str, Dict[str, int]]) -> None:
+    """Copy a db.pool_stats() snapshot into the pool gauge."""
+    for pool, values in stats.items():
+        for state, value in values.items():
+            POOL_CONNECTIONS.set(value, pool, state)
+
+
+def _route_template(scope) -> str:
+    """
+    Use the route path template, never the raw URL.
+
+    Raw paths contain player and team UUIDs - labelling by them would
+    create a new time series per player.
+    """
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    return path if path else "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency, in-flight requests and statements per request.
+
+    Plain ASGI rather than BaseHTTPMiddleware: it adds no extra task per
+    request and works unchanged for streaming responses.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = {"statements": 0}
+        token = _request_stats.set(stats)
+        status_code = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_code[0] = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            REQUESTS_IN_FLIGHT.dec()
+            _request_stats.reset(token)
+
+            method = scope.get("method", "")
+            route = _route_template(scope)
+            REQUESTS_TOTAL.inc(method, route, str(status_code[0]))
+            REQUEST_LATENCY.observe(elapsed, method, route)
+            REQUEST_STATEMENTS.observe(stats["statements"], method, route)
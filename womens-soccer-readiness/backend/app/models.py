@@ -1,14 +1,23 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, Date, DateTime, Text, JSON, ForeignKey, CheckConstraint
-from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from sqlalchemy import Column, Integer, String, Float, Boolean, Date, DateTime, Text, JSON, ForeignKey, CheckConstraint, Index, UniqueConstraint, Uuid, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy import cast
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
+from typing import Optional
 import uuid
 from .db import Base
 
+# Portable column types, so the same models run on PostgreSQL and on the
+# embedded SQLite backend (USE_SQLITE=true):
+# - Uuid is native UUID on PostgreSQL and CHAR(32) on SQLite
+# - TextList is TEXT[] on PostgreSQL and a JSON array on SQLite
+TextList = ARRAY(Text).with_variant(JSON(), "sqlite")
+
 class Team(Base):
     __tablename__ = "teams"
     
-    team_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    team_id = Column(Uuid, primary_key=True, default=uuid.uuid4)
     name = Column(String(100), nullable=False)
     organization = Column(String(100))
     level = Column(String(50))
@@ -22,12 +31,12 @@ class Team(Base):
 class User(Base):
     __tablename__ = "users"
     
-    user_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(Uuid, primary_key=True, default=uuid.uuid4)
     email = Column(String(255), unique=True, nullable=False, index=True)
     password_hash = Column(String(255), nullable=False)
     full_name = Column(String(100), nullable=False)
     role = Column(String(50), nullable=False)
-    team_id = Column(UUID(as_uuid=True), ForeignKey("teams.team_id", ondelete="CASCADE"))
+    team_id = Column(Uuid, ForeignKey("teams.team_id", ondelete="CASCADE"))
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -38,8 +47,8 @@ class User(Base):
 class Player(Base):
     __tablename__ = "players"
 
-    player_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    team_id = Column(UUID(as_uuid=True), ForeignKey("teams.team_id", ondelete="CASCADE"), index=True)
+    player_id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    team_id = Column(Uuid, ForeignKey("teams.team_id", ondelete="CASCADE"), index=True)
     name = Column(String(100), nullable=False)
     position = Column(String(20))
     jersey_number = Column(Integer)
@@ -59,12 +68,41 @@ class Player(Base):
     readiness_scores = relationship("ReadinessScore", back_populates="player", cascade="all, delete-orphan")
     polar_imports = relationship("PolarImport", back_populates="player", cascade="all, delete-orphan")
 
+# Polar imports match players by case-insensitive name within a team
+Index("ix_players_team_lower_name", Player.team_id, func.lower(Player.name))
+
+def session_load(training_load: Optional[float], rpe: Optional[int],
+                 duration_min: Optional[int]) -> Optional[float]:
+    """
+    A session's load: the device's training load, else Foster's session-RPE
+    load (RPE x minutes) for sessions logged without a monitor.
+    """
+    if training_load is not None:
+        return training_load
+    if rpe is not None and duration_min is not None:
+        return float(rpe * duration_min)
+    return None
+
 class TrainingSession(Base):
     __tablename__ = "training_sessions"
+    # Monthly range partitions on date (PostgreSQL). The partition key has
+    # to be part of the primary key, hence (session_id, date).
+    # (player_id, date) serves every readiness query: one player, a date window.
+    __table_args__ = (
+        Index("ix_training_sessions_player_date", "player_id", "date"),
+        # Partial: most sessions are not Polar imports, and an index full of
+        # NULLs looks unselective enough that SQLite's planner skips it
+        Index(
+            "ix_training_sessions_import_hash", "import_hash",
+            postgresql_where=text("import_hash IS NOT NULL"),
+            sqlite_where=text("import_hash IS NOT NULL"),
+        ),
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
     
-    session_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    player_id = Column(UUID(as_uuid=True), ForeignKey("players.player_id", ondelete="CASCADE"), index=True)
-    date = Column(Date, nullable=False, index=True)
+    session_id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    player_id = Column(Uuid, ForeignKey("players.player_id", ondelete="CASCADE"))
+    date = Column(Date, primary_key=True, nullable=False, index=True)
     session_type = Column(String(50))
     duration_min = Column(Integer)
     distance_m = Column(Float)
@@ -74,22 +112,47 @@ class TrainingSession(Base):
     decelerations = Column(Integer)
     avg_hr = Column(Integer)
     max_hr = Column(Integer)
-    hr_zones = Column(JSON)
+    hr_zones = Column(JSON)  # {"zone1": % of session, ...} as seeded/recorded
+    # Minutes in each HR zone - summed in SQL by intensity reports
+    # (app/services/intensity.py) instead of parsing hr_zones per row
+    hr_zone1_min = Column(Float)
+    hr_zone2_min = Column(Float)
+    hr_zone3_min = Column(Float)
+    hr_zone4_min = Column(Float)
+    hr_zone5_min = Column(Float)
     training_load = Column(Float)
     rpe = Column(Integer, CheckConstraint('rpe BETWEEN 1 AND 10'))
     notes = Column(Text)
+    # Polar imports: hash of player/date/duration/load so re-uploads are skipped
+    import_hash = Column(String(32))
+    raw_data = Column(JSON)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
     # Relationships
     player = relationship("Player", back_populates="training_sessions")
+    
+    @hybrid_property
+    def effective_load(self) -> Optional[float]:
+        """training_load, or sRPE load where it is missing - what every load sum uses."""
+        return session_load(self.training_load, self.rpe, self.duration_min)
+    
+    @effective_load.expression
+    def effective_load(cls):
+        return func.coalesce(cls.training_load, cast(cls.rpe * cls.duration_min, Float))
 
 class WellnessCheck(Base):
     __tablename__ = "wellness_checks"
+    # Partitioned like training_sessions. One check per player and day: a
+    # resubmission replaces it (upsert on this index)
+    __table_args__ = (
+        Index("ix_wellness_checks_player_date", "player_id", "date", unique=True),
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
     
-    check_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    player_id = Column(UUID(as_uuid=True), ForeignKey("players.player_id", ondelete="CASCADE"), index=True)
-    date = Column(Date, nullable=False, index=True)
+    check_id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    player_id = Column(Uuid, ForeignKey("players.player_id", ondelete="CASCADE"))
+    date = Column(Date, primary_key=True, nullable=False, index=True)
     sleep_hours = Column(Float, CheckConstraint('sleep_hours BETWEEN 0 AND 24'))
     sleep_quality = Column(Integer, CheckConstraint('sleep_quality BETWEEN 1 AND 5'))
     soreness = Column(Integer, CheckConstraint('soreness BETWEEN 1 AND 5'))
@@ -103,16 +166,40 @@ class WellnessCheck(Base):
     injury_status = Column(String(50))
     injury_notes = Column(Text)
     notes = Column(Text)
+    # Morning measurements, and how far each was from the player's running
+    # baseline when recorded (z-score, see app/services/baselines.py)
+    resting_hr = Column(Integer, CheckConstraint('resting_hr BETWEEN 25 AND 120'))
+    hrv = Column(Float, CheckConstraint('hrv > 0'))  # RMSSD, ms
+    resting_hr_z = Column(Float)
+    hrv_z = Column(Float)
     created_at = Column(DateTime, server_default=func.now())
     
     # Relationships
     player = relationship("Player", back_populates="wellness_checks")
 
+class MetricBaseline(Base):
+    """
+    Running mean and variance of one player's metric (Welford's algorithm).
+
+    Updated in place for each new measurement, so checking a value against
+    the player's history never re-reads that history.
+    """
+    __tablename__ = "metric_baselines"
+    
+    player_id = Column(Uuid, ForeignKey("players.player_id", ondelete="CASCADE"), primary_key=True)
+    metric = Column(String(20), primary_key=True)  # 'resting_hr', 'hrv'
+    count = Column(Integer, nullable=False, default=0)
+    mean = Column(Float, nullable=False, default=0.0)
+    m2 = Column(Float, nullable=False, default=0.0)  # sum of squared deviations from the mean
+    last_value = Column(Float)
+    last_date = Column(Date)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
 class ReadinessScore(Base):
     __tablename__ = "readiness_scores"
     
-    score_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    player_id = Column(UUID(as_uuid=True), ForeignKey("players.player_id", ondelete="CASCADE"), index=True)
+    score_id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    player_id = Column(Uuid, ForeignKey("players.player_id", ondelete="CASCADE"), index=True)
     date = Column(Date, nullable=False, index=True)
     overall_score = Column(Float, CheckConstraint('overall_score BETWEEN 0 AND 100'))
     training_load_score = Column(Float, CheckConstraint('training_load_score BETWEEN 0 AND 100'))
@@ -122,17 +209,138 @@ class ReadinessScore(Base):
     chronic_load = Column(Float)
     acwr = Column(Float)
     readiness_flag = Column(String(10), CheckConstraint("readiness_flag IN ('green', 'yellow', 'red')"), index=True)
-    recommendations = Column(ARRAY(Text))
+    recommendations = Column(TextList)
     created_at = Column(DateTime, server_default=func.now())
     
     # Relationships
     player = relationship("Player", back_populates="readiness_scores")
 
+class TeamDailySummary(Base):
+    """
+    One row per team per day, written by the readiness engine.
+
+    Season trend charts read these rows directly instead of aggregating
+    every player's scores, sessions and wellness checks on each request.
+    """
+    __tablename__ = "team_daily_summaries"
+    
+    team_id = Column(Uuid, ForeignKey("teams.team_id", ondelete="CASCADE"), primary_key=True)
+    date = Column(Date, primary_key=True)
+    player_count = Column(Integer, nullable=False, default=0)
+    average_readiness = Column(Float)
+    green_count = Column(Integer, nullable=False, default=0)
+    yellow_count = Column(Integer, nullable=False, default=0)
+    red_count = Column(Integer, nullable=False, default=0)
+    session_count = Column(Integer, nullable=False, default=0)
+    total_load = Column(Float)
+    mean_load = Column(Float)
+    wellness_count = Column(Integer, nullable=False, default=0)  # players who submitted a check
+    wellness_completion_rate = Column(Float, CheckConstraint('wellness_completion_rate BETWEEN 0 AND 1'))
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    
+    # Relationships
+    team = relationship("Team")
+
+class ArchiveIndex(Base):
+    """
+    Where an archived team-season of one table lives.
+
+    Rows older than the retention window are moved to Parquet files
+    (app/services/retention.py); this index is what keeps them findable.
+    """
+    __tablename__ = "archive_index"
+    __table_args__ = (
+        UniqueConstraint("team_id", "table_name", "season", name="uq_archive_index_team_table_season"),
+    )
+    
+    archive_id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    team_id = Column(Uuid, ForeignKey("teams.team_id", ondelete="CASCADE"), nullable=False)
+    table_name = Column(String(50), nullable=False)
+    season = Column(Integer, nullable=False)
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)  # exclusive
+    row_count = Column(Integer, nullable=False)
+    file_path = Column(String(500), nullable=False)  # relative to settings.archive_dir
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+class ReadinessRun(Base):
+    """One scheduled run computing a day's readiness for every active team."""
+    __tablename__ = "readiness_runs"
+    
+    run_id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    date = Column(Date, nullable=False, index=True)  # the day scored
+    status = Column(String(20), nullable=False)  # running, succeeded, partial, failed
+    workers = Column(Integer, nullable=False)
+    team_count = Column(Integer, nullable=False, default=0)
+    succeeded_count = Column(Integer, nullable=False, default=0)
+    failed_count = Column(Integer, nullable=False, default=0)
+    started_at = Column(DateTime, nullable=False)
+    finished_at = Column(DateTime)
+    duration_s = Column(Float)
+    
+    # Relationships
+    teams = relationship("ReadinessRunTeam", back_populates="run", cascade="all, delete-orphan")
+
+class ReadinessRunTeam(Base):
+    """How one team fared in a readiness run."""
+    __tablename__ = "readiness_run_teams"
+    
+    run_id = Column(Uuid, ForeignKey("readiness_runs.run_id", ondelete="CASCADE"), primary_key=True)
+    team_id = Column(Uuid, ForeignKey("teams.team_id", ondelete="CASCADE"), primary_key=True)
+    status = Column(String(20), nullable=False)  # succeeded, failed
+    attempts = Column(Integer, nullable=False)
+    player_count = Column(Integer)
+    duration_ms = Column(Float)  # of the successful (or last) attempt
+    error = Column(Text)
+    files_error = Column(Text)  # snapshot/cube write failed; the scores were stored
+    finished_at = Column(DateTime)
+    
+    # Relationships
+    run = relationship("ReadinessRun", back_populates="teams")
+
+class DirtyReadinessRange(Base):
+    """
+    Days whose stored readiness is out of date for one player.
+
+    Session and wellness writes widen the player's range; the incremental
+    recompute (app/services/dirty_queue.py) rescores it and deletes the row.
+    """
+    __tablename__ = "dirty_readiness_ranges"
+    
+    player_id = Column(Uuid, ForeignKey("players.player_id", ondelete="CASCADE"), primary_key=True)
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)  # inclusive
+    marked_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+class FlagEvent(Base):
+    """
+    A team event for the SSE streams (an outbox row): a player's stored
+    readiness flag for a day changed, or an import finished.
+
+    Written in the transaction that stores the change, by whichever process
+    makes it; every API process tails the table into its SSE broker
+    (events.FlagEventRelay).
+    """
+    __tablename__ = "flag_events"
+    
+    event_id = Column(Integer, primary_key=True, autoincrement=True)
+    team_id = Column(Uuid, ForeignKey("teams.team_id", ondelete="CASCADE"), nullable=False)
+    event_type = Column(String(30), nullable=False, server_default="readiness_flag")
+    # readiness_flag events
+    player_id = Column(Uuid, ForeignKey("players.player_id", ondelete="CASCADE"))
+    date = Column(Date)
+    previous_flag = Column(String(10))  # NULL: the day's first score
+    flag = Column(String(10))
+    overall_score = Column(Float)
+    data = Column(JSON)  # payload of any other event type
+    created_at = Column(DateTime, server_default=func.now(), nullable=False, index=True)
+
 class PolarImport(Base):
     __tablename__ = "polar_imports"
     
-    import_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    player_id = Column(UUID(as_uuid=True), ForeignKey("players.player_id", ondelete="CASCADE"))
+    import_id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    player_id = Column(Uuid, ForeignKey("players.player_id", ondelete="CASCADE"))
     file_name = Column(String(255))
     file_hash = Column(String(64))
     import_date = Column(DateTime, server_default=func.now())
@@ -0,0 +1,211 @@
+"""
+Catch N+1 query loops: the same statement issued over and over in one
+request or unit of work.
+
+Why group by statement shape? A loop that queries once per player sends
+identical SQL with different parameters - after normalizing placeholders
+(and expanded IN lists), every iteration has the same shape. Counting
+shapes per unit of work finds the loop without knowing anything about
+the code, and the stack at the first repeat past the threshold names it.
+
+Use `detect_n_plus_one()` around any block (the `n_plus_one` pytest
+fixture does), or set N_PLUS_ONE_MODE=warn|raise to check every API
+request (NPlusOneMiddleware). Off by default: the stack walk only happens
+on a violation, but counting still costs a little per statement.
+"""
+import logging
+import re
+import sys
+import threading
+import warnings
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+MODES = ("off", "warn", "raise")
+DEFAULT_THRESHOLD = 10
+
+# Frames from our own code (app/, database/, tests/) - not libraries, not this file
+_PROJECT_ROOT = str(Path(__file__).resolve().parents[1])
+_THIS_FILE = str(Path(__file__).resolve())
+
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+|\?")
+_PLACEHOLDER_RUN = re.compile(r"\?(?:\s*,\s*\?)+")
+_VALUES_RUN = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+_SPACE = re.compile(r"\s+")
+
+
+class NPlusOneWarning(UserWarning):
+    pass
+
+
+class NPlusOneError(AssertionError):
+    pass
+
+
+def statement_shape(statement: str) -> str:
+    """SQL with parameters, IN lists and multi-row VALUES collapsed to one `?`."""
+    shape = _PLACEHOLDER.sub("?", statement)
+    shape = _PLACEHOLDER_RUN.sub("?", shape)
+    shape = _VALUES_RUN.sub("(?)", shape)
+    return _SPACE.sub(" ", shape).strip()
+
+
+def _caller() -> str:
+    """file:line in function of the innermost project frame issuing the statement."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if (filename.startswith(_PROJECT_ROOT) and filename != _THIS_FILE
+                and "site-packages" not in filename):
+            return f"{Path(filename).relative_to(_PROJECT_ROOT)}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "<unknown>"
+
+
+@dataclass
+class Violation:
+    shape: str
+    location: str
+    count: int = 0
+
+    def __str__(self) -> str:
+        return f"{self.count}x at {self.location}: {self.shape[:300]}"
+
+
+class NPlusOneDetector:
+    """Statement shapes counted over one unit of work."""
+
+    def __init__(self, threshold: int = DEFAULT_THRESHOLD, mode: str = "raise", label: str = ""):
+        if mode not in MODES[1:]:
+            raise ValueError(f"mode must be 'warn' or 'raise', not {mode!r}")
+        self.threshold = threshold
+        self.mode = mode
+        self.label = label
+        self.counts: Counter = Counter()
+        self.violations: Dict[str, Violation] = {}
+        self._lock = threading.Lock()
+
+    def record(self, statement: str) -> None:
+        shape = statement_shape(statement)
+        with self._lock:
+            self.counts[shape] += 1
+            count = self.counts[shape]
+            violation = self.violations.get(shape)
+            if violation is not None:
+                violation.count = count
+                return
+            if count <= self.threshold:
+                return
+            violation = self.violations[shape] = Violation(shape, _caller(), count)
+
+        message = f"N+1 query{f' in {self.label}' if self.label else ''}: {violation}"
+        if self.mode == "raise":
+            raise NPlusOneError(message)
+        logger.warning(message)
+        warnings.warn(message, NPlusOneWarning, stacklevel=2)
+
+    @property
+    def statements(self) -> int:
+        return sum(self.counts.values())
+
+    def report(self) -> List[str]:
+        return [str(violation) for violation in self.violations.values()]
+
+    def check(self) -> None:
+        """Raise (mode raise) for violations - including ones the code caught and swallowed."""
+        if self.violations and self.mode == "raise":
+            raise NPlusOneError(
+                f"N+1 queries{f' in {self.label}' if self.label else ''} "
+                f"(threshold {self.threshold}):\n" + "\n".join(self.report())
+            )
+
+
+_current: ContextVar[Optional[NPlusOneDetector]] = ContextVar("n_plus_one_detector", default=None)
+
+
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    detector = _current.get()
+    if detector is not None:
+        detector.record(statement)
+
+
+def install() -> None:
+    """Listen on every engine (sync, async, per-process). Idempotent."""
+    if not event.contains(Engine, "before_cursor_execute", _record_statement):
+        event.listen(Engine, "before_cursor_execute", _record_statement)
+
+
+@contextmanager
+def detect_n_plus_one(threshold: int = DEFAULT_THRESHOLD, mode: str = "raise",
+                      label: str = "") -> Iterator[NPlusOneDetector]:
+    """
+    Count statement shapes issued inside the block (by this context).
+
+    mode="raise" fails the offending statement and, on exit, the block;
+    mode="warn" logs and warns once per shape.
+    """
+    install()
+    detector = NPlusOneDetector(threshold, mode, label)
+    token = _current.set(detector)
+    try:
+        yield detector
+    finally:
+        _current.reset(token)
+    detector.check()
+
+
+class NPlusOneMiddleware:
+    """
+    Opt-in ASGI middleware: one detector per request (N_PLUS_ONE_MODE).
+
+    Sync routes run in the threadpool with a copy of the context, which
+    still points at the request's detector. In raise mode the detector is
+    checked when the response starts, not after it was sent: a violation
+    the route caught and swallowed turns its response into a 500. Once a
+    streaming response has started, a new violation can only fail the rest
+    of the stream.
+    """
+
+    def __init__(self, app, threshold: int = DEFAULT_THRESHOLD, mode: str = "warn"):
+        self.app = app
+        self.threshold = threshold
+        self.mode = mode
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        install()
+        detector = NPlusOneDetector(self.threshold, self.mode, f"{scope.get('method', '')} {scope.get('path', '')}")
+        replaced = False
+
+        async def checked_send(message):
+            nonlocal replaced
+            if replaced:
+                return  # the route's response, superseded by the error
+            if message["type"] == "http.response.start":
+                try:
+                    detector.check()
+                except NPlusOneError as exc:
+                    from starlette.responses import JSONResponse
+
+                    replaced = True
+                    logger.error(str(exc))
+                    await JSONResponse({"detail": str(exc)}, status_code=500)(scope, receive, send)
+                    return
+            await send(message)
+
+        token = _current.set(detector)
+        try:
+            await self.app(scope, receive, checked_send)
+        finally:
+            _current.reset(token)
@@ -0,0 +1,36 @@
+import asyncio
+from uuid import UUID
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+from app.services.events import broker, format_sse
+
+router = APIRouter(tags=["events"])
+
+# Comment line sent when nothing happened, so proxies keep the connection open
+KEEPALIVE_SECONDS = 15
+
+@router.get("/teams/{team_id}/events")
+async def team_events(team_id: UUID, request: Request):
+    """
+    Server-sent events stream of a team's readiness flag changes and imports.
+    """
+    queue = broker.subscribe(str(team_id))
+
+    async def stream():
+        try:
+            yield f"retry: {KEEPALIVE_SECONDS * 1000}\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_sse(event)
+        finally:
+            broker.unsubscribe(str(team_id), queue)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app import metrics
+from app.db import pool_stats
+
+router = APIRouter(tags=["monitoring"])
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def read_metrics():
+    """Prometheus scrape endpoint. Async so a scrape never waits on the threadpool."""
+    metrics.update_pool_stats(pool_stats())
+    return PlainTextResponse(metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
@@ -1,8 +1,47 @@
-from fastapi import APIRouter
-from app.schemas.player import Player
+from typing import List
+from fastapi import APIRouter, Depends
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app import models
+from app.async_db import get_async_db, get_async_read_db
+from app.db import get_db, get_read_db
+from app.schemas.player import Player, PlayerCreate
 
 router = APIRouter(prefix="/players", tags=["players"])
+# Same routes on the async engine; main.py mounts one or the other
+async_router = APIRouter(prefix="/players", tags=["players"])
 
 '''@router.get("/")
 def get_players():
     return [{"id": 1, "name": "Test Player", "position": "Midfield"}]'''
+
+def _insert_player(player: PlayerCreate):
+    # INSERT ... RETURNING gives us the row back in one round trip,
+    # no refresh() and no ORM instance to serialize
+    return insert(models.Player).values(
+        name = player.name,
+        position = player.position,
+        team_id = player.team_id,
+        jersey_number = player.jersey_number
+    ).returning(*Player.columns(models.Player))
+
+@router.post("/", response_model=Player)
+def create_player(player: PlayerCreate, db: Session = Depends(get_db)):
+    new_player = db.execute(_insert_player(player)).one()
+    db.commit()
+    return new_player
+
+@router.get("/", response_model=List[Player])
+def read_players(db: Session = Depends(get_read_db)):
+    return db.execute(Player.select(models.Player)).all()
+
+@async_router.post("/", response_model=Player)
+async def create_player_async(player: PlayerCreate, db: AsyncSession = Depends(get_async_db)):
+    new_player = (await db.execute(_insert_player(player))).one()
+    await db.commit()
+    return new_player
+
+@async_router.get("/", response_model=List[Player])
+async def read_players_async(db: AsyncSession = Depends(get_async_read_db)):
+    return (await db.execute(Player.select(models.Player))).all()
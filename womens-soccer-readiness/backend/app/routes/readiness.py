@@ -1,18 +1,97 @@
-from fastapi import APIRouter, Depends
+from datetime import date
+from typing import List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.models import Readiness
-from app.db import get_db
+from app import models
+from app.async_db import get_async_db, get_async_read_db
+from app.db import get_db, get_read_db
+from app.schemas.readiness import ReadinessScore
+from app.schemas.wellness import WellnessCheck, WellnessCheckCreate
+from app.services.baselines import BaselineTracker
+from app.services.dirty_queue import DirtyQueue
+from app.services.team_summary import _DIALECT_INSERTS
 
 router = APIRouter()
+# Same routes on the async engine; main.py mounts one or the other
+async_router = APIRouter()
 
-@router.post("/readiness/")
-def add_readiness(player_id: int, fatigue: int, sleep_hours: float, db: Session = Depends(get_db)):
-    entry = Readiness(player_id=player_id, fatigue=fatigue, sleep_hours=sleep_hours)
-    db.add(entry)
+def _baseline_scores(db: Session, entry: WellnessCheckCreate):
+    """Score resting HR / HRV against the player's baseline and update it - O(1)."""
+    return BaselineTracker(db).observe_wellness(entry.player_id, entry.date, entry.resting_hr, entry.hrv)
+
+def _mark_dirty(db: Session, entry: WellnessCheckCreate):
+    """Stored scores for this day and the next now need recomputing."""
+    DirtyQueue(db).mark_wellness(entry.player_id, entry.date)
+
+def _notify_stores(entry: WellnessCheckCreate, baseline_scores):
+    """Keep this process's cached season stores current (see season_store)."""
+    from app.services.season_store import notify_wellness
+    notify_wellness(entry.player_id, entry.date, {**entry.model_dump(), **baseline_scores})
+
+def _upsert_wellness(dialect: str, entry: WellnessCheckCreate, baseline_scores):
+    """The day's check - a resubmission replaces the one already stored."""
+    insert = _DIALECT_INSERTS.get(dialect)
+    if insert is None:
+        raise NotImplementedError(f"No upsert for dialect {dialect}")
+    values = {**entry.model_dump(), **baseline_scores}
+    stmt = insert(models.WellnessCheck).values(**values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['player_id', 'date'],
+        set_={**{key: stmt.excluded[key] for key in values if key not in ('player_id', 'date')},
+              'created_at': func.now()},
+    )
+    return stmt.returning(*WellnessCheck.columns(models.WellnessCheck))
+
+def _select_readiness(player_id: Optional[UUID], start_date: Optional[date],
+                      end_date: Optional[date], limit: int):
+    stmt = ReadinessScore.select(models.ReadinessScore)
+    if player_id:
+        stmt = stmt.where(models.ReadinessScore.player_id == player_id)
+    if start_date:
+        stmt = stmt.where(models.ReadinessScore.date >= start_date)
+    if end_date:
+        stmt = stmt.where(models.ReadinessScore.date <= end_date)
+    return stmt.order_by(models.ReadinessScore.date.desc()).limit(limit)
+
+@router.post("/readiness/", response_model=WellnessCheck)
+def add_readiness(entry: WellnessCheckCreate, db: Session = Depends(get_db)):
+    """Record a daily wellness check - the self-reported half of readiness."""
+    baseline_scores = _baseline_scores(db, entry)
+    row = db.execute(_upsert_wellness(db.get_bind().dialect.name, entry, baseline_scores)).one()
+    _mark_dirty(db, entry)
     db.commit()
-    db.refresh(entry)
-    return entry
+    _notify_stores(entry, baseline_scores)
+    return row
+
+@router.get("/readiness/", response_model=List[ReadinessScore])
+def get_readiness(
+    player_id: Optional[UUID] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_read_db)
+):
+    return db.execute(_select_readiness(player_id, start_date, end_date, limit)).all()
+
+@async_router.post("/readiness/", response_model=WellnessCheck)
+async def add_readiness_async(entry: WellnessCheckCreate, db: AsyncSession = Depends(get_async_db)):
+    """Record a daily wellness check - the self-reported half of readiness."""
+    baseline_scores = await db.run_sync(_baseline_scores, entry)
+    row = (await db.execute(_upsert_wellness(db.get_bind().dialect.name, entry, baseline_scores))).one()
+    await db.run_sync(_mark_dirty, entry)
+    await db.commit()
+    _notify_stores(entry, baseline_scores)
+    return row
 
-@router.get("/readiness/")
-def get_readiness(db: Session = Depends(get_db)):
-    return db.query(Readiness).all()
+@async_router.get("/readiness/", response_model=List[ReadinessScore])
+async def get_readiness_async(
+    player_id: Optional[UUID] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    limit: int = Query(500, ge=1, le=5000),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    return (await db.execute(_select_readiness(player_id, start_date, end_date, limit))).all()
@@ -0,0 +1,255 @@
+from datetime import date, timedelta
+from typing import Any, Dict, List, Literal, Optional
+from uuid import UUID
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Query, Request, Response, UploadFile
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import Session
+from app import models
+from app.db import get_db, get_read_db
+from app.schemas.archive import ArchiveIndex
+from app.schemas.intensity import IntensityDistribution
+from app.schemas.planning import PlanProjection, TrainingPlan
+from app.schemas.polar_import import PolarImportResult
+from app.schemas.squad import SquadReadiness, TeamDataVersion
+from app.schemas.team_summary import TeamDailySummary
+from app.schemas.trends import TeamTrends
+
+router = APIRouter(prefix="/teams", tags=["teams"])
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+@router.post("/{team_id}/readiness", response_model=TeamDailySummary)
+def refresh_team_readiness(team_id: UUID, background_tasks: BackgroundTasks,
+                           day: Optional[date] = None, db: Session = Depends(get_db)):
+    """
+    Recalculate a team-day: per-player scores plus the team summary row.
+
+    Safe to repeat - the day's scores and summary are replaced, not appended.
+    The season snapshot is rewritten after the response is sent.
+    """
+    # The engine pulls in numpy; only pay for it when a recalculation runs
+    from app.services.readiness_calculator import ReadinessCalculator
+    from app.services.season_store import SeasonStore
+    from app.services.snapshots import refresh_team_snapshot
+
+    day = day or date.today()
+    store = SeasonStore.load_days(db, team_id, day, day)
+    ReadinessCalculator(db, store=store).refresh_team_day(team_id, day)
+    background_tasks.add_task(refresh_team_snapshot, team_id)
+    return db.execute(
+        TeamDailySummary.select(models.TeamDailySummary).where(
+            models.TeamDailySummary.team_id == team_id,
+            models.TeamDailySummary.date == day,
+        )
+    ).one()
+
+@router.get("/{team_id}/readiness", response_model=List[SquadReadiness])
+def read_squad_readiness(team_id: UUID, day: Optional[date] = None, db: Session = Depends(get_read_db)):
+    """
+    The whole active squad with each player's score for `day`, in one call.
+
+    Defaults to the team's most recently scored day. Players without a
+    score that day are still listed, with empty score fields.
+    """
+    if day is None:
+        day = db.execute(
+            select(func.max(models.ReadinessScore.date))
+            .join(models.Player, models.Player.player_id == models.ReadinessScore.player_id)
+            .where(models.Player.team_id == team_id)
+        ).scalar()
+    score = models.ReadinessScore
+    stmt = (
+        select(
+            models.Player.player_id, models.Player.name, models.Player.position,
+            models.Player.jersey_number, score.date, score.overall_score, score.readiness_flag,
+            score.acwr, score.acute_load, score.chronic_load, score.recommendations,
+        )
+        .outerjoin(score, and_(score.player_id == models.Player.player_id, score.date == day))
+        .where(models.Player.team_id == team_id, models.Player.is_active == True)
+        .order_by(models.Player.jersey_number, models.Player.name)
+    )
+    return db.execute(stmt).all()
+
+@router.get("/{team_id}/version", response_model=TeamDataVersion)
+def read_team_version(team_id: UUID, db: Session = Depends(get_read_db)):
+    """
+    Change markers for the team's roster and readiness data.
+
+    Dashboards poll this (two index range reads) and key their caches on
+    it, so a rerun only re-downloads data that actually changed. Readiness
+    changes go through refresh_team_day, which always touches the team's
+    summary rows.
+    """
+    players = db.execute(
+        select(func.count(), func.max(models.Player.updated_at)).where(models.Player.team_id == team_id)
+    ).one()
+    readiness = db.execute(
+        select(func.count(), func.max(models.TeamDailySummary.updated_at))
+        .where(models.TeamDailySummary.team_id == team_id)
+    ).one()
+    return {
+        'team_id': team_id,
+        'players': f"{players[0]}:{players[1]}",
+        'readiness': f"{readiness[0]}:{readiness[1]}",
+    }
+
+@router.post("/{team_id}/polar-imports", response_model=PolarImportResult)
+def upload_polar_csv(team_id: UUID, background_tasks: BackgroundTasks,
+                     file: UploadFile = File(...), db: Session = Depends(get_db)):
+    """
+    Import a Polar Team Pro CSV export for the team.
+
+    Re-uploading the same file is harmless: sessions are de-duplicated by import hash.
+    The team's season cube is rewritten after the response is sent.
+    """
+    from app.services.polar_parser import PolarCSVParser
+    from app.services.season_cube import refresh_team_cube
+    from app.services.season_store import notify_sessions
+
+    parser = PolarCSVParser(db, team_id)
+    result = parser.parse_csv(file.file)
+    if not result['success']:
+        raise HTTPException(status_code=400, detail=result['error'])
+    if not parser.commit_sessions():
+        raise HTTPException(status_code=500, detail="Failed to save imported sessions")
+    notify_sessions(team_id, parser.new_sessions)
+    if parser.new_sessions:
+        background_tasks.add_task(refresh_team_cube, team_id)
+    return result
+
+@router.post("/{team_id}/plans/simulate", response_model=PlanProjection)
+def simulate_training_plan(team_id: UUID, plan: TrainingPlan, db: Session = Depends(get_read_db)):
+    """
+    Project the squad's daily acute/chronic load, ACWR and flag under a proposed plan.
+
+    Nothing is stored; edit the plan and post it again.
+    """
+    from app.services.planning import TrainingPlanSimulator
+
+    sessions = [session.model_dump() for session in plan.sessions]
+    try:
+        return TrainingPlanSimulator(db).simulate(team_id, plan.start_date, plan.days, sessions)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/{team_id}/summary", response_model=List[TeamDailySummary])
+def read_team_summary(
+    team_id: UUID,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    limit: int = Query(400, ge=1, le=2000),
+    db: Session = Depends(get_read_db)
+):
+    """One row per day for season trend charts: the latest `limit` days, oldest first."""
+    stmt = TeamDailySummary.select(models.TeamDailySummary).where(models.TeamDailySummary.team_id == team_id)
+    if start_date:
+        stmt = stmt.where(models.TeamDailySummary.date >= start_date)
+    if end_date:
+        stmt = stmt.where(models.TeamDailySummary.date <= end_date)
+    rows = db.execute(stmt.order_by(models.TeamDailySummary.date.desc()).limit(limit)).all()
+    return rows[::-1]
+
+@router.get("/{team_id}/trends", response_model=TeamTrends)
+def read_team_trends(
+    team_id: UUID,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    workload: bool = False,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Rolling 7/28-day load, ACWR distribution and per-position percentiles.
+
+    Computed in one SQL statement from the sessions table, so any date range
+    works without recalculating readiness first. Defaults to the last 28 days.
+    workload=true adds the other metrics' ACWR, monotony and strain.
+    """
+    from app.services.trends import TeamTrendsService
+
+    end_date = end_date or date.today()
+    start_date = start_date or end_date - timedelta(days=27)
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+    if (end_date - start_date).days >= 400:
+        raise HTTPException(status_code=400, detail="Date range is limited to 400 days")
+    return TeamTrendsService(db).team_trends(team_id, start_date, end_date, workload)
+
+@router.get("/{team_id}/intensity", response_model=IntensityDistribution)
+def read_team_intensity(
+    team_id: UUID,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Minutes per heart-rate zone for each player and the squad.
+
+    Summed in SQL from the per-zone columns - one row per player, no
+    session rows or hr_zones JSON loaded. Defaults to the last 7 days.
+    """
+    from app.services.intensity import IntensityService
+
+    end_date = end_date or date.today()
+    start_date = start_date or end_date - timedelta(days=6)
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date must not be before start_date")
+    if (end_date - start_date).days >= 400:
+        raise HTTPException(status_code=400, detail="Date range is limited to 400 days")
+    return IntensityService(db).team_distribution(team_id, start_date, end_date)
+
+@router.get("/{team_id}/snapshot")
+def read_team_snapshot(
+    team_id: UUID,
+    request: Request,
+    season: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    format: Literal["arrow", "json"] = "arrow",
+    db: Session = Depends(get_read_db)
+):
+    """
+    Daily readiness, load and wellness for the whole squad, from the season snapshot.
+
+    `arrow` (default) is an Arrow IPC stream with zstd-compressed buffers,
+    one row per day and player; `json` returns day x player matrices.
+    Responses carry an ETag, so an unchanged snapshot costs a 304.
+    """
+    from app.services.snapshots import SnapshotService
+
+    service = SnapshotService(db)
+    season = season if season is not None else service.current_season()
+    path = service.path(team_id, season)
+    try:
+        etag = f'"{team_id}-{season}-{path.stat().st_mtime_ns}-{start_date}-{end_date}-{format}"'
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"No snapshot for season {season} yet")
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    table = service.read(team_id, season, start_date, end_date)
+    if table is None:
+        raise HTTPException(status_code=404, detail=f"No snapshot for season {season} yet")
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if format == "json":
+        return ORJSONResponse(service.to_matrices(table), headers=headers)
+    return Response(service.to_ipc_stream(table), media_type=ARROW_STREAM, headers=headers)
+
+@router.get("/{team_id}/archive", response_model=List[ArchiveIndex])
+def list_team_archives(team_id: UUID, db: Session = Depends(get_read_db)):
+    """Seasons moved out of the database by the retention job."""
+    stmt = ArchiveIndex.select(models.ArchiveIndex).where(models.ArchiveIndex.team_id == team_id)
+    return db.execute(stmt.order_by(models.ArchiveIndex.season, models.ArchiveIndex.table_name)).all()
+
+@router.get("/{team_id}/archive/{table_name}/{season}", response_model=List[Dict[str, Any]])
+def read_team_archive(team_id: UUID, table_name: str, season: int,
+                      player_id: Optional[UUID] = None, db: Session = Depends(get_read_db)):
+    """Rows of an archived season, read back from its Parquet file."""
+    from app.services.retention import ARCHIVED_TABLES, RetentionService
+
+    if table_name not in ARCHIVED_TABLES:
+        raise HTTPException(status_code=404, detail=f"{table_name} is not archived")
+    rows = RetentionService(db).read_archive(team_id, table_name, season, player_id)
+    if rows is None:
+        raise HTTPException(status_code=404, detail=f"No archive of {table_name} for season {season}")
+    return rows
@@ -0,0 +1,16 @@
+from datetime import date as date_type, datetime
+from typing import Optional
+from uuid import UUID
+from .base import RowSchema
+
+class ArchiveIndex(RowSchema):
+    archive_id: UUID
+    team_id: UUID
+    table_name: str
+    season: int
+    start_date: date_type
+    end_date: date_type
+    row_count: int
+    file_path: str
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
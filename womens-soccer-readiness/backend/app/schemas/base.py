@@ -0,0 +1,25 @@
+from typing import List
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import select
+from sqlalchemy.sql import Select
+
+
+class RowSchema(BaseModel):
+    """
+    Base for response schemas built from plain SELECT rows.
+
+    Select only the columns a schema declares (see columns()); the flat
+    rows validate without loading ORM instances or lazy relationships.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @classmethod
+    def columns(cls, model) -> List:
+        """Model columns matching this schema's fields, in field order."""
+        return [getattr(model, name) for name in cls.model_fields]
+
+    @classmethod
+    def select(cls, model) -> Select:
+        """SELECT exactly the columns this schema needs from `model`."""
+        return select(*cls.columns(model))
@@ -0,0 +1,24 @@
+from datetime import date as date_type
+from typing import Dict, List, Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+class ZoneDistribution(BaseModel):
+    sessions: int
+    sessions_without_zones: int
+    zone_minutes: Dict[str, float]  # zone1..zone5
+    total_minutes: float
+    high_intensity_minutes: float  # zones 4-5
+    high_intensity_share: Optional[float] = None
+
+class PlayerZoneDistribution(ZoneDistribution):
+    player_id: UUID
+    name: str
+    position: Optional[str] = None
+
+class IntensityDistribution(BaseModel):
+    team_id: UUID
+    start_date: date_type
+    end_date: date_type
+    team: ZoneDistribution
+    players: List[PlayerZoneDistribution]
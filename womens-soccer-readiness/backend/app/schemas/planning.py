@@ -0,0 +1,37 @@
+from datetime import date as date_type, timedelta
+from typing import Dict, List, Optional
+from uuid import UUID
+from pydantic import BaseModel, Field
+
+def _tomorrow() -> date_type:
+    return date_type.today() + timedelta(days=1)
+
+class PlannedSession(BaseModel):
+    date: date_type
+    training_load: float = Field(..., ge=0)
+    # Who takes part: listed players and/or whole position groups.
+    # Neither means the full squad.
+    player_ids: Optional[List[UUID]] = None
+    positions: Optional[List[str]] = None
+
+class TrainingPlan(BaseModel):
+    start_date: date_type = Field(default_factory=_tomorrow)
+    days: int = Field(7, ge=1, le=21)
+    sessions: List[PlannedSession] = []
+
+class PlanPlayer(BaseModel):
+    player_id: UUID
+    name: str
+    position: Optional[str] = None
+
+class PlanProjection(BaseModel):
+    """Matrices are players x days, rows in `players` order."""
+    team_id: UUID
+    start_date: date_type
+    dates: List[date_type]
+    players: List[PlanPlayer]
+    acute_load: List[List[float]]
+    chronic_load: List[List[float]]
+    acwr: List[List[float]]
+    flags: List[List[str]]
+    flag_counts: Dict[str, List[int]]
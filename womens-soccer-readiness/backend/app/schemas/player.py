@@ -1,11 +1,26 @@
+from datetime import date, datetime
+from typing import Optional
+from uuid import UUID
 from pydantic import BaseModel
+from .base import RowSchema
 
-class Player(BaseModel):
-    id: int
+class Player(RowSchema):
+    player_id: UUID
+    team_id: Optional[UUID] = None
     name: str
-    position: str
-    baseline_metrics: dict
+    position: Optional[str] = None
+    jersey_number: Optional[int] = None
+    birth_date: Optional[date] = None
+    baseline_rhr: Optional[int] = None
+    baseline_hrv: Optional[float] = None
+    max_hr: Optional[int] = None
+    notes: Optional[str] = None
+    is_active: Optional[bool] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
 
 class PlayerCreate(BaseModel):
     name: str
     position: str
+    team_id: Optional[UUID] = None
+    jersey_number: Optional[int] = None
@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel
+from uuid import UUID
+from .base import RowSchema
+
+class PolarImport(RowSchema):
+    import_id: UUID
+    player_id: Optional[UUID] = None
+    file_name: Optional[str] = None
+    file_hash: Optional[str] = None
+    import_date: Optional[datetime] = None
+    records_imported: Optional[int] = None
+    status: Optional[str] = None
+    error_message: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+class PolarImportResult(BaseModel):
+    sessions_count: int
+    players_count: int
+    errors: List[str] = []
@@ -0,0 +1,19 @@
+from datetime import date as date_type, datetime
+from typing import List, Optional
+from uuid import UUID
+from .base import RowSchema
+
+class ReadinessScore(RowSchema):
+    score_id: UUID
+    player_id: Optional[UUID] = None
+    date: date_type
+    overall_score: Optional[float] = None
+    training_load_score: Optional[float] = None
+    wellness_score: Optional[float] = None
+    recovery_score: Optional[float] = None
+    acute_load: Optional[float] = None
+    chronic_load: Optional[float] = None
+    acwr: Optional[float] = None
+    readiness_flag: Optional[str] = None
+    recommendations: Optional[List[str]] = None
+    created_at: Optional[datetime] = None
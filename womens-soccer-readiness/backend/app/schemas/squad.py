@@ -0,0 +1,25 @@
+from datetime import date as date_type
+from typing import List, Optional
+from uuid import UUID
+from pydantic import BaseModel
+from .base import RowSchema
+
+class SquadReadiness(RowSchema):
+    """A player and their readiness score for one day (score fields empty if not scored)."""
+    player_id: UUID
+    name: str
+    position: Optional[str] = None
+    jersey_number: Optional[int] = None
+    date: Optional[date_type] = None
+    overall_score: Optional[float] = None
+    readiness_flag: Optional[str] = None
+    acwr: Optional[float] = None
+    acute_load: Optional[float] = None
+    chronic_load: Optional[float] = None
+    recommendations: Optional[List[str]] = None
+
+class TeamDataVersion(BaseModel):
+    """Opaque markers that change whenever the matching data changes."""
+    team_id: UUID
+    players: str
+    readiness: str
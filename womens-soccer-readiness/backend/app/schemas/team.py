@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from .base import RowSchema
+
+class Team(RowSchema):
+    team_id: UUID
+    name: str
+    organization: Optional[str] = None
+    level: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+class User(RowSchema):
+    # password_hash is deliberately not part of the response
+    user_id: UUID
+    email: str
+    full_name: str
+    role: str
+    team_id: Optional[UUID] = None
+    is_active: Optional[bool] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
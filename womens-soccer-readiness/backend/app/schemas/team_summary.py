@@ -0,0 +1,19 @@
+from datetime import date as date_type, datetime
+from typing import Optional
+from uuid import UUID
+from .base import RowSchema
+
+class TeamDailySummary(RowSchema):
+    team_id: UUID
+    date: date_type
+    player_count: int
+    average_readiness: Optional[float] = None
+    green_count: int
+    yellow_count: int
+    red_count: int
+    session_count: int
+    total_load: Optional[float] = None
+    mean_load: Optional[float] = None
+    wellness_count: int
+    wellness_completion_rate: Optional[float] = None
+    updated_at: Optional[datetime] = None
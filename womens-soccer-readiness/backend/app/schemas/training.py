@@ -0,0 +1,31 @@
+from datetime import date as date_type, datetime
+from typing import Any, Dict, Optional
+from uuid import UUID
+from .base import RowSchema
+
+class TrainingSession(RowSchema):
+    session_id: UUID
+    player_id: Optional[UUID] = None
+    date: date_type
+    session_type: Optional[str] = None
+    duration_min: Optional[int] = None
+    distance_m: Optional[float] = None
+    high_speed_running_m: Optional[float] = None
+    sprint_distance_m: Optional[float] = None
+    accelerations: Optional[int] = None
+    decelerations: Optional[int] = None
+    avg_hr: Optional[int] = None
+    max_hr: Optional[int] = None
+    hr_zones: Optional[Dict[str, float]] = None
+    hr_zone1_min: Optional[float] = None
+    hr_zone2_min: Optional[float] = None
+    hr_zone3_min: Optional[float] = None
+    hr_zone4_min: Optional[float] = None
+    hr_zone5_min: Optional[float] = None
+    training_load: Optional[float] = None
+    rpe: Optional[int] = None
+    notes: Optional[str] = None
+    import_hash: Optional[str] = None
+    raw_data: Optional[Dict[str, Any]] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
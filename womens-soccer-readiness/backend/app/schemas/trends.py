@@ -0,0 +1,35 @@
+from datetime import date as date_type
+from typing import Dict, List, Optional
+from uuid import UUID
+from pydantic import BaseModel
+
+class TrendSeries(BaseModel):
+    """One value per day, aligned with TeamTrends.dates."""
+    players: List[int]
+    total_load: List[float]
+    acute_load: List[float]
+    chronic_load: List[float]
+    acwr_mean: List[Optional[float]]
+    acwr_p25: List[Optional[float]]
+    acwr_p50: List[Optional[float]]
+    acwr_p75: List[Optional[float]]
+    acwr_p90: List[Optional[float]]
+    acwr_low: List[int]
+    acwr_optimal: List[int]
+    acwr_high: List[int]
+    acwr_danger: List[int]
+    # Only with ?workload=true
+    distance_acwr_mean: Optional[List[Optional[float]]] = None
+    high_speed_running_acwr_mean: Optional[List[Optional[float]]] = None
+    sprint_distance_acwr_mean: Optional[List[Optional[float]]] = None
+    accelerations_acwr_mean: Optional[List[Optional[float]]] = None
+    monotony_mean: Optional[List[Optional[float]]] = None  # Foster, over the last 7 days
+    strain_mean: Optional[List[Optional[float]]] = None
+
+class TeamTrends(BaseModel):
+    team_id: UUID
+    start_date: date_type
+    end_date: date_type
+    dates: List[date_type]
+    team: TrendSeries
+    positions: Dict[str, TrendSeries]
@@ -0,0 +1,45 @@
+from datetime import date as date_type, datetime
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel, Field
+from .base import RowSchema
+
+class WellnessCheck(RowSchema):
+    check_id: UUID
+    player_id: Optional[UUID] = None
+    date: date_type
+    sleep_hours: Optional[float] = None
+    sleep_quality: Optional[int] = None
+    soreness: Optional[int] = None
+    fatigue: Optional[int] = None
+    stress: Optional[int] = None
+    mood: Optional[int] = None
+    hydration: Optional[int] = None
+    nutrition_quality: Optional[int] = None
+    cycle_phase: Optional[str] = None
+    cycle_symptoms: Optional[str] = None
+    injury_status: Optional[str] = None
+    injury_notes: Optional[str] = None
+    notes: Optional[str] = None
+    resting_hr: Optional[int] = None
+    hrv: Optional[float] = None
+    resting_hr_z: Optional[float] = None
+    hrv_z: Optional[float] = None
+    created_at: Optional[datetime] = None
+
+class WellnessCheckCreate(BaseModel):
+    player_id: UUID
+    date: date_type = Field(default_factory=date_type.today)
+    sleep_hours: Optional[float] = Field(None, ge=0, le=24)
+    sleep_quality: Optional[int] = Field(None, ge=1, le=5)
+    soreness: Optional[int] = Field(None, ge=1, le=5)
+    fatigue: Optional[int] = Field(None, ge=1, le=5)
+    stress: Optional[int] = Field(None, ge=1, le=5)
+    mood: Optional[int] = Field(None, ge=1, le=5)
+    hydration: Optional[int] = Field(None, ge=1, le=5)
+    nutrition_quality: Optional[int] = Field(None, ge=1, le=5)
+    cycle_phase: Optional[str] = None
+    injury_status: Optional[str] = None
+    notes: Optional[str] = None
+    resting_hr: Optional[int] = Field(None, ge=25, le=120)
+    hrv: Optional[float] = Field(None, gt=0, le=300)  # RMSSD, ms
@@ -0,0 +1,173 @@
+from datetime import date
+from math import sqrt
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from .. import models
+from .team_summary import _DIALECT_INSERTS
+import logging
+
+logger = logging.getLogger(__name__)
+
+# metric -> (Player column holding the coach-entered baseline,
+#            direction that means "worse": +1 high is bad, -1 low is bad,
+#            typical day-to-day SD used while the running baseline warms up,
+#            smallest SD trusted once it has - a very steady player would
+#            otherwise flag a 1 bpm change)
+METRICS = {
+    'resting_hr': ('baseline_rhr', 1, 3.0, 1.5),
+    'hrv': ('baseline_hrv', -1, 8.0, 3.0),
+}
+
+MIN_SAMPLES = 7      # measurements before the running baseline is trusted
+Z_THRESHOLD = 2.0    # |z| that counts as a deviation
+
+
+def welford_update(count: int, mean: float, m2: float, value: float) -> Tuple[int, float, float]:
+    """Add one value to a running (count, mean, M2). Constant time and memory."""
+    count += 1
+    delta = value - mean
+    mean += delta / count
+    m2 += delta * (value - mean)
+    return count, mean, m2
+
+
+def welford_remove(count: int, mean: float, m2: float, value: float) -> Tuple[int, float, float]:
+    """Take back the value welford_update added last: the state from before it."""
+    if count <= 1:
+        return 0, 0.0, 0.0
+    count -= 1
+    previous_mean = mean - (value - mean) / count
+    m2 -= (value - previous_mean) * (value - mean)
+    return count, previous_mean, max(m2, 0.0)
+
+
+def running_sd(count: int, m2: float) -> Optional[float]:
+    """Sample standard deviation from Welford state, None below two values."""
+    return sqrt(m2 / (count - 1)) if count > 1 else None
+
+
+class BaselineTracker:
+    """
+    Score resting HR and HRV against each player's own running baseline.
+
+    The baseline is Welford state (count, mean, M2) per player and metric.
+    A value is scored against the baseline *before* it is added, so a spike
+    can't soften its own z-score. Until MIN_SAMPLES measurements exist, the
+    coach-entered Player.baseline_rhr / baseline_hrv stands in, with a
+    typical day-to-day spread.
+
+    One value per player, metric and day: a corrected check replaces the
+    day's earlier value, or removes it if the correction has none. A day
+    older than the latest one is scored but not added.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def observe(self, player_id, metric: str, value: Optional[float], day: date) -> Optional[float]:
+        """Fold one measurement into the player's baseline; return its z-score."""
+        if value is None:
+            self._withdraw(player_id, metric, day)
+            return None
+
+        baseline = self._locked_baseline(player_id, metric)
+        if baseline.last_date is not None and day < baseline.last_date:
+            # A backfilled earlier day: scored, but the state already moved
+            # past it and Welford can only take back the latest value
+            logger.debug("Not adding %s for %s on %s: baseline is at %s",
+                         metric, player_id, day, baseline.last_date)
+            return self._z_score(player_id, metric, value, baseline)
+        if day == baseline.last_date:
+            # A resubmitted or corrected check replaces that day's value
+            baseline.count, baseline.mean, baseline.m2 = welford_remove(
+                baseline.count, baseline.mean, baseline.m2, baseline.last_value
+            )
+
+        z = self._z_score(player_id, metric, value, baseline)
+        baseline.count, baseline.mean, baseline.m2 = welford_update(
+            baseline.count, baseline.mean, baseline.m2, value
+        )
+        baseline.last_value = value
+        baseline.last_date = day
+        return z
+
+    def _withdraw(self, player_id, metric: str, day: date) -> None:
+        """A resubmitted latest check without the value: take the earlier one back out."""
+        baseline = self.db.execute(self._baseline_query(player_id, metric)).scalar_one_or_none()
+        if baseline is None or baseline.last_date != day or baseline.last_value is None:
+            return
+        baseline.count, baseline.mean, baseline.m2 = welford_remove(
+            baseline.count, baseline.mean, baseline.m2, baseline.last_value
+        )
+        baseline.last_value = None
+        baseline.last_date = None
+
+    @staticmethod
+    def _baseline_query(player_id, metric: str):
+        return select(models.MetricBaseline).where(
+            models.MetricBaseline.player_id == player_id,
+            models.MetricBaseline.metric == metric,
+        ).with_for_update()
+
+    def _locked_baseline(self, player_id, metric: str) -> models.MetricBaseline:
+        """
+        The player's state row, locked until commit (FOR UPDATE): two
+        submissions for one player must not both start from the same state
+        (SQLite serializes writers anyway). FOR UPDATE can't lock a row that
+        doesn't exist yet, so a first measurement inserts an empty one -
+        ON CONFLICT DO NOTHING, in case a concurrent first submission just
+        did - and then locks whichever row won.
+        """
+        query = self._baseline_query(player_id, metric)
+        baseline = self.db.execute(query).scalar_one_or_none()
+        if baseline is not None:
+            return baseline
+
+        dialect = self.db.get_bind().dialect.name
+        insert = _DIALECT_INSERTS.get(dialect)
+        if insert is None:
+            raise NotImplementedError(f"No upsert for dialect {dialect}")
+        self.db.execute(
+            insert(models.MetricBaseline)
+            .values(player_id=player_id, metric=metric, count=0, mean=0.0, m2=0.0)
+            .on_conflict_do_nothing(index_elements=['player_id', 'metric'])
+        )
+        return self.db.execute(query).scalar_one()
+
+    def observe_wellness(self, player_id, day: date, resting_hr: Optional[float],
+                         hrv: Optional[float]) -> Dict[str, Optional[float]]:
+        """z-scores for a wellness check, as its resting_hr_z / hrv_z values."""
+        return {
+            'resting_hr_z': self.observe(player_id, 'resting_hr', resting_hr, day),
+            'hrv_z': self.observe(player_id, 'hrv', hrv, day),
+        }
+
+    def _z_score(self, player_id, metric: str, value: float,
+                 baseline: models.MetricBaseline) -> Optional[float]:
+        column, _, warmup_sd, min_sd = METRICS[metric]
+        if baseline.count >= MIN_SAMPLES:
+            sd = max(running_sd(baseline.count, baseline.m2), min_sd)
+            return round((value - baseline.mean) / sd, 2)
+
+        # Warm-up: only now is the player row needed
+        reference = self.db.execute(
+            select(getattr(models.Player, column)).where(models.Player.player_id == player_id)
+        ).scalar_one_or_none()
+        if reference is None:
+            return None
+        return round((value - reference) / warmup_sd, 2)
+
+
+def deviation_recommendations(resting_hr_z: Optional[float], hrv_z: Optional[float]) -> List[str]:
+    """Coach-facing notes for measurements outside the player's normal range."""
+    recommendations = []
+    if resting_hr_z is not None and resting_hr_z * METRICS['resting_hr'][1] >= Z_THRESHOLD:
+        recommendations.append(
+            f"💓 Resting HR {resting_hr_z:+.1f} SD from baseline - check for illness or poor recovery"
+        )
+    if hrv_z is not None and hrv_z * METRICS['hrv'][1] >= Z_THRESHOLD:
+        recommendations.append(
+            f"📉 HRV {hrv_z:+.1f} SD from baseline - consider reducing intensity"
+        )
+    return recommendations
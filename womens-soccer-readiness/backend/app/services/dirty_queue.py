@@ -0,0 +1,184 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session
+from .. import models
+from ..sql import greatest, least
+from .team_summary import _DIALECT_INSERTS, TeamSummaryService
+import logging
+
+logger = logging.getLogger(__name__)
+
+# How far forward a write reaches. A session on day d sits in the 28-day
+# chronic window (and the recovery lookback) of days d..d+28; a wellness
+# check is read on its own day and the next (_get_wellness_score).
+SESSION_REACH_DAYS = 28
+WELLNESS_REACH_DAYS = 1
+
+RECOMPUTE_BATCH = 200  # players claimed per transaction
+
+
+class DirtyQueue:
+    """
+    Track which players' stored readiness is stale, and rescore only those.
+
+    Each write marks the days it reaches in its own transaction, so a mark
+    can't be lost. One row per player holds the union of their dirty days
+    (the upsert widens start/end).
+
+    Only days that already have a stored score are rescored: a day nobody
+    scored yet is calculated from current data whenever it first is.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def mark(self, player_id, start_date: date, end_date: date) -> None:
+        """Add start_date..end_date (inclusive) to the player's dirty range."""
+        insert = _DIALECT_INSERTS.get(self.db.get_bind().dialect.name)
+        if insert is None:
+            raise NotImplementedError(f"No upsert for dialect {self.db.get_bind().dialect.name}")
+
+        table = models.DirtyReadinessRange.__table__
+        stmt = insert(table).values(player_id=player_id, start_date=start_date, end_date=end_date)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['player_id'],
+            set_={
+                'start_date': least(table.c.start_date, stmt.excluded.start_date),
+                'end_date': greatest(table.c.end_date, stmt.excluded.end_date),
+                'marked_at': func.now(),
+            },
+        )
+        self.db.execute(stmt)
+
+    def mark_sessions(self, sessions: Iterable[Tuple]) -> None:
+        """Mark the days reached by new or changed sessions, given as (player_id, date)."""
+        ranges: Dict[any, Tuple[date, date]] = {}
+        for player_id, day in sessions:
+            start, end = ranges.get(player_id, (day, day))
+            ranges[player_id] = (min(start, day), max(end, day))
+        for player_id, (start, end) in ranges.items():
+            self.mark(player_id, start, end + timedelta(days=SESSION_REACH_DAYS))
+
+    def mark_wellness(self, player_id, day: date) -> None:
+        self.mark(player_id, day, day + timedelta(days=WELLNESS_REACH_DAYS))
+
+    def pending(self) -> int:
+        return self.db.execute(
+            select(func.count()).select_from(models.DirtyReadinessRange)
+        ).scalar_one()
+
+    def recompute(self, until: Optional[date] = None, batch_size: int = RECOMPUTE_BATCH) -> Dict[str, int]:
+        """
+        Rescore every queued player's stored days up to `until` (default today),
+        refresh the affected team summaries and dequeue those days. A range
+        reaching past `until` keeps its later days queued.
+        """
+        until = until or date.today()
+        totals = {'players': 0, 'player_days': 0, 'team_days': 0}
+        while True:
+            batch = self._recompute_batch(until, batch_size)
+            if batch['players'] == 0:
+                break
+            for key in totals:
+                totals[key] += batch[key]
+        logger.info(f"Recomputed {totals['player_days']} player-days for {totals['players']} players, "
+                    f"{totals['team_days']} team summaries")
+        return totals
+
+    def _rebuild_cubes(self, team_ids) -> None:
+        """Past days changed: rewrite the season cubes that exist for these teams."""
+        from .season_cube import SeasonCubeService, cube_path
+        from .retention import season_of
+
+        cubes = SeasonCubeService(self.db)
+        season = season_of(date.today(), cubes.season_start_month)
+        for team_id in team_ids:
+            if cube_path(team_id, season).exists():
+                cubes.rebuild(team_id)
+
+    def _rewrite_snapshots(self, work) -> None:
+        """Rescored days changed: rewrite the teams' snapshots that exist for their seasons."""
+        from .retention import season_of
+        from .snapshots import SnapshotService
+
+        snapshots = SnapshotService(self.db)
+        for team_id, days in work.items():
+            if team_id is None:
+                continue
+            for season in sorted({season_of(day, snapshots.season_start_month) for day in days}):
+                if not snapshots.path(team_id, season).exists():
+                    continue
+                try:
+                    snapshots.write_team(team_id, season)
+                except Exception:
+                    # The scores are committed; a stale snapshot is caught up next time
+                    logger.exception(f"Snapshot of team {team_id}, season {season} failed")
+
+    def _recompute_batch(self, until: date, batch_size: int) -> Dict[str, int]:
+        from .readiness_calculator import ReadinessCalculator
+        from .season_store import SeasonStore
+
+        # Locked until the commit: a concurrent write waits, then finds the
+        # row gone and queues a fresh one - no mark is lost
+        dirty = self.db.execute(
+            select(models.DirtyReadinessRange.player_id, models.DirtyReadinessRange.start_date,
+                   models.DirtyReadinessRange.end_date, models.Player.team_id)
+            .join(models.Player, models.Player.player_id == models.DirtyReadinessRange.player_id)
+            .where(models.DirtyReadinessRange.start_date <= until)
+            .order_by(models.DirtyReadinessRange.player_id)
+            .limit(batch_size)
+            .with_for_update(of=models.DirtyReadinessRange, skip_locked=True)
+        ).all()
+        if not dirty:
+            return {'players': 0, 'player_days': 0, 'team_days': 0}
+
+        ranges = {row.player_id: row for row in dirty}
+        stored = self.db.execute(
+            select(models.ReadinessScore.player_id, models.ReadinessScore.date)
+            .where(
+                models.ReadinessScore.player_id.in_(list(ranges)),
+                models.ReadinessScore.date >= min(row.start_date for row in dirty),
+                models.ReadinessScore.date <= until,
+            )
+        ).all()
+
+        # team -> day -> players to rescore
+        work = defaultdict(lambda: defaultdict(list))
+        for player_id, day in stored:
+            row = ranges[player_id]
+            if row.start_date <= day <= row.end_date:
+                work[row.team_id][day].append(player_id)
+
+        summaries = TeamSummaryService(self.db)
+        for team_id, days in work.items():
+            # One load per team for all its days instead of queries per player-day
+            store = SeasonStore.load_days(self.db, team_id, min(days), max(days)) if team_id else None
+            calculator = ReadinessCalculator(self.db, store=store)
+            for day, player_ids in sorted(days.items()):
+                calculator.refresh_players_day(player_ids, day, team_id)
+                if team_id is not None:
+                    summaries.refresh_from_scores(team_id, day)
+
+        # Days after `until` were not rescored: they stay queued
+        done = [player_id for player_id, row in ranges.items() if row.end_date <= until]
+        later = [player_id for player_id, row in ranges.items() if row.end_date > until]
+        if done:
+            self.db.execute(
+                delete(models.DirtyReadinessRange).where(models.DirtyReadinessRange.player_id.in_(done))
+            )
+        if later:
+            self.db.execute(
+                update(models.DirtyReadinessRange)
+                .where(models.DirtyReadinessRange.player_id.in_(later))
+                .values(start_date=until + timedelta(days=1))
+            )
+        self.db.commit()
+        self._rebuild_cubes({team_id for team_id in work if team_id is not None})
+        self._rewrite_snapshots(work)
+        return {
+            'players': len(ranges),
+            'player_days': sum(len(p) for days in work.values() for p in days.values()),
+            'team_days': sum(len(days) for team_id, days in work.items() if team_id is not None),
+        }
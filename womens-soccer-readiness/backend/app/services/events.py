@@ -0,0 +1,212 @@
+import asyncio
+import itertools
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Any, Dict, Optional, Set, Tuple
+
+from sqlalchemy import delete, func, or_, select
+
+from .. import models
+from ..sql import hours_ago
+
+logger = logging.getLogger(__name__)
+
+
+class EventBroker:
+    """
+    In-process pub/sub for team events (readiness flag changes, finished imports).
+
+    Publishers are sync code running in the threadpool and subscribers are
+    async SSE streams, so every hand-off goes through call_soon_threadsafe.
+    Events from other processes arrive through FlagEventRelay.
+
+    Each subscriber gets a bounded queue. A dashboard that stops reading
+    loses its oldest events rather than growing memory without limit.
+    """
+
+    def __init__(self, max_queue_size: int = 100):
+        self.max_queue_size = max_queue_size
+        self._subscribers: Dict[str, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = defaultdict(set)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def subscribe(self, team_id: str) -> asyncio.Queue:
+        """Register a queue for a team. Must be called from the event loop."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_queue_size)
+        with self._lock:
+            self._subscribers[str(team_id)].add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, team_id: str, queue: asyncio.Queue) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(str(team_id))
+            if not subscribers:
+                return
+            subscribers.difference_update({s for s in subscribers if s[1] is queue})
+            if not subscribers:
+                del self._subscribers[str(team_id)]
+
+    def subscriber_count(self, team_id: str) -> int:
+        with self._lock:
+            return len(self._subscribers.get(str(team_id), ()))
+
+    def publish(self, team_id: str, event_type: str, data: Dict[str, Any]) -> None:
+        """Fan an event out to every subscriber of the team. Safe from any thread."""
+        event = {
+            'id': next(self._ids),
+            'event': event_type,
+            'data': data,
+        }
+        with self._lock:
+            subscribers = list(self._subscribers.get(str(team_id), ()))
+
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._enqueue, queue, event)
+            except RuntimeError:
+                # Loop already closed - the stream is gone, clean up lazily
+                self.unsubscribe(team_id, queue)
+
+    @staticmethod
+    def _enqueue(queue: asyncio.Queue, event: Dict[str, Any]) -> None:
+        if queue.full():
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+        queue.put_nowait(event)
+
+
+class FlagEventRelay:
+    """
+    Tail flag_events (flag changes, finished imports) into this process's broker.
+
+    Rows are written in the same transaction as the change they announce,
+    so they reach every API process, and only once committed.
+
+    Ids are handed out at insert, not at commit: a long transaction can
+    commit id 41 after 42 was already relayed. Ids skipped over are kept
+    as gaps and looked up again on each poll until GAP_TIMEOUT_S passes
+    (gaps from rolled-back inserts never fill).
+    """
+
+    BATCH = 1000
+    GAP_TIMEOUT_S = 600.0
+    MAX_GAP = 10_000  # a bigger jump is a sequence reset, not transactions in flight
+    PRUNE_EVERY_S = 3600.0
+
+    def __init__(self, session_factory, event_broker: "EventBroker",
+                 interval_s: float = 1.0, retention_hours: int = 24):
+        self.session_factory = session_factory
+        self.broker = event_broker
+        self.interval_s = interval_s
+        self.retention_hours = retention_hours
+        self.cursor: Optional[int] = None
+        self._gaps: Dict[int, float] = {}
+        self._last_prune = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="flag-event-relay", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            db = self.session_factory()
+            try:
+                self.poll(db)
+                if time.monotonic() - self._last_prune > self.PRUNE_EVERY_S:
+                    self.prune(db)
+                    self._last_prune = time.monotonic()
+            except Exception:
+                logger.exception("Relaying flag events failed")
+                db.rollback()
+            finally:
+                db.close()
+            self._stop.wait(self.interval_s)
+
+    def poll(self, db) -> int:
+        """Publish flag events committed since the last poll. Returns how many went out."""
+        events = models.FlagEvent
+        if self.cursor is None:
+            # Start from now: what happened before this process came up is in the scores
+            self.cursor = db.execute(select(func.coalesce(func.max(events.event_id), 0))).scalar_one()
+            return 0
+
+        now = time.monotonic()
+        self._gaps = {event_id: seen for event_id, seen in self._gaps.items() if now - seen < self.GAP_TIMEOUT_S}
+        published = 0
+        while True:
+            condition = events.event_id > self.cursor
+            if self._gaps:
+                condition = or_(condition, events.event_id.in_(list(self._gaps)))
+            rows = db.execute(
+                select(events).where(condition).order_by(events.event_id).limit(self.BATCH)
+            ).scalars().all()
+            for row in rows:
+                self._gaps.pop(row.event_id, None)
+                self.broker.publish(row.team_id, row.event_type, self._payload(row))
+            published += len(rows)
+
+            ids = [row.event_id for row in rows if row.event_id > self.cursor]
+            if ids:
+                if ids[-1] - self.cursor <= self.MAX_GAP:
+                    for missing in set(range(self.cursor + 1, ids[-1])) - set(ids):
+                        self._gaps[missing] = now
+                self.cursor = ids[-1]
+            if len(rows) < self.BATCH:
+                return published
+
+    @staticmethod
+    def _payload(row: models.FlagEvent) -> Dict[str, Any]:
+        if row.event_type != 'readiness_flag':
+            return row.data or {}
+        return {
+            'player_id': str(row.player_id),
+            'date': row.date,
+            'previous_flag': row.previous_flag,
+            'flag': row.flag,
+            'overall_score': row.overall_score,
+        }
+
+    def prune(self, db) -> int:
+        return prune_flag_events(db, self.retention_hours)
+
+
+def prune_flag_events(db, retention_hours: int) -> int:
+    """
+    Delete events older than the retention window; returns how many.
+
+    The relay prunes hourly while it runs; the nightly retention job does
+    too, for deployments with the relay off.
+    """
+    deleted = db.execute(
+        delete(models.FlagEvent).where(models.FlagEvent.created_at < hours_ago(retention_hours))
+    ).rowcount
+    db.commit()
+    return deleted
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Render an event in text/event-stream wire format."""
+    payload = json.dumps(event['data'], default=_json_default)
+    return f"id: {event['id']}\nevent: {event['event']}\ndata: {payload}\n\n"
+
+
+broker = EventBroker()
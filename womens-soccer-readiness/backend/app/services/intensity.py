@@ -0,0 +1,96 @@
+from datetime import date
+from typing import Dict, Mapping, Optional
+from sqlalchemy import and_, case, func, select
+from sqlalchemy.orm import Session
+from .. import models
+import logging
+
+logger = logging.getLogger(__name__)
+
+ZONES = (1, 2, 3, 4, 5)
+ZONE_COLUMNS = tuple(f'hr_zone{zone}_min' for zone in ZONES)
+HIGH_INTENSITY_ZONES = (4, 5)
+
+
+def zone_minutes_from_shares(hr_zones: Optional[Mapping[str, float]],
+                             duration_min: Optional[float]) -> Dict[str, Optional[float]]:
+    """
+    hr_zoneN_min values from an hr_zones breakdown ({"zone1": % of session, ...}).
+
+    That is the shape seed data (and any older row) keeps in hr_zones;
+    without a duration there is nothing to convert, so all stay NULL.
+    """
+    if not hr_zones or duration_min is None:
+        return dict.fromkeys(ZONE_COLUMNS)
+    minutes = {}
+    for zone, column in zip(ZONES, ZONE_COLUMNS):
+        share = hr_zones.get(f'zone{zone}')
+        minutes[column] = None if share is None else round(share * duration_min / 100, 1)
+    return minutes
+
+
+class IntensityService:
+    """
+    How a squad's training time splits across heart-rate zones.
+
+    Sums the per-zone minute columns in the database, one row per player.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def team_distribution(self, team_id: str, start_date: date, end_date: date) -> Dict[str, any]:
+        """Minutes per zone for each active player and the squad, start_date..end_date inclusive."""
+        if end_date < start_date:
+            raise ValueError("end_date must not be before start_date")
+
+        ts = models.TrainingSession
+        zone_sums = [func.coalesce(func.sum(getattr(ts, column)), 0.0).label(column) for column in ZONE_COLUMNS]
+        rows = self.db.execute(
+            select(
+                models.Player.player_id,
+                models.Player.name,
+                models.Player.position,
+                func.count(ts.session_id).label('sessions'),
+                # Sessions recorded without a heart-rate breakdown
+                func.sum(case((and_(ts.session_id.is_not(None), ts.hr_zone1_min.is_(None)), 1), else_=0))
+                .label('sessions_without_zones'),
+                *zone_sums,
+            )
+            .select_from(models.Player)
+            .outerjoin(ts, and_(ts.player_id == models.Player.player_id,
+                                ts.date >= start_date, ts.date <= end_date))
+            .where(models.Player.team_id == team_id, models.Player.is_active == True)
+            .group_by(models.Player.player_id, models.Player.name, models.Player.position)
+            .order_by(models.Player.name)
+        ).mappings().all()
+
+        players = [self._entry(row, {key: row[key] for key in ('player_id', 'name', 'position')}) for row in rows]
+        team = self._entry({
+            key: sum(row[key] for row in rows)
+            for key in ('sessions', 'sessions_without_zones') + ZONE_COLUMNS
+        })
+        logger.debug(f"Intensity distribution for team {team_id}: {len(players)} players")
+        return {
+            'team_id': team_id,
+            'start_date': start_date,
+            'end_date': end_date,
+            'team': team,
+            'players': players,
+        }
+
+    @staticmethod
+    def _entry(row: Mapping, entry: Optional[Dict[str, any]] = None) -> Dict[str, any]:
+        minutes = {f'zone{zone}': round(row[column], 1) for zone, column in zip(ZONES, ZONE_COLUMNS)}
+        total = sum(minutes.values())
+        high = sum(minutes[f'zone{zone}'] for zone in HIGH_INTENSITY_ZONES)
+        entry = dict(entry or {})
+        entry.update({
+            'sessions': row['sessions'],
+            'sessions_without_zones': row['sessions_without_zones'],
+            'zone_minutes': minutes,
+            'total_minutes': round(total, 1),
+            'high_intensity_minutes': round(high, 1),
+            'high_intensity_share': round(high / total, 3) if total else None,
+        })
+        return entry
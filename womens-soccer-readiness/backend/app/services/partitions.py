@@ -0,0 +1,129 @@
+import logging
+import re
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+# Tables range-partitioned by month on their `date` column (PostgreSQL only)
+PARTITIONED_TABLES = ("training_sessions", "wellness_checks")
+
+ARCHIVE_SCHEMA = "archive"
+
+_BOUND_RE = re.compile(r"FROM \('(\d{4}-\d{2}-\d{2})'\) TO \('(\d{4}-\d{2}-\d{2})'\)")
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(day: date, months: int) -> date:
+    """First day of the month `months` after the month containing `day`."""
+    index = day.year * 12 + (day.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    """training_sessions + 2026-10-01 -> training_sessions_p2026_10"""
+    return f"{table}_p{month.year:04d}_{month.month:02d}"
+
+
+def create_partition_sql(table: str, month: date) -> str:
+    """DDL for one monthly partition. Idempotent thanks to IF NOT EXISTS."""
+    start, end = month_start(month), add_months(month, 1)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, start)} "
+        f"PARTITION OF {table} FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+def list_partitions(conn: Connection, table: str) -> List[Dict]:
+    """
+    Attached partitions of `table` with their date bounds.
+
+    Bounds come from the catalog, not from the naming convention, so
+    partitions created by hand are handled too. The DEFAULT partition
+    has no bounds and is reported with start/end of None.
+    """
+    rows = conn.execute(text("""
+        SELECT child.relname AS name, pg_get_expr(child.relpartbound, child.oid) AS bound
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = :table
+        ORDER BY child.relname
+    """), {"table": table}).all()
+
+    partitions = []
+    for name, bound in rows:
+        match = _BOUND_RE.search(bound or "")
+        partitions.append({
+            'name': name,
+            'start': date.fromisoformat(match.group(1)) if match else None,
+            'end': date.fromisoformat(match.group(2)) if match else None,
+        })
+    return partitions
+
+
+def ensure_partitions(engine: Engine, months_ahead: int = 3,
+                      today: Optional[date] = None) -> List[str]:
+    """
+    Create monthly partitions from the current month through `months_ahead`.
+
+    Run nightly (database/maintain_partitions.py). Keeping a few months
+    ahead means inserts never land in the DEFAULT partition, which would
+    block creating the matching monthly partition later.
+    """
+    if engine.dialect.name != "postgresql":
+        return []
+
+    today = today or date.today()
+    created = []
+    with engine.begin() as conn:
+        for table in PARTITIONED_TABLES:
+            existing = {p['name'] for p in list_partitions(conn, table)}
+            for offset in range(months_ahead + 1):
+                month = add_months(month_start(today), offset)
+                name = partition_name(table, month)
+                if name in existing:
+                    continue
+                conn.execute(text(create_partition_sql(table, month)))
+                created.append(name)
+                logger.info(f"Created partition {name}")
+    return created
+
+
+def detach_old_partitions(engine: Engine, older_than: date,
+                          concurrently: bool = True) -> List[Tuple[str, str]]:
+    """
+    Detach partitions that end on or before `older_than` and move them to the archive schema.
+
+    The data stays queryable as archive.<partition> until someone drops it.
+
+    DETACH ... CONCURRENTLY (PostgreSQL 14+) avoids holding an exclusive
+    lock on the parent table, but cannot run inside a transaction, so this
+    uses an autocommit connection. PostgreSQL refuses it while a DEFAULT
+    partition exists; then we fall back to a plain DETACH, which is still
+    only a brief catalog lock.
+    """
+    if engine.dialect.name != "postgresql":
+        return []
+
+    detached = []
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+        for table in PARTITIONED_TABLES:
+            partitions = list_partitions(conn, table)
+            has_default = any(p['end'] is None for p in partitions)
+            mode = " CONCURRENTLY" if concurrently and not has_default else ""
+            for partition in partitions:
+                if partition['end'] is None or partition['end'] > older_than:
+                    continue
+                conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {partition['name']}{mode}"))
+                conn.execute(text(f"ALTER TABLE {partition['name']} SET SCHEMA {ARCHIVE_SCHEMA}"))
+                detached.append((table, partition['name']))
+                logger.info(f"Detached {partition['name']} to schema {ARCHIVE_SCHEMA}")
+    return detached
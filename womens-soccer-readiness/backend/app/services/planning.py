@@ -0,0 +1,149 @@
+from datetime import date, timedelta
+from typing import Dict, List
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from .. import models
+from .readiness_calculator import ReadinessCalculator
+from .season_store import season_store
+import logging
+
+logger = logging.getLogger(__name__)
+
+MAX_PLAN_DAYS = 21
+# ReadinessCalculator._calculate_acwr sums sessions from date-7 and date-28
+# through date (inclusive), then divides by 7 and 28. Same windows here, so
+# a projection is what the engine will report once the sessions are logged.
+ACUTE_WINDOW = 7
+CHRONIC_WINDOW = 28
+
+
+def acwr_flags(acwr: np.ndarray) -> np.ndarray:
+    """Flag from ACWR alone, with the readiness engine's thresholds."""
+    low, sweet_high = ReadinessCalculator.ACWR_SWEET_SPOT
+    return np.select(
+        [acwr > ReadinessCalculator.ACWR_DANGER_ZONE_HIGH, (acwr < low) | (acwr > sweet_high)],
+        ['red', 'yellow'],
+        default='green',
+    )
+
+
+class TrainingPlanSimulator:
+    """
+    Project how a proposed training plan moves the squad's ACWR.
+
+    The team's history is read in one query into a players x days load
+    matrix, the plan is added on top, and acute and chronic loads for any
+    day are differences of two columns of its cumulative sum.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def simulate(self, team_id: str, start_date: date, days: int,
+                 sessions: List[Dict[str, any]]) -> Dict[str, any]:
+        """
+        Project acute/chronic load, ACWR and flag for each day of the plan.
+
+        `sessions` are dicts with date and training_load, plus optional
+        player_ids and/or positions. A session with neither applies to the
+        whole squad.
+        """
+        if not 1 <= days <= MAX_PLAN_DAYS:
+            raise ValueError(f"A plan covers 1 to {MAX_PLAN_DAYS} days")
+
+        players = self.db.execute(
+            select(models.Player.player_id, models.Player.name, models.Player.position, models.Player.team_id)
+            .where(models.Player.team_id == team_id, models.Player.is_active == True)
+            .order_by(models.Player.name)
+        ).all()
+        history_start = start_date - timedelta(days=CHRONIC_WINDOW)
+        end_date = start_date + timedelta(days=days - 1)
+
+        loads = np.zeros((len(players), CHRONIC_WINDOW + days))
+        if players:
+            self._add_logged_sessions(loads, players, history_start, end_date)
+            self._add_planned_sessions(loads, players, history_start, start_date, end_date, sessions)
+
+        acute, chronic, acwr = self._project(loads, days)
+        flags = acwr_flags(acwr)
+        return {
+            'team_id': team_id,
+            'start_date': start_date,
+            'dates': [start_date + timedelta(days=offset) for offset in range(days)],
+            'players': [
+                {'player_id': p.player_id, 'name': p.name, 'position': p.position} for p in players
+            ],
+            'acute_load': acute.round(1).tolist(),
+            'chronic_load': chronic.round(1).tolist(),
+            'acwr': acwr.round(2).tolist(),
+            'flags': flags.tolist(),
+            'flag_counts': {flag: (flags == flag).sum(axis=0).tolist() for flag in ('green', 'yellow', 'red')},
+        }
+
+    def _add_logged_sessions(self, loads: np.ndarray, players, history_start: date, end_date: date) -> None:
+        """Sessions already logged: from the team's cached season store, or one query."""
+        rows = {p.player_id: i for i, p in enumerate(players)}
+        store = season_store(self.db, players[0].team_id, history_start + timedelta(days=CHRONIC_WINDOW))
+        logged = store.load_matrix(list(rows), history_start, end_date)
+        if logged is not None:
+            loads += logged
+            return
+
+        logged = self.db.execute(
+            select(
+                models.TrainingSession.player_id,
+                models.TrainingSession.date,
+                func.sum(models.TrainingSession.effective_load),
+            )
+            .where(
+                models.TrainingSession.player_id.in_(list(rows)),
+                models.TrainingSession.date >= history_start,
+                models.TrainingSession.date <= end_date,
+            )
+            .group_by(models.TrainingSession.player_id, models.TrainingSession.date)
+        ).all()
+        if logged:
+            player_index = np.array([rows[player_id] for player_id, _, _ in logged])
+            day_index = np.array([(day - history_start).days for _, day, _ in logged])
+            np.add.at(loads, (player_index, day_index), [load or 0 for _, _, load in logged])
+
+    @staticmethod
+    def _add_planned_sessions(loads: np.ndarray, players, history_start: date, start_date: date,
+                              end_date: date, sessions: List[Dict[str, any]]) -> None:
+        rows = {p.player_id: i for i, p in enumerate(players)}
+        positions = np.array([p.position or '' for p in players])
+        for session in sessions:
+            if not start_date <= session['date'] <= end_date:
+                raise ValueError(f"Planned session on {session['date']} is outside the plan")
+            selected = np.zeros(len(players), dtype=bool)
+            player_ids = session.get('player_ids') or []
+            unknown = [str(player_id) for player_id in player_ids if player_id not in rows]
+            if unknown:
+                raise ValueError(f"Not active players of this team: {', '.join(unknown)}")
+            selected[[rows[player_id] for player_id in player_ids]] = True
+            if session.get('positions'):
+                selected |= np.isin(positions, session['positions'])
+            if not player_ids and not session.get('positions'):
+                selected[:] = True
+            loads[selected, (session['date'] - history_start).days] += session['training_load']
+
+    @staticmethod
+    def _project(loads: np.ndarray, days: int):
+        # totals[:, j] = load of all days before column j
+        totals = np.zeros((loads.shape[0], loads.shape[1] + 1))
+        np.cumsum(loads, axis=1, out=totals[:, 1:])
+        plan_days = np.arange(CHRONIC_WINDOW, CHRONIC_WINDOW + days)
+        acute = totals[:, plan_days + 1] - totals[:, plan_days - ACUTE_WINDOW]
+        chronic = totals[:, plan_days + 1] - totals[:, plan_days - CHRONIC_WINDOW]
+
+        acute_daily = acute / ACUTE_WINDOW
+        chronic_daily = chronic / CHRONIC_WINDOW
+        with np.errstate(divide='ignore', invalid='ignore'):
+            acwr = np.where(
+                chronic_daily > 0,
+                acute_daily / chronic_daily,
+                # No chronic load: same fallback as the calculator
+                np.where(acute_daily == 0, 1.0, 1.5),
+            )
+        return acute, chronic, acwr
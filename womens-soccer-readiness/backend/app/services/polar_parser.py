@@ -1,9 +1,13 @@
 import pandas as pd
-from typing import Dict, List, Optional
+from typing import IO, Dict, Iterable, List, Optional, Set, Union
 from datetime import datetime
 import hashlib
+import re
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from .. import models
+from .dirty_queue import DirtyQueue
+from .intensity import ZONE_COLUMNS, ZONES
 import logging
 
 logger = logging.getLogger(__name__)
@@ -24,15 +28,24 @@ class PolarCSVParser:
         'HR Average', 'HR Max', 'Training Load'
     }
     
+    # Optional: "Time in HR zone 1 (50 - 59 %)" ... as hh:mm:ss
+    HR_ZONE_COLUMN = re.compile(r'^Time in HR zone (\d)\b', re.IGNORECASE)
+    
     def __init__(self, db: Session, team_id: str):
         self.db = db
         self.team_id = team_id
         self.errors: List[str] = []
+        self.sessions_count = 0
+        self.players_count = 0
+        # (player_id, date, training_load, distance_m, avg_hr, max_hr) of new sessions
+        self.new_sessions: List[tuple] = []
         
-    def parse_csv(self, file_path: str) -> Dict[str, any]:
+    def parse_csv(self, file_path: Union[str, IO]) -> Dict[str, any]:
         """
         Parse Polar CSV and return structured data.
         
+        Takes a path or an open file (e.g. an upload), anything pd.read_csv reads.
+        
         Why pandas? Built for this exact use case - CSV parsing,
         data cleaning, and transformation.
         """
@@ -51,17 +64,31 @@ class PolarCSVParser:
             df['HR_Average'] = pd.to_numeric(df['HR Average'], errors='coerce')
             df['HR_Max'] = pd.to_numeric(df['HR Max'], errors='coerce')
             df['Training_Load'] = pd.to_numeric(df['Training Load'], errors='coerce')
+            for column in df.columns:
+                match = self.HR_ZONE_COLUMN.match(column)
+                if match and int(match.group(1)) in ZONES:
+                    minutes = pd.to_timedelta(df[column], errors='coerce').dt.total_seconds() / 60
+                    df[f'HR_Zone{match.group(1)}_Minutes'] = minutes
             
             # Group by player
             sessions_by_player = []
+            self.sessions_count = len(df)
+            self.players_count = df['Name'].nunique()
+            players = []
             for name, player_data in df.groupby('Name'):
                 player = self._get_or_create_player(name)
                 if player:
-                    sessions = self._create_training_sessions(player.id, player_data)
-                    sessions_by_player.append({
-                        'player': player,
-                        'sessions': sessions
-                    })
+                    hashes = [self._generate_session_hash(player.player_id, row) for _, row in player_data.iterrows()]
+                    players.append((player, player_data, hashes))
+            
+            # One lookup for the whole upload, not one per row
+            known_hashes = self._known_hashes(h for _, _, hashes in players for h in hashes)
+            for player, player_data, hashes in players:
+                sessions = self._create_training_sessions(player.player_id, player_data, hashes, known_hashes)
+                sessions_by_player.append({
+                    'player': player,
+                    'sessions': sessions
+                })
             
             return {
                 'success': True,
@@ -85,13 +112,16 @@ class PolarCSVParser:
         
         Design decision: Using name matching for MVP.
         Production should use unique IDs or email.
+        
+        Names match exactly, case-insensitively, so "Ann" is not "Joanne";
+        ix_players_team_lower_name serves this lookup.
         """
         # Normalize name for matching
         normalized_name = name.strip().lower()
         
         player = self.db.query(models.Player).filter(
             models.Player.team_id == self.team_id,
-            models.Player.name.ilike(f"%{normalized_name}%")
+            func.lower(models.Player.name) == normalized_name
         ).first()
         
         if not player:
@@ -99,10 +129,9 @@ class PolarCSVParser:
             try:
                 player = models.Player(
                     team_id=self.team_id,
-                    name=name,
-                    email=f"{normalized_name.replace(' ', '.')}@team.placeholder",
+                    name=name.strip(),
                     position="Unknown",  # Coach can update later
-                    active=True
+                    is_active=True
                 )
                 self.db.add(player)
                 self.db.flush()  # Get ID without committing
@@ -113,48 +142,90 @@ class PolarCSVParser:
                 
         return player
     
-    def _create_training_sessions(self, player_id: str, sessions_df: pd.DataFrame) -> List[models.TrainingSession]:
+    def _known_hashes(self, hashes: Iterable[str]) -> Set[str]:
+        """The import hashes among `hashes` that are already stored."""
+        hashes = set(hashes)
+        if not hashes:
+            return set()
+        return set(self.db.execute(
+            select(models.TrainingSession.import_hash)
+            .where(models.TrainingSession.import_hash.in_(hashes))
+        ).scalars())
+    
+    def _create_training_sessions(self, player_id: str, sessions_df: pd.DataFrame, hashes: List[str],
+                                  known_hashes: Set[str]) -> List[models.TrainingSession]:
         """
         Create training session records from player data.
         
+        `hashes` are the rows' session hashes; rows whose hash is in
+        `known_hashes` are skipped, and new ones are added to it.
+        
         Why return a list? Allows for batch operations and 
         validation before committing to database.
         """
         sessions = []
         
-        for _, row in sessions_df.iterrows():
-            # Generate unique hash to prevent duplicates
-            session_hash = self._generate_session_hash(player_id, row)
-            
-            # Check if session already exists
-            existing = self.db.query(models.TrainingSession).filter(
-                models.TrainingSession.import_hash == session_hash
-            ).first()
-            
-            if existing:
+        for (_, row), session_hash in zip(sessions_df.iterrows(), hashes):
+            if session_hash in known_hashes:
                 logger.debug(f"Session already exists for player {player_id} on {row['Date']}")
                 continue
             
             try:
                 session = models.TrainingSession(
                     player_id=player_id,
-                    session_date=row['Date'],
-                    duration_minutes=row['Duration_Minutes'],
-                    distance_km=row['Distance_KM'],
-                    avg_heart_rate=row['HR_Average'],
-                    max_heart_rate=row['HR_Max'],
-                    training_load=row['Training_Load'],
+                    date=row['Date'].date(),
+                    duration_min=self._to_int(row['Duration_Minutes']),
+                    distance_m=self._to_float(row['Distance_KM'] * 1000),
+                    avg_hr=self._to_int(row['HR_Average']),
+                    max_hr=self._to_int(row['HR_Max']),
+                    training_load=self._to_float(row['Training_Load']),
+                    **self._zone_minutes(row),
                     session_type=self._classify_session_type(row),
                     import_hash=session_hash,
-                    raw_data=row.to_dict()  # Store original for debugging
+                    raw_data=self._raw_row(row)  # Store original for debugging
                 )
+                self.db.add(session)
+                known_hashes.add(session_hash)  # a row repeated in the same file
                 sessions.append(session)
+                self.new_sessions.append((player_id, session.date, session.training_load,
+                                          session.distance_m, session.avg_hr, session.max_hr))
                 
             except Exception as e:
                 self.errors.append(f"Failed to create session for {row['Date']}: {str(e)}")
                 
         return sessions
     
+    def _zone_minutes(self, row: pd.Series) -> Dict[str, Optional[float]]:
+        """hr_zoneN_min values; NULL for zones the export doesn't have."""
+        minutes = {}
+        for zone, column in zip(ZONES, ZONE_COLUMNS):
+            value = self._to_float(row.get(f'HR_Zone{zone}_Minutes'))
+            minutes[column] = None if value is None else round(value, 1)
+        return minutes
+    
+    @staticmethod
+    def _to_float(value) -> Optional[float]:
+        return None if pd.isna(value) else float(value)
+    
+    @staticmethod
+    def _to_int(value) -> Optional[int]:
+        return None if pd.isna(value) else int(round(value))
+    
+    @staticmethod
+    def _raw_row(row: pd.Series) -> Dict:
+        """The CSV row as JSON-safe values (Timestamps, NaN and numpy scalars aren't)."""
+        raw = {}
+        for key, value in row.items():
+            if pd.isna(value):
+                raw[key] = None
+            elif isinstance(value, (pd.Timestamp, pd.Timedelta)):
+                raw[key] = str(value)
+            elif hasattr(value, 'item'):
+                raw[key] = value.item()
+            else:
+                raw[key] = value
+        return raw
+    
     def _generate_session_hash(self, player_id: str, row: pd.Series) -> str:
         """
         Generate unique hash for session to prevent duplicates.
@@ -185,11 +256,27 @@ class PolarCSVParser:
             return "Regular Training"
     
     def commit_sessions(self) -> bool:
-        """Commit all parsed sessions to database."""
+        """
+        Commit all parsed sessions to database.
+
+        Dashboards subscribed to the team's event stream hear about the
+        import as soon as it is durable - not before the commit. The event
+        is an outbox row (flag_events) in the same transaction, so streams
+        on every API process get it. The days the new sessions reach are
+        queued for recompute in that transaction too.
+        """
         try:
+            DirtyQueue(self.db).mark_sessions(row[:2] for row in self.new_sessions)
+            if self.team_id is not None:
+                self.db.add(models.FlagEvent(team_id=self.team_id, event_type='import_completed', data={
+                    'team_id': str(self.team_id),
+                    'sessions_count': self.sessions_count,
+                    'players_count': self.players_count,
+                    'errors': len(self.errors),
+                }))
             self.db.commit()
             return True
         except Exception as e:
             logger.error(f"Failed to commit sessions: {str(e)}")
             self.db.rollback()
-            return False
\ No newline at end of file
+            return False
@@ -1,14 +1,90 @@
-from datetime import datetime, timedelta
+from datetime import date as date_type, datetime, timedelta
 from typing import Dict, List, Optional, Tuple
-import pandas as pd
 import numpy as np
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import delete, func, insert
 from .. import models
+from .baselines import deviation_recommendations
+from .team_summary import TeamSummaryService
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+def round_load(value: float, digits: int = 1) -> float:
+    """
+    Round a load total for display and storage.
+
+    The same loads summed in another order (per-day SQL sums, NumPy) can
+    differ in the last bits, which flips a total ending in ...5 to the
+    other side. Snapping to 1e-6 first makes every path round alike.
+    """
+    return round(round(value, 6), digits)
+
+
+# Daily totals compared acute vs chronic, like training load. `load` is
+# TrainingSession.effective_load (sRPE where the device load is missing).
+WORKLOAD_METRICS = ('load', 'distance', 'high_speed_running', 'sprint_distance', 'accelerations')
+# One definition of the windows for every path (calculator, season stores,
+# trends SQL): totals over these days, averaged per 7 and 28 days
+WINDOW_DAYS = 29   # date-28 .. date, as _calculate_acwr reads
+ACUTE_DAYS = 8     # date-7 .. date
+MONOTONY_DAYS = 7  # Foster: the last week's daily loads
+
+
+def acwr_from_totals(acute_total: float, chronic_total: float) -> float:
+    """
+    The engine's ACWR from acute and chronic window totals.
+
+    Without chronic load there is nothing to compare against: 1.0, or 1.5
+    if acute load appeared anyway. Trends mirror this rule in SQL.
+    """
+    acute_daily = acute_total / 7
+    chronic_daily = chronic_total / 28
+    if chronic_daily > 0:
+        return acute_daily / chronic_daily
+    return 1.0 if acute_daily == 0 else 1.5
+
+
+def workload_profile(daily: np.ndarray) -> Dict[str, any]:
+    """
+    Acute and chronic totals and their ratio for every workload metric,
+    plus Foster monotony and strain of training load.
+
+    `daily` is WORKLOAD_METRICS x WINDOW_DAYS day totals, oldest first and
+    `date` last - every metric's windows are row sums of one array. Load's
+    ratio is the engine's (acwr_from_totals); another metric without
+    chronic load has no ratio, since it is usually not recorded at all. A
+    week without variation (e.g. no sessions) has no monotony or strain.
+    """
+    acute = daily[:, -ACUTE_DAYS:].sum(axis=1)
+    chronic = daily.sum(axis=1)
+    week = daily[0, -MONOTONY_DAYS:]
+    mean = float(week.mean())
+    variance = float(week.var())
+    if variance > 1e-9 * mean * mean:
+        monotony = mean / variance ** 0.5
+        strain = float(week.sum()) * monotony
+    else:
+        monotony = strain = None
+
+    ratios = {}
+    for metric, acute_total, chronic_total in zip(WORKLOAD_METRICS, acute, chronic):
+        if round_load(chronic_total) > 0:
+            ratios[metric] = round_load(acwr_from_totals(acute_total, chronic_total), 2)
+        elif metric == 'load':
+            ratios[metric] = acwr_from_totals(0.0, 0.0)
+        else:
+            ratios[metric] = None
+    return {
+        'acute': {metric: round_load(float(total)) for metric, total in zip(WORKLOAD_METRICS, acute)},
+        'chronic': {metric: round_load(float(total)) for metric, total in zip(WORKLOAD_METRICS, chronic)},
+        'acwr': ratios,
+        'monotony': None if monotony is None else round_load(monotony, 2),
+        'strain': None if strain is None else round_load(strain),
+    }
+
+
 class ReadinessCalculator:
     """
     Calculate player readiness based on training load, wellness, and cycle data.
@@ -30,8 +106,11 @@ class ReadinessCalculator:
         'cycle': 0.10          # Menstrual cycle phase
     }
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, store=None):
         self.db = db
+        # Optional SeasonStore: player-days it covers are scored from its
+        # arrays instead of per-player queries (same results)
+        self.store = store
         
     def calculate_team_readiness(self, team_id: str, date: datetime) -> Dict[str, any]:
         """
@@ -42,14 +121,14 @@ class ReadinessCalculator:
         """
         players = self.db.query(models.Player).filter(
             models.Player.team_id == team_id,
-            models.Player.active == True
+            models.Player.is_active == True
         ).all()
         
         team_scores = []
         flagged_players = []
         
         for player in players:
-            readiness = self.calculate_player_readiness(player.id, date)
+            readiness = self.calculate_player_readiness(player.player_id, date)
             team_scores.append(readiness)
             
             if readiness['flag'] != 'green':
@@ -59,7 +138,7 @@ class ReadinessCalculator:
                 })
         
         # Calculate team aggregates
-        avg_score = np.mean([r['overall_score'] for r in team_scores])
+        avg_score = float(np.mean([r['overall_score'] for r in team_scores])) if team_scores else None
         
         return {
             'date': date,
@@ -73,6 +152,82 @@ class ReadinessCalculator:
             'player_scores': team_scores
         }
     
+    def refresh_team_day(self, team_id: str, date: datetime) -> Dict[str, any]:
+        """
+        Calculate a team-day, store each player's score and refresh the team summary.
+        
+        This is the write path: calculate_team_readiness stays read-only so
+        it can be called freely (previews, tests); this method persists the
+        results and keeps team_daily_summaries in step with them.
+        """
+        day = self._as_date(date)
+        team = self.calculate_team_readiness(team_id, day)
+        self._store_scores(day, team['player_scores'], team_id)
+        summary = TeamSummaryService(self.db).refresh(team_id, day, team)
+        self.db.commit()
+        return summary
+    
+    def refresh_players_day(self, player_ids: List, date: datetime,
+                            team_id: Optional[str] = None) -> List[Dict[str, any]]:
+        """
+        Recalculate and store some players' scores for a day.
+        
+        For incremental recomputes (DirtyQueue): the caller refreshes the
+        team summaries and commits once for the whole batch. Flag changes
+        are recorded for the team's event stream when team_id is given.
+        """
+        day = self._as_date(date)
+        player_scores = [self.calculate_player_readiness(player_id, day) for player_id in player_ids]
+        self._store_scores(day, player_scores, team_id)
+        # Our sessions don't autoflush: the team summary re-aggregates these rows
+        self.db.flush()
+        return player_scores
+    
+    def _store_scores(self, day: date_type, player_scores: List[Dict[str, any]],
+                      team_id: Optional[str] = None) -> None:
+        """
+        Replace the day's readiness_scores rows for these players.
+        
+        The delete returns the flags it replaces, and every player-day whose
+        flag differs gets a flag_events row in the same transaction -
+        committed with the score or not at all, whichever process (API,
+        scheduler, recompute) did the scoring.
+        """
+        if not player_scores:
+            return
+        player_ids = [score['player_id'] for score in player_scores]
+        replaced = dict(self.db.execute(
+            delete(models.ReadinessScore)
+            .where(models.ReadinessScore.player_id.in_(player_ids), models.ReadinessScore.date == day)
+            .returning(models.ReadinessScore.player_id, models.ReadinessScore.readiness_flag)
+            .execution_options(synchronize_session=False)
+        ).all())
+        if team_id is not None:
+            changes = [
+                {'team_id': team_id, 'player_id': score['player_id'], 'date': day,
+                 'previous_flag': replaced.get(score['player_id']), 'flag': score['flag'],
+                 'overall_score': score['overall_score']}
+                for score in player_scores if replaced.get(score['player_id']) != score['flag']
+            ]
+            if changes:
+                self.db.execute(insert(models.FlagEvent), changes)
+        self.db.add_all([
+            models.ReadinessScore(
+                player_id=score['player_id'],
+                date=day,
+                overall_score=score['overall_score'],
+                training_load_score=score['components']['acwr_normalized'],
+                wellness_score=score['components']['wellness'],
+                recovery_score=score['components']['recovery'],
+                acute_load=score['details']['acute_load'],
+                chronic_load=score['details']['chronic_load'],
+                acwr=score['components']['acwr'],
+                readiness_flag=score['flag'],
+                recommendations=score['recommendations']
+            )
+            for score in player_scores
+        ])
+    
     def calculate_player_readiness(self, player_id: str, date: datetime) -> Dict[str, any]:
         """
         Calculate individual player readiness.
@@ -82,7 +237,7 @@ class ReadinessCalculator:
         """
         # Get component scores
         acwr, acwr_details = self._calculate_acwr(player_id, date)
-        wellness_score = self._get_wellness_score(player_id, date)
+        wellness_score, baseline_details = self._get_wellness_score(player_id, date)
         recovery_score = self._calculate_recovery_score(player_id, date)
         cycle_adjustment = self._get_cycle_adjustment(player_id, date)
         
@@ -99,7 +254,7 @@ class ReadinessCalculator:
         
         # Get recommendations
         recommendations = self._generate_recommendations(
-            overall_score, acwr, wellness_score, recovery_score
+            overall_score, acwr, wellness_score, recovery_score, baseline_details
         )
         
         return {
@@ -117,8 +272,11 @@ class ReadinessCalculator:
             'details': {
                 'acute_load': acwr_details['acute_load'],
                 'chronic_load': acwr_details['chronic_load'],
-                'days_since_last_session': acwr_details.get('days_since_last', 0)
+                'days_since_last_session': acwr_details.get('days_since_last', 0),
+                'resting_hr_z': baseline_details['resting_hr_z'],
+                'hrv_z': baseline_details['hrv_z']
             },
+            'workload': acwr_details['workload'],
             'recommendations': recommendations
         }
     
@@ -129,56 +287,62 @@ class ReadinessCalculator:
         Why 7:28? Research shows 7-day acute load vs 28-day chronic
         load best predicts injury risk.
         """
+        date = self._as_date(date)
+        if self.store is not None and self.store.covers(player_id, date):
+            return self.store.acwr(player_id, date)
+
         # Define windows
         acute_start = date - timedelta(days=7)
         chronic_start = date - timedelta(days=28)
         
-        # Get training sessions
-        sessions = self.db.query(models.TrainingSession).filter(
-            models.TrainingSession.player_id == player_id,
-            models.TrainingSession.session_date >= chronic_start,
-            models.TrainingSession.session_date <= date
+        # Get training sessions - every workload metric in one query
+        ts = models.TrainingSession
+        sessions = self.db.query(
+            ts.date, ts.effective_load, ts.distance_m, ts.high_speed_running_m,
+            ts.sprint_distance_m, ts.accelerations
+        ).filter(
+            ts.player_id == player_id,
+            ts.date >= chronic_start,
+            ts.date <= date
         ).all()
         
-        if not sessions:
-            return 1.0, {'acute_load': 0, 'chronic_load': 0}
+        # Day totals per metric; missing values count as zero, like load
+        daily = np.zeros((len(WORKLOAD_METRICS), WINDOW_DAYS))
+        for s in sessions:
+            daily[:, (s.date - chronic_start).days] += [value or 0 for value in s[1:]]
+        workload = workload_profile(daily)
         
-        # Convert to DataFrame for easier calculation
-        df = pd.DataFrame([{
-            'date': s.session_date,
-            'load': s.training_load or 0
-        } for s in sessions])
+        if not sessions:
+            return 1.0, {'acute_load': 0, 'chronic_load': 0, 'workload': workload}
         
-        # Calculate loads
-        acute_mask = df['date'] >= acute_start
-        acute_load = df[acute_mask]['load'].sum()
-        chronic_load = df['load'].sum()
+        # Calculate loads. At most 28 rows per player: plain sums beat
+        # building a DataFrame, which cost more than the query itself.
+        acute_load = sum(s.effective_load or 0 for s in sessions if s.date >= acute_start)
+        chronic_load = sum(s.effective_load or 0 for s in sessions)
         
-        # Calculate daily averages
+        # Calculate daily averages and their ratio (safe without chronic load)
         acute_daily = acute_load / 7
         chronic_daily = chronic_load / 28
-        
-        # Calculate ACWR (with protection against division by zero)
-        if chronic_daily > 0:
-            acwr = acute_daily / chronic_daily
-        else:
-            acwr = 1.0 if acute_daily == 0 else 1.5
+        acwr = acwr_from_totals(acute_load, chronic_load)
         
         # Days since last session
-        if len(df) > 0:
-            last_session = df['date'].max()
-            days_since_last = (date - last_session).days
-        else:
-            days_since_last = 99
+        last_session = max(s.date for s in sessions)
+        days_since_last = (date - last_session).days
         
         return acwr, {
-            'acute_load': round(acute_load, 1),
-            'chronic_load': round(chronic_load, 1),
-            'acute_daily': round(acute_daily, 1),
-            'chronic_daily': round(chronic_daily, 1),
-            'days_since_last': days_since_last
+            'acute_load': round_load(acute_load),
+            'chronic_load': round_load(chronic_load),
+            'acute_daily': round_load(acute_daily),
+            'chronic_daily': round_load(chronic_daily),
+            'days_since_last': days_since_last,
+            'workload': workload
         }
     
+    @staticmethod
+    def _as_date(value) -> date_type:
+        """Session and wellness dates are DATE columns; compare like with like."""
+        return value.date() if isinstance(value, datetime) else value
+    
     def _normalize_acwr(self, acwr: float) -> float:
         """
         Normalize ACWR to 0-100 scale.
@@ -197,28 +361,64 @@ class ReadinessCalculator:
             excess = acwr - self.ACWR_SWEET_SPOT[1]
             return max(0, 80 - excess * 80 / (self.ACWR_DANGER_ZONE_HIGH - self.ACWR_SWEET_SPOT[1]))
     
-    def _get_wellness_score(self, player_id: str, date: datetime) -> float:
-        """Get most recent wellness check score."""
-        wellness = self.db.query(models.WellnessCheck).filter(
+    def _get_wellness_score(self, player_id: str, date: datetime) -> Tuple[float, Dict]:
+        """
+        Get most recent wellness check score, plus its baseline deviations.
+        
+        The resting HR / HRV z-scores were computed when the check was
+        recorded (BaselineTracker), so they come along in the same query.
+        """
+        date = self._as_date(date)
+        if self.store is not None and self.store.covers(player_id, date):
+            score, baseline_details, found = self.store.wellness(player_id, date)
+            if not found:
+                return 70.0, baseline_details
+            return (70.0 if score is None else score), baseline_details
+        
+        wellness = self.db.query(
+            models.WellnessCheck.date,
+            models.WellnessCheck.sleep_quality,
+            models.WellnessCheck.fatigue,
+            models.WellnessCheck.soreness,
+            models.WellnessCheck.stress,
+            models.WellnessCheck.mood,
+            models.WellnessCheck.resting_hr_z,
+            models.WellnessCheck.hrv_z
+        ).filter(
             models.WellnessCheck.player_id == player_id,
-            models.WellnessCheck.check_date <= date
-        ).order_by(models.WellnessCheck.check_date.desc()).first()
+            models.WellnessCheck.date <= date
+        ).order_by(models.WellnessCheck.date.desc()).first()
         
-        if not wellness or (date - wellness.check_date).days > 1:
+        if not wellness or (date - wellness.date).days > 1:
             # No recent wellness check
-            return 70.0  # Neutral default
+            return 70.0, {'resting_hr_z': None, 'hrv_z': None}  # Neutral default
         
-        # Average of wellness metrics (each 1-10 scale)
+        baseline_details = {'resting_hr_z': wellness.resting_hr_z, 'hrv_z': wellness.hrv_z}
+        
+        score = self.score_wellness(
+            wellness.sleep_quality, wellness.fatigue, wellness.soreness,
+            wellness.stress, wellness.mood
+        )
+        return (70.0 if score is None else score), baseline_details
+    
+    @staticmethod
+    def score_wellness(sleep_quality, fatigue, soreness, stress, mood) -> Optional[float]:
+        """0-100 wellness score from 1-5 answers; None if none were given."""
+        # Wellness metrics are 1-5. Soreness, fatigue and stress are
+        # "higher is worse", so flip them before averaging.
         scores = [
-            wellness.sleep_quality,
-            wellness.energy_level,
-            wellness.muscle_soreness,
-            wellness.stress_level,
-            wellness.mood
+            sleep_quality,
+            6 - fatigue if fatigue is not None else None,
+            6 - soreness if soreness is not None else None,
+            6 - stress if stress is not None else None,
+            mood
         ]
+        scores = [s for s in scores if s is not None]
+        if not scores:
+            return None
         
         # Convert to 0-100 scale
-        return np.mean([s for s in scores if s is not None]) * 10
+        return float(np.mean(scores)) * 20
     
     def _calculate_recovery_score(self, player_id: str, date: datetime) -> float:
         """
@@ -227,16 +427,19 @@ class ReadinessCalculator:
         Why this matters: Adequate recovery prevents overtraining.
         Too much recovery leads to detraining.
         """
-        last_session = self.db.query(models.TrainingSession).filter(
-            models.TrainingSession.player_id == player_id,
-            models.TrainingSession.session_date < date
-        ).order_by(models.TrainingSession.session_date.desc()).first()
+        date = self._as_date(date)
+        if self.store is not None and self.store.covers(player_id, date):
+            days_since = self.store.days_since_last_session(player_id, date)
+        else:
+            last_session = self.db.query(models.TrainingSession.date).filter(
+                models.TrainingSession.player_id == player_id,
+                models.TrainingSession.date < date
+            ).order_by(models.TrainingSession.date.desc()).first()
+            days_since = (date - last_session.date).days if last_session else None
         
-        if not last_session:
+        if days_since is None:
             return 100.0  # Fully recovered
         
-        days_since = (date - last_session.session_date).days
-        
         if days_since == 0:
             return 40.0  # Same day training
         elif days_since == 1:
@@ -283,7 +486,8 @@ class ReadinessCalculator:
         return 'green'
     
     def _generate_recommendations(self, overall: float, acwr: float, 
-                                 wellness: float, recovery: float) -> List[str]:
+                                 wellness: float, recovery: float,
+                                 baseline_details: Optional[Dict] = None) -> List[str]:
         """Generate actionable recommendations for coaches."""
         recommendations = []
         
@@ -300,6 +504,11 @@ class ReadinessCalculator:
         if recovery < 70:
             recommendations.append("⏱️ Consider lighter session or recovery work")
         
+        if baseline_details:
+            recommendations.extend(deviation_recommendations(
+                baseline_details['resting_hr_z'], baseline_details['hrv_z']
+            ))
+        
         if not recommendations:
             recommendations.append("✅ Ready for normal training")
         
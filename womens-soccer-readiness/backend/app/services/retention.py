@@ -0,0 +1,217 @@
+import json
+import logging
+import os
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import JSON, delete, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Tables that are archived, with their primary key column.
+# team_daily_summaries stays: it is tiny and is the long-term trend.
+ARCHIVED_TABLES = {
+    'training_sessions': (models.TrainingSession, 'session_id'),
+    'wellness_checks': (models.WellnessCheck, 'check_id'),
+    'readiness_scores': (models.ReadinessScore, 'score_id'),
+}
+
+
+def season_of(day: date, start_month: int) -> int:
+    """Season label = the year the season starts in."""
+    return day.year if day.month >= start_month else day.year - 1
+
+
+def season_bounds(season: int, start_month: int) -> Tuple[date, date]:
+    """First day of the season and first day of the next one."""
+    return date(season, start_month, 1), date(season + 1, start_month, 1)
+
+
+def _json_columns(model) -> List[str]:
+    return [c.name for c in model.__table__.columns if isinstance(c.type, (JSON, ARRAY))]
+
+
+class RetentionService:
+    """
+    Move team-seasons older than the retention window out of the database.
+
+    Each team-season goes to one zstd-compressed Parquet file per table.
+    Order of operations makes a crash at any point safe to re-run:
+    write the file, record it in archive_index and commit, then delete the
+    rows in small batches. A re-run merges any rows still left into the file.
+    Only the primary keys that went into the file are deleted, so a late
+    import for the season that commits mid-run stays in the table (and is
+    picked up by the next run).
+    """
+
+    def __init__(self, db: Session, archive_dir: Optional[str] = None,
+                 batch_size: Optional[int] = None, season_start_month: Optional[int] = None):
+        self.db = db
+        self.archive_dir = Path(archive_dir or settings.archive_dir)
+        self.batch_size = batch_size or settings.retention_batch_size
+        self.season_start_month = season_start_month or settings.season_start_month
+
+    def cutoff(self, keep_seasons: int, today: Optional[date] = None) -> date:
+        """Start of the oldest season that stays in the database."""
+        current = season_of(today or date.today(), self.season_start_month)
+        return season_bounds(current - keep_seasons + 1, self.season_start_month)[0]
+
+    def pending(self, keep_seasons: int, today: Optional[date] = None) -> List[Tuple[str, str, int]]:
+        """(team_id, table, season) combinations that would be archived."""
+        cutoff = self.cutoff(keep_seasons, today)
+        pending = []
+        for table, (model, _) in ARCHIVED_TABLES.items():
+            rows = self.db.execute(
+                select(models.Player.team_id, func.min(model.date))
+                .join(models.Player, models.Player.player_id == model.player_id)
+                .where(model.date < cutoff)
+                .group_by(models.Player.team_id)
+            ).all()
+            for team_id, oldest in rows:
+                for season in range(season_of(oldest, self.season_start_month),
+                                    season_of(cutoff, self.season_start_month)):
+                    pending.append((team_id, table, season))
+        return pending
+
+    def run(self, keep_seasons: int, today: Optional[date] = None) -> List[Dict[str, any]]:
+        """Archive everything older than the newest `keep_seasons` seasons."""
+        if keep_seasons < 1:
+            raise ValueError("keep_seasons must be at least 1")
+        results = []
+        for team_id, table, season in self.pending(keep_seasons, today):
+            result = self.archive_season(team_id, table, season)
+            if result['archived']:
+                results.append(result)
+        return results
+
+    def archive_season(self, team_id, table: str, season: int) -> Dict[str, any]:
+        model, pk = ARCHIVED_TABLES[table]
+        start, end = season_bounds(season, self.season_start_month)
+
+        rows = self.db.execute(
+            select(*model.__table__.columns)
+            .join(models.Player, models.Player.player_id == model.player_id)
+            .where(models.Player.team_id == team_id, model.date >= start, model.date < end)
+        ).mappings().all()
+        if not rows:
+            return {'team_id': team_id, 'table': table, 'season': season, 'archived': 0}
+
+        relative_path = Path(str(team_id)) / f"{table}_{season}.parquet"
+        row_count = self._write_parquet(model, pk, rows, relative_path)
+        self._record(team_id, table, season, start, end, row_count, relative_path)
+        self.db.commit()
+
+        archived_ids = [row[pk] for row in rows]
+        deleted = self._delete_in_batches(model, pk, archived_ids, start, end)
+        if deleted != len(archived_ids):
+            # Someone else deleted archived rows meanwhile; the file still has them
+            logger.warning(f"Archived {len(archived_ids)} {table} rows of team {team_id}, "
+                           f"season {season}, but only {deleted} were still there to delete")
+        logger.info(f"Archived {deleted} {table} rows of team {team_id}, season {season}")
+        return {'team_id': team_id, 'table': table, 'season': season,
+                'archived': deleted, 'file_path': str(relative_path)}
+
+    def read_archive(self, team_id, table: str, season: int,
+                     player_id: Optional[UUID] = None) -> Optional[List[Dict[str, any]]]:
+        """
+        Rows of an archived team-season, or None if it was never archived.
+
+        With player_id, the filter is applied by the Parquet reader, so only
+        that player's rows are ever turned into Python objects.
+        """
+        import pyarrow.parquet as pq
+
+        entry = self.db.execute(
+            select(models.ArchiveIndex).where(
+                models.ArchiveIndex.team_id == team_id,
+                models.ArchiveIndex.table_name == table,
+                models.ArchiveIndex.season == season,
+            )
+        ).scalar_one_or_none()
+        if entry is None:
+            return None
+
+        filters = [('player_id', '=', str(player_id))] if player_id else None
+        rows = pq.read_table(self.archive_dir / entry.file_path, filters=filters).to_pylist()
+        json_columns = _json_columns(ARCHIVED_TABLES[table][0])
+        for row in rows:
+            for column in json_columns:
+                if row.get(column) is not None:
+                    row[column] = json.loads(row[column])
+        return rows
+
+    def _write_parquet(self, model, pk: str, rows, relative_path: Path) -> int:
+        # Imported here: pandas/pyarrow are only needed by this nightly job
+        import pandas as pd
+
+        json_columns = _json_columns(model)
+        records = []
+        for row in rows:
+            record = dict(row)
+            for key, value in record.items():
+                if isinstance(value, UUID):
+                    record[key] = str(value)
+                elif key in json_columns and value is not None:
+                    record[key] = json.dumps(value)
+            records.append(record)
+        df = pd.DataFrame.from_records(records, columns=[c.name for c in model.__table__.columns])
+
+        path = self.archive_dir / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            # An earlier run wrote the file but did not finish deleting
+            df = pd.concat([pd.read_parquet(path), df]).drop_duplicates(subset=[pk], keep='last')
+
+        # Sorted rows compress better and keep a player's season contiguous
+        df = df.sort_values(['player_id', 'date'])
+        tmp_path = path.with_suffix('.parquet.tmp')
+        df.to_parquet(tmp_path, engine='pyarrow', compression='zstd', index=False)
+        os.replace(tmp_path, path)
+        return len(df)
+
+    def _record(self, team_id, table: str, season: int, start: date, end: date,
+                row_count: int, relative_path: Path) -> None:
+        entry = self.db.execute(
+            select(models.ArchiveIndex).where(
+                models.ArchiveIndex.team_id == team_id,
+                models.ArchiveIndex.table_name == table,
+                models.ArchiveIndex.season == season,
+            )
+        ).scalar_one_or_none()
+        if entry is None:
+            entry = models.ArchiveIndex(team_id=team_id, table_name=table, season=season)
+            self.db.add(entry)
+        entry.start_date = start
+        entry.end_date = end
+        entry.row_count = row_count
+        entry.file_path = relative_path.as_posix()
+
+    def _delete_in_batches(self, model, pk: str, archived_ids: List, start: date, end: date) -> int:
+        """
+        Delete the archived rows a batch at a time, committing between batches.
+
+        One big DELETE would hold row locks on a whole season and produce one
+        huge transaction (and WAL burst); small batches let readiness writes
+        interleave. The ids are the ones read for the Parquet file - not a
+        fresh select of the range, which could include rows never archived.
+        """
+        pk_column = getattr(model, pk)
+        deleted = 0
+        for offset in range(0, len(archived_ids), self.batch_size):
+            batch = archived_ids[offset:offset + self.batch_size]
+            # The date range lets PostgreSQL prune partitions on partitioned tables
+            result = self.db.execute(
+                delete(model)
+                .where(pk_column.in_(batch), model.date >= start, model.date < end)
+                .execution_options(synchronize_session=False)
+            )
+            self.db.commit()
+            deleted += result.rowcount
+        return deleted
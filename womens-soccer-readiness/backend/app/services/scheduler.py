@@ -0,0 +1,217 @@
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from .. import models
+from ..config import settings
+from ..db import DATABASE_URL, create_worker_engine
+
+logger = logging.getLogger(__name__)
+
+RETRY_BACKOFF_S = 2.0  # first retry waits this long, then doubles
+
+# Per worker process, set up once by _init_worker
+_worker_sessions: Optional[sessionmaker] = None
+
+
+def _init_worker(connections: int, database_url: str) -> None:
+    global _worker_sessions
+    # The engine inherited from the parent is left alone (see create_worker_engine)
+    _worker_sessions = sessionmaker(
+        bind=create_worker_engine(connections, database_url), autocommit=False, autoflush=False
+    )
+
+
+def _refresh_team(team_id, day: date, write_files: bool = True) -> Dict[str, any]:
+    """
+    One unit of work, run in a worker: score and store a team's day.
+
+    Errors come back as values - a SQLAlchemy exception does not always
+    survive pickling back to the parent process. The scores are committed
+    before the snapshot and cube are written, so a file error is reported
+    on its own (`files_error`) and does not make the team fail or retry.
+    """
+    from .readiness_calculator import ReadinessCalculator
+    from .season_cube import SeasonCubeService
+    from .season_store import SeasonStore
+    from .snapshots import SnapshotService
+
+    started = time.perf_counter()
+    db = _worker_sessions()
+    try:
+        try:
+            # The team's last 28 days in two queries, instead of ~4 per player
+            store = SeasonStore.load_days(db, team_id, day, day)
+            summary = ReadinessCalculator(db, store=store).refresh_team_day(team_id, day)
+        except Exception as e:
+            db.rollback()
+            return {'ok': False, 'error': f"{type(e).__name__}: {e}",
+                    'duration_ms': (time.perf_counter() - started) * 1000}
+
+        result = {'ok': True, 'player_count': summary['player_count']}
+        if write_files:
+            try:
+                SnapshotService(db).write_team(team_id)
+                SeasonCubeService(db).append(team_id, day)
+            except Exception as e:
+                db.rollback()
+                result['files_error'] = f"{type(e).__name__}: {e}"
+        result['duration_ms'] = (time.perf_counter() - started) * 1000
+        return result
+    finally:
+        db.close()
+
+
+class ReadinessScheduler:
+    """
+    Compute and store a day's readiness for every active team, in parallel.
+
+    Teams are sharded across worker processes, largest first; each team is
+    one refresh_team_day transaction, and teams never share rows.
+
+    Each worker holds at most `worker_connections` database connections,
+    so a run needs workers x worker_connections in total - size it against
+    the server's max_connections and the API's own pool.
+
+    The parent process is the only one writing readiness_runs and
+    readiness_run_teams: every result, retry and duration goes through it.
+    """
+
+    def __init__(self, db: Session, workers: Optional[int] = None,
+                 worker_connections: Optional[int] = None, max_attempts: Optional[int] = None,
+                 database_url: str = DATABASE_URL, write_files: bool = True):
+        self.db = db
+        self.workers = workers or settings.scheduler_workers
+        self.worker_connections = worker_connections or settings.scheduler_worker_connections
+        self.max_attempts = max_attempts or settings.scheduler_max_attempts
+        self.database_url = database_url
+        self.write_files = write_files
+
+    def active_teams(self) -> List[Tuple]:
+        """(team_id, active players) for teams with anyone to score, largest first."""
+        players = func.count(models.Player.player_id)
+        return self.db.execute(
+            select(models.Player.team_id, players)
+            .where(models.Player.is_active == True, models.Player.team_id.is_not(None))
+            .group_by(models.Player.team_id)
+            .order_by(players.desc())
+        ).all()
+
+    def run(self, day: Optional[date] = None) -> models.ReadinessRun:
+        day = day or date.today()
+        teams = self.active_teams()
+        run = models.ReadinessRun(
+            date=day, status='running', workers=self.workers, team_count=len(teams),
+            started_at=datetime.utcnow(),
+        )
+        self.db.add(run)
+        self.db.commit()
+        logger.info(f"Readiness run {run.run_id}: {len(teams)} teams for {day}, "
+                    f"{self.workers} workers x {self.worker_connections} connections")
+
+        started = time.perf_counter()
+        recorded = set()
+        try:
+            self._run_teams(run, day, [team_id for team_id, _ in teams], recorded)
+        finally:
+            # Whatever went wrong in the parent, the run row must not stay 'running'
+            self.db.rollback()
+            for team_id, _ in teams:
+                if team_id not in recorded:
+                    self._record_team(run, team_id, 0, {'ok': False, 'duration_ms': None,
+                                                        'error': 'Run aborted before the team finished'})
+            run.finished_at = datetime.utcnow()
+            run.duration_s = round(time.perf_counter() - started, 3)
+            run.status = ('succeeded' if run.failed_count == 0
+                          else 'failed' if run.succeeded_count == 0 else 'partial')
+            self.db.commit()
+            logger.info(f"Readiness run {run.run_id} {run.status} in {run.duration_s}s: "
+                        f"{run.succeeded_count} ok, {run.failed_count} failed")
+        return run
+
+    def _pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker,
+            initargs=(self.worker_connections, self.database_url),
+        )
+
+    def _run_teams(self, run: models.ReadinessRun, day: date, team_ids: List, recorded: set) -> None:
+        """
+        Feed the teams through the pool, retrying failures after a backoff.
+
+        The backoff is kept here, as a due time per retry, so a waiting
+        retry never holds a worker. A worker that dies (e.g. out of memory)
+        breaks the whole pool: every team in flight fails that attempt, and
+        the retries go to a new pool.
+        """
+        # (due on the monotonic clock, team_id, attempt)
+        queue: List[Tuple[float, any, int]] = [(0.0, team_id, 1) for team_id in team_ids]
+        pending: Dict[Future, Tuple] = {}
+        pool = self._pool()
+        try:
+            while queue or pending:
+                now = time.monotonic()
+                for entry in [entry for entry in queue if entry[0] <= now]:
+                    queue.remove(entry)
+                    _, team_id, attempt = entry
+                    try:
+                        future = pool.submit(_refresh_team, team_id, day, self.write_files)
+                    except BrokenProcessPool:
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        pool = self._pool()
+                        future = pool.submit(_refresh_team, team_id, day, self.write_files)
+                    pending[future] = (team_id, attempt)
+
+                timeout = max(0.0, min(entry[0] for entry in queue) - time.monotonic()) if queue else None
+                if not pending:
+                    time.sleep(timeout)
+                    continue
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    team_id, attempt = pending.pop(future)
+                    result = self._result(future)
+                    if not result['ok'] and attempt < self.max_attempts:
+                        logger.warning(f"Team {team_id} failed (attempt {attempt}): {result['error']}")
+                        delay = RETRY_BACKOFF_S * 2 ** (attempt - 1)
+                        queue.append((time.monotonic() + delay, team_id, attempt + 1))
+                        continue
+                    self._record_team(run, team_id, attempt, result)
+                    recorded.add(team_id)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _result(future: Future) -> Dict[str, any]:
+        try:
+            return future.result()
+        except Exception as e:
+            # The worker process itself died (e.g. out of memory): BrokenProcessPool
+            return {'ok': False, 'error': f"{type(e).__name__}: {e}", 'duration_ms': None}
+
+    def _record_team(self, run: models.ReadinessRun, team_id, attempts: int, result: Dict[str, any]) -> None:
+        self.db.add(models.ReadinessRunTeam(
+            run_id=run.run_id,
+            team_id=team_id,
+            status='succeeded' if result['ok'] else 'failed',
+            attempts=attempts,
+            player_count=result.get('player_count'),
+            duration_ms=result['duration_ms'],
+            error=result.get('error'),
+            files_error=result.get('files_error'),
+            finished_at=datetime.utcnow(),
+        ))
+        if result['ok']:
+            run.succeeded_count += 1
+        else:
+            run.failed_count += 1
+            logger.error(f"Team {team_id} failed after {attempts} attempts: {result['error']}")
+        if result.get('files_error'):
+            logger.error(f"Team {team_id} scored, but its snapshot/cube was not written: {result['files_error']}")
+        # Committed per team: a crash mid-run still leaves what was done
+        self.db.commit()
@@ -0,0 +1,254 @@
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..db import SessionLocal
+from .retention import season_bounds, season_of
+from .season_store import HISTORY_DAYS, SeasonStore
+
+logger = logging.getLogger(__name__)
+
+# File layout (little-endian):
+#   header   64 bytes: magic, version, metric count, player count,
+#            capacity (days), days written, start day (date ordinal)
+#   players  16-byte UUID per player, in row order
+#   metrics  per metric: name (32 bytes), numpy dtype (4 bytes), data offset
+#   data     from a page boundary: one players x capacity block per metric,
+#            row-major - each player's season is contiguous
+MAGIC = b'SRCUBE\x00\x00'
+VERSION = 2  # 2: all workload metrics as float64 totals, 32-byte metric names
+_HEADER = struct.Struct('<8sHHIIIi')
+_HEADER_SIZE = 64
+_DAYS_WRITTEN = struct.Struct('<I')
+_DAYS_WRITTEN_OFFSET = 20  # after magic, version, metric count, players, capacity
+_METRIC = struct.Struct('<32s4sQ')
+_PAGE = 4096
+
+# Open cubes: path -> (file identity, mapping, (start day, player ids, arrays))
+_open_cubes: "OrderedDict[str, Tuple[Tuple[int, int], mmap.mmap, tuple]]" = OrderedDict()
+_open_lock = threading.Lock()
+_MAX_OPEN = 64
+
+
+def cube_path(team_id, season: int) -> Path:
+    return Path(settings.cube_dir) / str(team_id) / f"season_{season}.cube"
+
+
+def _align(offset: int, to: int) -> int:
+    return -(-offset // to) * to
+
+
+def write_cube(path: Path, store: SeasonStore, capacity: int, days_written: int) -> Path:
+    """
+    Write `store` as a cube holding `capacity` days, the first `days_written` published.
+
+    Written to a temp file and renamed over `path`: open mappings of the old
+    file stay valid, new readers map the new one.
+    """
+    players = len(store.player_ids)
+    metrics = [(name, getattr(store, name)) for name in SeasonStore.METRICS]
+    offset = _align(_HEADER_SIZE + 16 * players + _METRIC.size * len(metrics), _PAGE)
+    index = []
+    for name, array in metrics:
+        index.append((name, array.dtype.str, offset))
+        offset = _align(offset + players * capacity * array.dtype.itemsize, 64)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=path.parent, suffix='.tmp', delete=False) as tmp:
+        tmp.write(_HEADER.pack(MAGIC, VERSION, len(metrics), players, capacity, days_written,
+                               store.start_date.toordinal()).ljust(_HEADER_SIZE, b'\0'))
+        for player_id in store.player_ids:
+            tmp.write(player_id.bytes)
+        for name, dtype, data_offset in index:
+            tmp.write(_METRIC.pack(name.encode(), dtype.encode(), data_offset))
+        tmp.truncate(max(offset, 1))
+        tmp.flush()
+        with mmap.mmap(tmp.fileno(), 0) as mapping:
+            for (name, array), (_, dtype, data_offset) in zip(metrics, index):
+                block = np.ndarray((players, capacity), dtype=dtype, buffer=mapping, offset=data_offset)
+                block[:, store.days:] = _empty(array.dtype)
+                block[:, :store.days] = array
+                del block
+            mapping.flush()
+        os.fsync(tmp.fileno())
+    os.chmod(tmp.name, 0o644)
+    os.replace(tmp.name, path)
+    return path
+
+
+def _empty(dtype: np.dtype):
+    return np.nan if dtype.kind == 'f' else 0
+
+
+def _read_index(mapping) -> Tuple[tuple, list, Dict[str, Tuple[str, int]]]:
+    header = _HEADER.unpack_from(mapping, 0)
+    magic, version, metric_count, players, capacity, days_written, start = header
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a season cube (or an unsupported version)")
+    player_ids = [uuid.UUID(bytes=bytes(mapping[_HEADER_SIZE + 16 * i:_HEADER_SIZE + 16 * (i + 1)]))
+                  for i in range(players)]
+    index = {}
+    position = _HEADER_SIZE + 16 * players
+    for _ in range(metric_count):
+        name, dtype, offset = _METRIC.unpack_from(mapping, position)
+        index[name.rstrip(b'\0').decode()] = (dtype.rstrip(b'\0').decode(), offset)
+        position += _METRIC.size
+    return header, player_ids, index
+
+
+def _days_written(path: Path) -> int:
+    with open(path, 'rb') as f:
+        f.seek(_DAYS_WRITTEN_OFFSET)
+        return _DAYS_WRITTEN.unpack(f.read(_DAYS_WRITTEN.size))[0]
+
+
+def open_cube(path: Path, team_id=None) -> Optional[SeasonStore]:
+    """
+    The cube at `path` as a read-only SeasonStore over one shared mapping.
+
+    Every process mapping the file reads the same page-cache pages, so N
+    workers hold one copy of the history. The mapping is kept open; each
+    call only re-reads the published day count, so appended days show up
+    without remapping, and a rewritten file (new inode) is mapped afresh.
+    Each call returns its own store (a view over the shared arrays), so
+    threads never see each other's day count change under them.
+    """
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    identity = (stat.st_dev, stat.st_ino)
+    key = str(path)
+    with _open_lock:
+        cached = _open_cubes.get(key)
+        if cached is not None and cached[0] == identity:
+            _open_cubes.move_to_end(key)
+            start, player_ids, arrays = cached[2]
+            return SeasonStore.from_arrays(team_id, start, _days_written(path), player_ids, arrays)
+
+    with open(path, 'rb') as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        (_, _, _, players, capacity, days_written, start), player_ids, index = _read_index(mapping)
+    except ValueError as e:
+        # e.g. written by an older version: callers fall back to the database
+        mapping.close()
+        logger.warning(f"Ignoring season cube {path}: {e}")
+        return None
+    arrays = {
+        name: np.ndarray((players, capacity), dtype=dtype, buffer=mapping, offset=offset)
+        for name, (dtype, offset) in index.items()
+    }
+    start = date.fromordinal(start)
+    with _open_lock:
+        _open_cubes[key] = (identity, mapping, (start, player_ids, arrays))
+        while len(_open_cubes) > _MAX_OPEN:
+            # Arrays still in use keep the mapping alive; it closes with them
+            _open_cubes.popitem(last=False)
+    return SeasonStore.from_arrays(team_id, start, days_written, player_ids, arrays)
+
+
+def append_days(path: Path, store: SeasonStore, first_day: date) -> bool:
+    """
+    Write `store`'s days from first_day on into the cube, then publish them.
+
+    Appends in place: data first, then the day count in the header, so a
+    reader sees either the old count or complete new days. first_day may
+    repeat already-published trailing days (a re-run) but not leave a gap.
+    False when the cube can't take it (different squad, gap, past capacity) -
+    rewrite it instead.
+    """
+    with open(path, 'r+b') as f, mmap.mmap(f.fileno(), 0) as mapping:
+        (_, _, _, players, capacity, days_written, start), player_ids, index = _read_index(mapping)
+        cube_start = date.fromordinal(start)
+        first = (first_day - cube_start).days
+        last = (store.end_date - cube_start).days
+        if player_ids != store.player_ids or not 0 <= first <= days_written or last >= capacity:
+            return False
+
+        source = slice((first_day - store.start_date).days, store.days)
+        for name, (dtype, offset) in index.items():
+            block = np.ndarray((players, capacity), dtype=dtype, buffer=mapping, offset=offset)
+            block[:, first:last + 1] = getattr(store, name)[:, source]
+            del block
+        mapping.flush()
+        if last + 1 > days_written:
+            _DAYS_WRITTEN.pack_into(mapping, _DAYS_WRITTEN_OFFSET, last + 1)
+            mapping.flush()
+    return True
+
+
+class SeasonCubeService:
+    """
+    Keep each team's season cube file current.
+
+    A cube is a SeasonStore's arrays laid out in one file that every
+    process memory-maps. The file is sized for the whole season up front,
+    so a new day is a column written in place plus a bumped day count - no
+    rewrite. Changes to past days (late imports, corrected wellness)
+    rewrite the file.
+    """
+
+    def __init__(self, db: Session, season_start_month: Optional[int] = None):
+        self.db = db
+        self.season_start_month = season_start_month or settings.season_start_month
+
+    def _season(self, day: date) -> Tuple[int, date, date]:
+        season = season_of(day, self.season_start_month)
+        start, end = season_bounds(season, self.season_start_month)
+        return season, start, end
+
+    def rebuild(self, team_id, through: Optional[date] = None) -> Optional[Path]:
+        """Rewrite the team's cube for the season of `through` (default today), up to that day."""
+        through = through or date.today()
+        season, start, end = self._season(through)
+        store = SeasonStore.load_days(self.db, team_id, start, through)
+        if not store.player_ids:
+            return None
+        capacity = (end - store.start_date).days
+        path = write_cube(cube_path(team_id, season), store, capacity, store.days)
+        logger.info(f"Wrote season cube {path} ({len(store.player_ids)} players, {store.days} days)")
+        return path
+
+    def append(self, team_id, day: date) -> Optional[Path]:
+        """Publish `day` (and any days missed since the last append); rebuilds when it must."""
+        season, _, _ = self._season(day)
+        path = cube_path(team_id, season)
+        if not path.exists():
+            return self.rebuild(team_id, day)
+
+        cube_start = season_bounds(season, self.season_start_month)[0] - timedelta(days=HISTORY_DAYS)
+        first_day = min(day, cube_start + timedelta(days=_days_written(path)))
+        store = SeasonStore.load_days(self.db, team_id, first_day, day)
+        if not store.player_ids:
+            return None
+        try:
+            appended = append_days(path, store, first_day)
+        except ValueError:  # an older cube format
+            appended = False
+        if not appended:
+            return self.rebuild(team_id, day)
+        return path
+
+
+def refresh_team_cube(team_id) -> None:
+    """Background task: rewrite the team's cube in its own session (after an import)."""
+    db = SessionLocal()
+    try:
+        SeasonCubeService(db).rebuild(team_id)
+    except Exception:
+        logger.exception(f"Season cube of team {team_id} failed")
+    finally:
+        db.close()
@@ -0,0 +1,364 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..config import settings
+from .retention import season_bounds, season_of
+
+logger = logging.getLogger(__name__)
+
+# Days kept before the first day a store answers for: the calculator's
+# chronic window reads date-28 through date
+HISTORY_DAYS = 28
+
+# Cached stores (read paths only): (team_id, season) -> (loaded at, store)
+_stores: "OrderedDict[Tuple[str, int], Tuple[float, SeasonStore]]" = OrderedDict()
+_stores_lock = threading.Lock()
+_MAX_STORES = 32
+
+
+class SeasonStore:
+    """
+    One team's sessions and wellness checks as players x days NumPy arrays.
+
+    Workload metrics (load, distance, high-speed running, sprint distance,
+    accelerations) are day totals, zero when nothing was recorded - as the
+    calculator sums them. HR is the mean of the day's session averages and
+    the highest max. Wellness is the day's check. Other missing values are
+    NaN; `sessions` and `has_check` tell "no data" apart from zero.
+
+    The calculator's answers from a store are identical to its queries as
+    long as the store is current - writes must go through apply_session /
+    apply_wellness (see notify_sessions / notify_wellness). Cached stores are
+    shared by the request threads, so writes hold the store's lock: two
+    imports folding into the same day must not lose one another's update.
+    """
+
+    # float64 day totals, in readiness_calculator.WORKLOAD_METRICS order
+    WORKLOAD_ARRAYS = ('load', 'distance_m', 'high_speed_running_m', 'sprint_distance_m', 'accelerations')
+    FLOAT_METRICS = ('avg_hr', 'max_hr', 'wellness_score',
+                     'resting_hr', 'hrv', 'resting_hr_z', 'hrv_z')
+    # Every array, in a fixed order (the season cube file's layout)
+    METRICS = WORKLOAD_ARRAYS + ('sessions', 'hr_sessions', 'has_check') + FLOAT_METRICS
+
+    def __init__(self, team_id, start_date: date, days: int, player_ids: List):
+        self.team_id = team_id
+        self.start_date = start_date
+        self.days = days
+        self.player_ids = list(player_ids)
+        self.rows = {player_id: i for i, player_id in enumerate(self.player_ids)}
+        self.writable = True
+        self._write_lock = threading.Lock()
+        shape = (len(self.player_ids), days)
+        for name in self.WORKLOAD_ARRAYS:
+            setattr(self, name, np.zeros(shape))  # float64: sums must match the calculator's
+        self.sessions = np.zeros(shape, dtype=np.uint8)
+        self.hr_sessions = np.zeros(shape, dtype=np.uint8)
+        for name in self.FLOAT_METRICS:
+            setattr(self, name, np.full(shape, np.nan, dtype=np.float32))
+        self.has_check = np.zeros(shape, dtype=bool)
+
+    @classmethod
+    def from_arrays(cls, team_id, start_date: date, days: int, player_ids: List,
+                    arrays: Dict[str, np.ndarray]) -> "SeasonStore":
+        """
+        A read-only store over existing arrays (e.g. a memory-mapped cube).
+
+        The arrays may be longer than `days`; only the first `days` columns
+        are answered for.
+        """
+        store = cls.__new__(cls)
+        store.team_id = team_id
+        store.start_date = start_date
+        store.days = days
+        store.player_ids = list(player_ids)
+        store.rows = {player_id: i for i, player_id in enumerate(store.player_ids)}
+        store.writable = False
+        for name in cls.METRICS:
+            setattr(store, name, arrays[name])
+        return store
+
+    @classmethod
+    def load_days(cls, db: Session, team_id, first_day: date, last_day: date) -> "SeasonStore":
+        """A store able to score first_day..last_day: loads HISTORY_DAYS more before it."""
+        start = first_day - timedelta(days=HISTORY_DAYS)
+        player_ids = db.execute(
+            select(models.Player.player_id)
+            .where(models.Player.team_id == team_id, models.Player.is_active == True)
+            .order_by(models.Player.name)
+        ).scalars().all()
+        store = cls(team_id, start, (last_day - start).days + 1, player_ids)
+        if player_ids:
+            store._load(db, last_day)
+        return store
+
+    def _load(self, db: Session, last_day: date) -> None:
+        """Two grouped queries, straight into the arrays."""
+        ts = models.TrainingSession
+        sessions = db.execute(
+            select(ts.player_id, ts.date, func.count(), func.avg(ts.avg_hr), func.count(ts.avg_hr),
+                   func.max(ts.max_hr), func.sum(ts.effective_load), func.sum(ts.distance_m),
+                   func.sum(ts.high_speed_running_m), func.sum(ts.sprint_distance_m), func.sum(ts.accelerations))
+            .where(ts.player_id.in_(self.player_ids), ts.date >= self.start_date, ts.date <= last_day)
+            .group_by(ts.player_id, ts.date)
+        ).all()
+        if sessions:
+            index = self._indexes((row[0], row[1]) for row in sessions)
+            self.sessions[index] = [row[2] for row in sessions]
+            self.avg_hr[index] = self._floats(row[3] for row in sessions)
+            self.hr_sessions[index] = [row[4] for row in sessions]
+            self.max_hr[index] = self._floats(row[5] for row in sessions)
+            for offset, name in enumerate(self.WORKLOAD_ARRAYS, start=6):
+                getattr(self, name)[index] = [row[offset] or 0 for row in sessions]
+
+        wc = models.WellnessCheck
+        checks = db.execute(
+            select(wc.player_id, wc.date, wc.sleep_quality, wc.fatigue, wc.soreness, wc.stress, wc.mood,
+                   wc.resting_hr, wc.hrv, wc.resting_hr_z, wc.hrv_z)
+            .where(wc.player_id.in_(self.player_ids), wc.date >= self.start_date, wc.date <= last_day)
+        ).all()
+        if checks:
+            from .readiness_calculator import ReadinessCalculator
+
+            index = self._indexes((row[0], row[1]) for row in checks)
+            self.has_check[index] = True
+            self.wellness_score[index] = self._floats(ReadinessCalculator.score_wellness(*row[2:7]) for row in checks)
+            for offset, name in enumerate(('resting_hr', 'hrv', 'resting_hr_z', 'hrv_z'), start=7):
+                getattr(self, name)[index] = self._floats(row[offset] for row in checks)
+
+    @staticmethod
+    def _floats(values: Iterable) -> np.ndarray:
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float32)
+
+    def _indexes(self, keys: Iterable[Tuple]) -> Tuple[np.ndarray, np.ndarray]:
+        rows, columns = [], []
+        for player_id, day in keys:
+            rows.append(self.rows[player_id])
+            columns.append((day - self.start_date).days)
+        return np.array(rows, dtype=np.intp), np.array(columns, dtype=np.intp)
+
+    @property
+    def end_date(self) -> date:
+        """Last day held."""
+        return self.start_date + timedelta(days=self.days - 1)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in self.METRICS)
+
+    def covers(self, player_id, day: date) -> bool:
+        """True if this store can answer for the player's day with its full lookback."""
+        offset = (day - self.start_date).days
+        return player_id in self.rows and HISTORY_DAYS <= offset < self.days
+
+    def _position(self, player_id, day: date) -> Tuple[int, int]:
+        return self.rows[player_id], (day - self.start_date).days
+
+    # Writes -------------------------------------------------------------
+
+    def apply_session(self, player_id, day: date, training_load: Optional[float] = None,
+                      distance_m: Optional[float] = None, avg_hr: Optional[int] = None,
+                      max_hr: Optional[int] = None, rpe: Optional[int] = None,
+                      duration_min: Optional[int] = None, high_speed_running_m: Optional[float] = None,
+                      sprint_distance_m: Optional[float] = None, accelerations: Optional[int] = None) -> bool:
+        """Fold one new session into its day. False if the day or player isn't held."""
+        if not self.writable or player_id not in self.rows or not 0 <= (day - self.start_date).days < self.days:
+            return False
+        with self._write_lock:
+            i, j = self._position(player_id, day)
+            self.sessions[i, j] += 1
+            self.load[i, j] += models.session_load(training_load, rpe, duration_min) or 0
+            self.distance_m[i, j] += distance_m or 0
+            self.high_speed_running_m[i, j] += high_speed_running_m or 0
+            self.sprint_distance_m[i, j] += sprint_distance_m or 0
+            self.accelerations[i, j] += accelerations or 0
+            if avg_hr is not None:
+                count = self.hr_sessions[i, j]
+                previous = 0.0 if count == 0 else float(self.avg_hr[i, j])
+                self.avg_hr[i, j] = previous + (avg_hr - previous) / (count + 1)
+                self.hr_sessions[i, j] = count + 1
+            if max_hr is not None:
+                self.max_hr[i, j] = np.nanmax([self.max_hr[i, j], max_hr])
+        return True
+
+    def apply_wellness(self, player_id, day: date, wellness_score: Optional[float],
+                       resting_hr=None, hrv=None, resting_hr_z=None, hrv_z=None) -> bool:
+        """Set the day's check: one per player and day, so a resubmission replaces it."""
+        if not self.writable or player_id not in self.rows or not 0 <= (day - self.start_date).days < self.days:
+            return False
+        with self._write_lock:
+            i, j = self._position(player_id, day)
+            self.has_check[i, j] = True
+            for name, value in (('wellness_score', wellness_score), ('resting_hr', resting_hr), ('hrv', hrv),
+                                ('resting_hr_z', resting_hr_z), ('hrv_z', hrv_z)):
+                getattr(self, name)[i, j] = np.nan if value is None else value
+        return True
+
+    # Calculator components ------------------------------------------------
+
+    def acwr(self, player_id, day: date) -> Tuple[float, Dict]:
+        """ReadinessCalculator._calculate_acwr, from the arrays."""
+        from .readiness_calculator import acwr_from_totals, round_load, workload_profile
+
+        i, j = self._position(player_id, day)
+        window = slice(j - HISTORY_DAYS, j + 1)
+        workload = workload_profile(np.stack([getattr(self, name)[i, window] for name in self.WORKLOAD_ARRAYS]))
+        counts = self.sessions[i, window]
+        if not counts.any():
+            return 1.0, {'acute_load': 0, 'chronic_load': 0, 'workload': workload}
+
+        acute_load = float(self.load[i, j - 7:j + 1].sum())
+        chronic_load = float(self.load[i, j - HISTORY_DAYS:j + 1].sum())
+        acute_daily = acute_load / 7
+        chronic_daily = chronic_load / 28
+        acwr = acwr_from_totals(acute_load, chronic_load)
+
+        return acwr, {
+            'acute_load': round_load(acute_load),
+            'chronic_load': round_load(chronic_load),
+            'acute_daily': round_load(acute_daily),
+            'chronic_daily': round_load(chronic_daily),
+            'days_since_last': HISTORY_DAYS - int(np.flatnonzero(counts)[-1]),
+            'workload': workload,
+        }
+
+    def days_since_last_session(self, player_id, day: date) -> Optional[int]:
+        """Days since the last session before `day`; None if none within the store."""
+        i, j = self._position(player_id, day)
+        earlier = np.flatnonzero(self.sessions[i, :j])
+        return int(j - earlier[-1]) if len(earlier) else None
+
+    def wellness(self, player_id, day: date) -> Tuple[Optional[float], Dict, bool]:
+        """(score, baseline details, found) for the check of `day` or the day before."""
+        i, j = self._position(player_id, day)
+        for column in (j, j - 1):
+            if self.has_check[i, column]:
+                score = self.wellness_score[i, column]
+                return (
+                    None if np.isnan(score) else float(score),
+                    {'resting_hr_z': self._value(self.resting_hr_z[i, column]),
+                     'hrv_z': self._value(self.hrv_z[i, column])},
+                    True,
+                )
+        return None, {'resting_hr_z': None, 'hrv_z': None}, False
+
+    @staticmethod
+    def _value(value) -> Optional[float]:
+        # float32 -> the float64 the database returns, to the stored precision
+        return None if np.isnan(value) else float(np.format_float_positional(value, unique=True))
+
+    # Analytics -------------------------------------------------------------
+
+    def load_matrix(self, player_ids: List, first_day: date, last_day: date,
+                    today: Optional[date] = None) -> Optional[np.ndarray]:
+        """
+        Daily load for these players over first_day..last_day, or None if not all held.
+
+        Days after the last day held count as zero load if they are after
+        `today` (default: the real today), since nothing is logged for them
+        yet. That lets a season cube, which only reaches its last published
+        day, answer for a plan that runs into the future.
+        """
+        today = today or date.today()
+        first = (first_day - self.start_date).days
+        last = (last_day - self.start_date).days
+        held = min(last, self.days - 1)
+        if (first < 0 or (held < last and self.end_date < today)
+                or any(p not in self.rows for p in player_ids)):
+            return None
+        loads = np.zeros((len(player_ids), last - first + 1))
+        if held >= first:
+            loads[:, :held - first + 1] = self.load[[self.rows[p] for p in player_ids], first:held + 1]
+        return loads
+
+
+def season_store(db: Session, team_id, day: Optional[date] = None) -> SeasonStore:
+    """
+    The team's season store for read paths (season of `day`, default today).
+
+    If the team has a season cube (season_cube.py), that is memory-mapped
+    and shared with every other process. Otherwise the store is loaded once
+    per process: writes made in this process are applied in place
+    (notify_*), writes by other workers appear once SEASON_STORE_TTL has
+    passed and the store is reloaded. Anything that persists scores builds
+    its own fresh store.
+    """
+    from .season_cube import cube_path, open_cube
+
+    season = season_of(day or date.today(), settings.season_start_month)
+    cube = open_cube(cube_path(team_id, season), team_id)
+    if cube is not None:
+        return cube
+
+    key = (str(team_id), season)
+    now = time.monotonic()
+    with _stores_lock:
+        cached = _stores.get(key)
+        if cached is not None and now - cached[0] < settings.season_store_ttl:
+            _stores.move_to_end(key)
+            return cached[1]
+
+    start, end = season_bounds(season, settings.season_start_month)
+    store = SeasonStore.load_days(db, team_id, start, end - timedelta(days=1))
+    logger.info(f"Loaded season store for team {team_id} ({len(store.player_ids)} players, "
+                f"{store.days} days, {store.nbytes / 1024:.0f} KiB)")
+    with _stores_lock:
+        _stores[key] = (now, store)
+        _stores.move_to_end(key)
+        while len(_stores) > _MAX_STORES:
+            _stores.popitem(last=False)
+    return store
+
+
+def _cached_stores(team_id=None) -> List[SeasonStore]:
+    with _stores_lock:
+        return [store for (team, _), (_, store) in _stores.items() if team_id is None or team == str(team_id)]
+
+
+def notify_sessions(team_id, sessions: List[Tuple]) -> None:
+    """
+    Apply committed sessions to this process's cached stores of the team.
+
+    `sessions` are (player_id, date, training_load, distance_m, avg_hr, max_hr),
+    optionally followed by the rest of apply_session's arguments.
+    """
+    for store in _cached_stores(team_id):
+        if any(session[0] not in store.rows for session in sessions):
+            # A player the store doesn't know (e.g. created by the import)
+            _drop(store)
+            continue
+        for session in sessions:
+            store.apply_session(*session)
+
+
+def notify_wellness(player_id, day: date, check: Dict[str, any]) -> None:
+    """Apply a committed wellness check to any cached store holding the player."""
+    from .readiness_calculator import ReadinessCalculator
+
+    score = ReadinessCalculator.score_wellness(
+        check.get('sleep_quality'), check.get('fatigue'), check.get('soreness'),
+        check.get('stress'), check.get('mood'),
+    )
+    for store in _cached_stores():
+        store.apply_wellness(player_id, day, score, check.get('resting_hr'), check.get('hrv'),
+                             check.get('resting_hr_z'), check.get('hrv_z'))
+
+
+def clear_season_stores() -> None:
+    """Forget every cached store (tests, or after bulk changes)."""
+    with _stores_lock:
+        _stores.clear()
+
+
+def _drop(store: SeasonStore) -> None:
+    with _stores_lock:
+        for key in [k for k, (_, s) in _stores.items() if s is store]:
+            del _stores[key]
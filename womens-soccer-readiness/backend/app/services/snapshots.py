@@ -0,0 +1,253 @@
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from .. import models
+from ..config import settings
+from ..db import SessionLocal
+from .readiness_calculator import ReadinessCalculator
+from .retention import season_bounds, season_of
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_COLUMNS = ('overall_score', 'readiness_flag', 'acwr', 'training_load', 'wellness_score')
+
+# Open snapshots, newest used last: (path, mtime_ns) -> (pyarrow.Table, date column as epoch days)
+_open_tables: "OrderedDict[Tuple[str, int], object]" = OrderedDict()
+_open_lock = threading.Lock()
+_MAX_OPEN = 32
+
+
+class SnapshotService:
+    """
+    Per-team, per-season Arrow files of daily readiness, load and wellness.
+
+    Files are rebuilt when a readiness refresh runs. Rows are sorted by
+    date, then player, over the full days x players grid, so each day is
+    one block of `players` rows (reshape it and you have the matrix). The file is uncompressed Arrow IPC: the API memory-maps it and
+    a date-range request is a binary search on the date column plus a
+    zero-copy slice - nothing is parsed or copied until it is sent.
+    """
+
+    def __init__(self, db: Session, snapshot_dir: Optional[str] = None,
+                 season_start_month: Optional[int] = None):
+        self.db = db
+        self.snapshot_dir = Path(snapshot_dir or settings.snapshot_dir)
+        self.season_start_month = season_start_month or settings.season_start_month
+
+    def path(self, team_id, season: int) -> Path:
+        return self.snapshot_dir / str(team_id) / f"season_{season}.arrow"
+
+    def current_season(self, today: Optional[date] = None) -> int:
+        return season_of(today or date.today(), self.season_start_month)
+
+    def write_team(self, team_id, season: Optional[int] = None, today: Optional[date] = None) -> Optional[Path]:
+        """(Re)write one team-season snapshot. Readers never see a partial file."""
+        import pyarrow as pa
+
+        season = season if season is not None else self.current_season(today)
+        start, end = season_bounds(season, self.season_start_month)
+        end = min(end, (today or date.today()) + timedelta(days=1))
+        if end <= start:
+            return None
+
+        players = self.db.execute(
+            select(models.Player.player_id, models.Player.name)
+            .where(models.Player.team_id == team_id, models.Player.is_active == True)
+            .order_by(models.Player.name)
+        ).all()
+        if not players:
+            return None
+        player_ids = [p.player_id for p in players]
+        values = self._load_values(player_ids, start, end)
+
+        days = [start + timedelta(days=offset) for offset in range((end - start).days)]
+        columns: Dict[str, List] = {name: [] for name in SNAPSHOT_COLUMNS}
+        for day in days:
+            for player_id in player_ids:
+                row = values.get((player_id, day), {})
+                for name in SNAPSHOT_COLUMNS:
+                    columns[name].append(row.get(name))
+
+        table = pa.table(
+            {
+                'date': pa.array([day for day in days for _ in player_ids], pa.date32()),
+                'player_id': pa.array([str(p) for p in player_ids] * len(days)).dictionary_encode(),
+                'overall_score': pa.array(columns['overall_score'], pa.float32()),
+                'readiness_flag': pa.array(columns['readiness_flag'], pa.string()).dictionary_encode(),
+                'acwr': pa.array(columns['acwr'], pa.float32()),
+                'training_load': pa.array(columns['training_load'], pa.float32()),
+                'wellness_score': pa.array(columns['wellness_score'], pa.float32()),
+            },
+            metadata={
+                'team_id': str(team_id),
+                'season': str(season),
+                'player_ids': ','.join(str(p) for p in player_ids),
+                'player_names': '\x1f'.join(p.name for p in players),
+            },
+        )
+
+        path = self.path(team_id, season)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique temp name: two refreshes of one team may finish together
+        with tempfile.NamedTemporaryFile(dir=path.parent, suffix='.tmp', delete=False) as tmp:
+            with pa.ipc.new_file(tmp, table.schema) as writer:
+                writer.write_table(table)
+        os.chmod(tmp.name, 0o644)  # NamedTemporaryFile creates it owner-only
+        os.replace(tmp.name, path)
+        logger.info(f"Wrote snapshot {path} ({len(days)} days x {len(player_ids)} players)")
+        return path
+
+    def read(self, team_id, season: int, start_date: Optional[date] = None,
+             end_date: Optional[date] = None):
+        """Zero-copy slice of a snapshot for start_date..end_date, or None if none was written."""
+        import numpy as np
+
+        snapshot = _open_snapshot(self.path(team_id, season))
+        if snapshot is None:
+            return None
+        table, days = snapshot
+        # Sorted by date: binary search the memory-mapped date column
+        first = 0 if start_date is None else int(np.searchsorted(days, _epoch_days(start_date), 'left'))
+        last = len(days) if end_date is None else int(np.searchsorted(days, _epoch_days(end_date), 'right'))
+        return table.slice(first, max(last - first, 0))
+
+    @staticmethod
+    def to_ipc_stream(table) -> bytes:
+        """Arrow IPC stream bytes; zstd buffers are several times smaller on the wire."""
+        import pyarrow as pa
+
+        sink = pa.BufferOutputStream()
+        options = pa.ipc.IpcWriteOptions(compression='zstd')
+        with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    @staticmethod
+    def to_matrices(table) -> Dict[str, any]:
+        """JSON-friendly form: dates, players, and one day x player matrix per column."""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        metadata = table.schema.metadata
+        player_ids = metadata[b'player_ids'].decode().split(',')
+        names = metadata[b'player_names'].decode().split('\x1f')
+        width = len(player_ids)
+
+        result = {
+            'team_id': metadata[b'team_id'].decode(),
+            'season': int(metadata[b'season']),
+            'dates': table.column('date').to_pylist()[::width],
+            'players': [{'player_id': p, 'name': n} for p, n in zip(player_ids, names)],
+        }
+        for name in SNAPSHOT_COLUMNS:
+            column = table.column(name)
+            if pa.types.is_floating(column.type):
+                column = pc.round(column.cast(pa.float64()), 2)
+            values = column.to_pylist()
+            result[name] = [values[i:i + width] for i in range(0, len(values), width)]
+        return result
+
+    def write_all(self, season: Optional[int] = None) -> List[Path]:
+        team_ids = self.db.execute(select(models.Team.team_id)).scalars().all()
+        return [path for path in (self.write_team(team_id, season) for team_id in team_ids) if path]
+
+    def _load_values(self, player_ids, start: date, end: date) -> Dict[Tuple, Dict[str, any]]:
+        """(player_id, day) -> column values, from one grouped query per table."""
+        values: Dict[Tuple, Dict[str, any]] = {}
+
+        scores = self.db.execute(
+            select(models.ReadinessScore.player_id, models.ReadinessScore.date,
+                   models.ReadinessScore.overall_score, models.ReadinessScore.readiness_flag,
+                   models.ReadinessScore.acwr)
+            .where(models.ReadinessScore.player_id.in_(player_ids),
+                   models.ReadinessScore.date >= start, models.ReadinessScore.date < end)
+        ).all()
+        for player_id, day, overall, flag, acwr in scores:
+            values.setdefault((player_id, day), {}).update(
+                overall_score=overall, readiness_flag=flag, acwr=acwr
+            )
+
+        loads = self.db.execute(
+            select(models.TrainingSession.player_id, models.TrainingSession.date,
+                   func.sum(models.TrainingSession.effective_load))
+            .where(models.TrainingSession.player_id.in_(player_ids),
+                   models.TrainingSession.date >= start, models.TrainingSession.date < end)
+            .group_by(models.TrainingSession.player_id, models.TrainingSession.date)
+        ).all()
+        for player_id, day, load in loads:
+            values.setdefault((player_id, day), {})['training_load'] = load
+
+        checks = self.db.execute(
+            select(models.WellnessCheck.player_id, models.WellnessCheck.date,
+                   models.WellnessCheck.sleep_quality, models.WellnessCheck.fatigue,
+                   models.WellnessCheck.soreness, models.WellnessCheck.stress,
+                   models.WellnessCheck.mood)
+            .where(models.WellnessCheck.player_id.in_(player_ids),
+                   models.WellnessCheck.date >= start, models.WellnessCheck.date < end)
+        ).all()
+        for player_id, day, *answers in checks:
+            values.setdefault((player_id, day), {})['wellness_score'] = ReadinessCalculator.score_wellness(*answers)
+
+        return values
+
+
+def refresh_team_snapshot(team_id) -> None:
+    """Background task: rewrite the team's current-season snapshot in its own session."""
+    db = SessionLocal()
+    try:
+        SnapshotService(db).write_team(team_id)
+    except Exception:
+        # The refresh itself succeeded; a stale snapshot is caught up next time
+        logger.exception(f"Snapshot of team {team_id} failed")
+    finally:
+        db.close()
+
+
+def _epoch_days(day: date) -> int:
+    """A date as Arrow's date32 stores it."""
+    return (day - date(1970, 1, 1)).days
+
+
+def _open_snapshot(path: Path):
+    """
+    The snapshot at `path` as a memory-mapped Arrow table and its date
+    column, kept open between requests.
+
+    The dates are an int32 view of the mapped buffer (date32 is days since
+    the epoch), so searching them copies nothing - NumPy can't take date32
+    zero-copy as datetime64. Keyed on mtime: a rewrite replaces the file
+    (new inode), so the next request maps the new one while slices of the
+    old one stay valid.
+    """
+    import pyarrow as pa
+
+    try:
+        key = (str(path), path.stat().st_mtime_ns)
+    except FileNotFoundError:
+        return None
+    with _open_lock:
+        snapshot = _open_tables.get(key)
+        if snapshot is not None:
+            _open_tables.move_to_end(key)
+            return snapshot
+    table = pa.ipc.open_file(pa.memory_map(str(path), 'r')).read_all()
+    column = table.column('date')
+    # write_team writes one batch; anything else is combined once, here
+    dates = column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
+    snapshot = (table, dates.view(pa.int32()).to_numpy())
+    with _open_lock:
+        for stale in [k for k in _open_tables if k[0] == key[0]]:
+            del _open_tables[stale]
+        _open_tables[key] = snapshot
+        while len(_open_tables) > _MAX_OPEN:
+            _open_tables.popitem(last=False)
+    return snapshot
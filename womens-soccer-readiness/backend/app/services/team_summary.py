@@ -0,0 +1,124 @@
+from datetime import date
+from typing import Dict
+from sqlalchemy import case, distinct, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from .. import models
+import logging
+
+logger = logging.getLogger(__name__)
+
+_DIALECT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+class TeamSummaryService:
+    """
+    Maintain the team_daily_summaries table.
+
+    Only the (team, day) that was recalculated is rewritten, via an upsert,
+    so re-running a day is always safe.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def refresh(self, team_id: str, day: date, team_readiness: Dict[str, any]) -> Dict[str, any]:
+        """
+        Upsert the summary row for one team-day.
+
+        `team_readiness` is the result of ReadinessCalculator.calculate_team_readiness
+        for the same day; flag counts and the average come from it. Load and
+        wellness completion are aggregated here with one query each.
+        """
+        player_count = team_readiness['player_count']
+        session_count, total_load, mean_load = self._load_totals(team_id, day)
+        wellness_count = self._wellness_count(team_id, day)
+
+        values = {
+            'team_id': team_id,
+            'date': day,
+            'player_count': player_count,
+            'average_readiness': team_readiness['average_readiness'],
+            'green_count': team_readiness['green_count'],
+            'yellow_count': team_readiness['yellow_count'],
+            'red_count': team_readiness['red_count'],
+            'session_count': session_count,
+            'total_load': total_load,
+            'mean_load': mean_load,
+            'wellness_count': wellness_count,
+            'wellness_completion_rate': wellness_count / player_count if player_count else None,
+            'updated_at': func.now(),
+        }
+        self._upsert(values)
+        logger.debug(f"Refreshed team summary for {team_id} on {day}")
+        return values
+
+    def refresh_from_scores(self, team_id: str, day: date) -> Dict[str, any]:
+        """
+        Upsert the summary row from the day's stored readiness_scores.
+
+        For when only some players were rescored: the team average and
+        flag counts are re-aggregated in one query instead of recalculating
+        every player.
+        """
+        flag = models.ReadinessScore.readiness_flag
+        row = self.db.execute(
+            select(
+                func.count(models.Player.player_id),
+                func.avg(models.ReadinessScore.overall_score),
+                *(func.count(case((flag == color, 1))) for color in ('green', 'yellow', 'red')),
+            )
+            .select_from(models.Player)
+            .outerjoin(models.ReadinessScore, (models.ReadinessScore.player_id == models.Player.player_id)
+                       & (models.ReadinessScore.date == day))
+            .where(models.Player.team_id == team_id, models.Player.is_active == True)
+        ).one()
+        return self.refresh(team_id, day, {
+            'player_count': row[0],
+            'average_readiness': row[1],
+            'green_count': row[2],
+            'yellow_count': row[3],
+            'red_count': row[4],
+        })
+
+    def _load_totals(self, team_id: str, day: date):
+        row = self.db.execute(
+            select(
+                func.count(models.TrainingSession.session_id),
+                func.sum(models.TrainingSession.effective_load),
+                func.avg(models.TrainingSession.effective_load),
+            )
+            .join(models.Player, models.Player.player_id == models.TrainingSession.player_id)
+            .where(
+                models.Player.team_id == team_id,
+                models.Player.is_active == True,
+                models.TrainingSession.date == day,
+            )
+        ).one()
+        return row[0], row[1], row[2]
+
+    def _wellness_count(self, team_id: str, day: date) -> int:
+        return self.db.execute(
+            select(func.count(distinct(models.WellnessCheck.player_id)))
+            .join(models.Player, models.Player.player_id == models.WellnessCheck.player_id)
+            .where(
+                models.Player.team_id == team_id,
+                models.Player.is_active == True,
+                models.WellnessCheck.date == day,
+            )
+        ).scalar_one()
+
+    def _upsert(self, values: Dict[str, any]) -> None:
+        dialect = self.db.get_bind().dialect.name
+        insert = _DIALECT_INSERTS.get(dialect)
+        if insert is None:
+            raise NotImplementedError(f"No upsert for dialect {dialect}")
+
+        stmt = insert(models.TeamDailySummary).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['team_id', 'date'],
+            set_={key: stmt.excluded[key] for key in values if key not in ('team_id', 'date')},
+        )
+        self.db.execute(stmt)
@@ -0,0 +1,267 @@
+from datetime import date, timedelta
+from typing import Dict, List
+from sqlalchemy import Date, and_, case, func, literal, null, select, true, union_all
+from sqlalchemy.orm import Session
+from .. import models
+from ..sql import date_add_days
+from .readiness_calculator import ACUTE_DAYS, MONOTONY_DAYS, WINDOW_DAYS, ReadinessCalculator
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Window frames, from the calculator's window lengths (date included)
+ACUTE_ROWS = (-(ACUTE_DAYS - 1), 0)
+CHRONIC_ROWS = (-(WINDOW_DAYS - 1), 0)
+WEEK_ROWS = (-(MONOTONY_DAYS - 1), 0)
+PERCENTILES = (25, 50, 75, 90)
+# Workload metrics besides load with their own ACWR series: name -> column
+EXTRA_METRICS = {
+    'distance': models.TrainingSession.distance_m,
+    'high_speed_running': models.TrainingSession.high_speed_running_m,
+    'sprint_distance': models.TrainingSession.sprint_distance_m,
+    'accelerations': models.TrainingSession.accelerations,
+}
+
+# Column order of every series in the response
+SERIES_FIELDS = (
+    'players', 'total_load', 'acute_load', 'chronic_load', 'acwr_mean',
+    *(f'acwr_p{p}' for p in PERCENTILES),
+    'acwr_low', 'acwr_optimal', 'acwr_high', 'acwr_danger',
+)
+# Counts and sums: zero, not null, on days without an active player
+COUNT_FIELDS = (
+    'players', 'total_load', 'acute_load', 'chronic_load',
+    'acwr_low', 'acwr_optimal', 'acwr_high', 'acwr_danger',
+)
+# Only with workload=True: they double the query's cost
+WORKLOAD_FIELDS = (
+    *(f'{metric}_acwr_mean' for metric in EXTRA_METRICS),
+    'monotony_mean', 'strain_mean',
+)
+
+
+class TeamTrendsService:
+    """
+    Rolling team load trends computed inside the database.
+
+    The query, in steps (all CTEs of one statement):
+    1. days    - the calendar, including 28 warm-up days before start_date
+    2. daily   - each player's summed load per training day
+    3. grid    - every player x every day; rest days count as zero load
+    4. rolling - acute and chronic window sums per player, framed exactly
+                 like ReadinessCalculator._calculate_acwr's date ranges
+    5. ranked  - ACWR (the engine's rule, acwr_from_totals) plus its rank
+                 within the team and the position that day; with workload,
+                 the other metrics' ACWR and Foster monotony and strain
+    6. per-day aggregates for the team and each position, UNION ALL'd
+
+    Percentiles use the nearest-rank method from the ranks, so the same SQL
+    runs on PostgreSQL and SQLite (which has no percentile_cont). Monotony
+    (weekly mean / SD of daily load) takes its variance from window sums of
+    load and load squared, for the same reason: no stddev window on SQLite.
+
+    The workload series repeat readiness's `workload` block per player-day
+    and need five more window sums each. That roughly doubles the cost of
+    the statement, so they are only computed on request.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def team_trends(self, team_id: str, start_date: date, end_date: date,
+                    workload: bool = False) -> Dict[str, any]:
+        """
+        Compact, column-oriented time series for start_date..end_date inclusive.
+
+        workload=True adds WORKLOAD_FIELDS to every series.
+        """
+        if end_date < start_date:
+            raise ValueError("end_date must not be before start_date")
+
+        rows = self.db.execute(self._query(team_id, start_date, end_date, workload)).mappings().all()
+
+        fields = SERIES_FIELDS + WORKLOAD_FIELDS if workload else SERIES_FIELDS
+        dates = [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+        team = self._empty_series(fields)
+        positions: Dict[str, Dict[str, List]] = {}
+        for row in rows:
+            series = (team if row['position'] is None
+                      else positions.setdefault(row['position'], self._empty_series(fields)))
+            for field in fields:
+                value = row[field]
+                series[field].append(round(value, 3) if isinstance(value, float) else value)
+        if not team['players']:
+            # No active players: the grid is empty, but every day still has a team value
+            team = {field: [0 if field in COUNT_FIELDS else None] * len(dates) for field in fields}
+
+        logger.debug(f"Computed {len(dates)} days of trends for team {team_id}")
+        return {
+            'team_id': team_id,
+            'start_date': start_date,
+            'end_date': end_date,
+            'dates': dates,
+            'team': team,
+            'positions': positions,
+        }
+
+    @staticmethod
+    def _empty_series(fields) -> Dict[str, List]:
+        return {field: [] for field in fields}
+
+    def _query(self, team_id: str, start_date: date, end_date: date, workload: bool = False):
+        first_day = start_date - timedelta(days=WINDOW_DAYS - 1)
+        extra_metrics = EXTRA_METRICS if workload else {}
+
+        days = select(literal(first_day, Date).label('day')).cte('days', recursive=True)
+        days = days.union_all(
+            select(date_add_days(days.c.day, 1)).where(days.c.day < end_date)
+        )
+
+        squad = (
+            select(
+                models.Player.player_id,
+                func.coalesce(models.Player.position, 'Unknown').label('position'),
+            )
+            .where(models.Player.team_id == team_id, models.Player.is_active == True)
+            .cte('squad')
+        )
+
+        daily = (
+            select(
+                models.TrainingSession.player_id,
+                models.TrainingSession.date,
+                func.sum(models.TrainingSession.effective_load).label('load'),
+                *(func.sum(column).label(metric) for metric, column in extra_metrics.items()),
+            )
+            .where(
+                models.TrainingSession.player_id.in_(select(squad.c.player_id)),
+                models.TrainingSession.date >= first_day,
+                models.TrainingSession.date <= end_date,
+            )
+            .group_by(models.TrainingSession.player_id, models.TrainingSession.date)
+            .cte('daily')
+        )
+
+        grid = (
+            select(
+                squad.c.player_id,
+                squad.c.position,
+                days.c.day,
+                *(func.coalesce(daily.c[metric], 0.0).label(metric) for metric in ('load', *extra_metrics)),
+            )
+            .select_from(
+                squad.join(days, true()).outerjoin(
+                    daily, and_(daily.c.player_id == squad.c.player_id, daily.c.date == days.c.day)
+                )
+            )
+            .cte('grid')
+        )
+
+        by_player = {'partition_by': grid.c.player_id, 'order_by': grid.c.day}
+        workload_sums = []
+        if workload:
+            workload_sums = [
+                # Monotony's week: the last 7 days, date included
+                func.sum(grid.c.load).over(rows=WEEK_ROWS, **by_player).label('week'),
+                func.sum(grid.c.load * grid.c.load).over(rows=WEEK_ROWS, **by_player).label('week_squares'),
+                *(column for metric in extra_metrics for column in (
+                    func.sum(grid.c[metric]).over(rows=ACUTE_ROWS, **by_player).label(f'{metric}_acute'),
+                    func.sum(grid.c[metric]).over(rows=CHRONIC_ROWS, **by_player).label(f'{metric}_chronic'),
+                )),
+            ]
+        rolling = (
+            select(
+                grid.c.player_id,
+                grid.c.position,
+                grid.c.day,
+                grid.c.load,
+                func.sum(grid.c.load).over(rows=ACUTE_ROWS, **by_player).label('acute'),
+                func.sum(grid.c.load).over(rows=CHRONIC_ROWS, **by_player).label('chronic'),
+                *workload_sums,
+            )
+            .cte('rolling')
+        )
+
+        def ratio(acute, chronic):
+            return (acute / 7.0) / (chronic / 28.0)
+
+        # acwr_from_totals: neutral without chronic load, as the engine scores it
+        acwr = case((rolling.c.chronic > 0, ratio(rolling.c.acute, rolling.c.chronic)),
+                    (rolling.c.acute > 0, 1.5), else_=1.0)
+        workload_columns = []
+        if workload:
+            # Foster: mean / SD of the week's daily loads (population SD); none
+            # for a week without variation, e.g. no sessions
+            mean = rolling.c.week / float(MONOTONY_DAYS)
+            variance = rolling.c.week_squares / float(MONOTONY_DAYS) - mean * mean
+            monotony = case((variance > 1e-9 * mean * mean, mean / func.sqrt(variance)), else_=null())
+            workload_columns = [
+                # Other metrics: no ratio without chronic data (often not recorded at all)
+                *(case((rolling.c[f'{metric}_chronic'] > 0,
+                        ratio(rolling.c[f'{metric}_acute'], rolling.c[f'{metric}_chronic'])),
+                       else_=null()).label(f'{metric}_acwr')
+                  for metric in extra_metrics),
+                monotony.label('monotony'),
+                (rolling.c.week * monotony).label('strain'),
+            ]
+        ranked = (
+            select(
+                rolling.c.position,
+                rolling.c.day,
+                rolling.c.load,
+                rolling.c.acute,
+                rolling.c.chronic,
+                acwr.label('acwr'),
+                *workload_columns,
+                func.row_number().over(partition_by=rolling.c.day, order_by=acwr).label('team_rank'),
+                func.count().over(partition_by=rolling.c.day).label('team_n'),
+                func.row_number().over(
+                    partition_by=(rolling.c.day, rolling.c.position), order_by=acwr
+                ).label('position_rank'),
+                func.count().over(partition_by=(rolling.c.day, rolling.c.position)).label('position_n'),
+            )
+            .where(rolling.c.day >= start_date)
+            .cte('ranked')
+        )
+
+        team = self._aggregate(
+            ranked, null(), ranked.c.team_rank, ranked.c.team_n, extra_metrics
+        ).group_by(ranked.c.day)
+        by_position = self._aggregate(
+            ranked, ranked.c.position, ranked.c.position_rank, ranked.c.position_n, extra_metrics
+        ).group_by(ranked.c.day, ranked.c.position)
+
+        trends = union_all(team, by_position).subquery('trends')
+        return select(trends).order_by(trends.c.day, trends.c.position)
+
+    @staticmethod
+    def _aggregate(ranked, position, rank, n, extra_metrics):
+        """Per-day aggregate columns over one grouping of the ranked rows."""
+        low = ReadinessCalculator.ACWR_DANGER_ZONE_LOW
+        sweet_high = ReadinessCalculator.ACWR_SWEET_SPOT[1]
+        high = ReadinessCalculator.ACWR_DANGER_ZONE_HIGH
+
+        def band(condition):
+            return func.sum(case((condition, 1), else_=0))
+
+        def percentile(p):
+            # Nearest rank: the smallest value whose rank reaches ceil(p% of n)
+            return func.min(case((rank >= (n * p + 99) // 100, ranked.c.acwr)))
+
+        return select(
+            ranked.c.day,
+            position.label('position'),
+            func.count().label('players'),
+            func.sum(ranked.c.load).label('total_load'),
+            func.avg(ranked.c.acute).label('acute_load'),
+            func.avg(ranked.c.chronic).label('chronic_load'),
+            func.avg(ranked.c.acwr).label('acwr_mean'),
+            *(percentile(p).label(f'acwr_p{p}') for p in PERCENTILES),
+            band(ranked.c.acwr < low).label('acwr_low'),
+            band(and_(ranked.c.acwr >= low, ranked.c.acwr <= sweet_high)).label('acwr_optimal'),
+            band(and_(ranked.c.acwr > sweet_high, ranked.c.acwr <= high)).label('acwr_high'),
+            band(ranked.c.acwr > high).label('acwr_danger'),
+            *([*(func.avg(ranked.c[f'{metric}_acwr']).label(f'{metric}_acwr_mean') for metric in extra_metrics),
+               func.avg(ranked.c.monotony).label('monotony_mean'),
+               func.avg(ranked.c.strain).label('strain_mean')] if extra_metrics else []),
+        )
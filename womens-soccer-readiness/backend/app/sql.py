@@ -0,0 +1,84 @@
+"""
+Small SQL constructs that render differently per dialect.
+
+The app runs on PostgreSQL and on embedded SQLite (USE_SQLITE=true), and
+some date arithmetic has no common spelling. Each construct here compiles
+to the native form for both.
+"""
+from sqlalchemy import Date, DateTime
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+
+
+class date_add_days(FunctionElement):
+    """`date_add_days(expr, n)` - the date n days after expr."""
+
+    type = Date()
+    inherit_cache = True
+    name = "date_add_days"
+
+
+@compiles(date_add_days)
+def _date_add_days_default(element, compiler, **kw):
+    # PostgreSQL (and most others): date + integer is a date
+    day, days = list(element.clauses)
+    return f"({compiler.process(day, **kw)} + {compiler.process(days, **kw)})"
+
+
+@compiles(date_add_days, "sqlite")
+def _date_add_days_sqlite(element, compiler, **kw):
+    # SQLite stores dates as ISO text; date() does the arithmetic
+    day, days = list(element.clauses)
+    return f"date({compiler.process(day, **kw)}, '+' || {compiler.process(days, **kw)} || ' days')"
+
+
+class hours_ago(FunctionElement):
+    """
+    `hours_ago(n)` - the database's current timestamp minus n hours.
+
+    On the database clock, like server_default=func.now(): compared with
+    such a column it holds whatever time zone the server runs in.
+    """
+
+    type = DateTime()
+    inherit_cache = True
+    name = "hours_ago"
+
+
+@compiles(hours_ago)
+def _hours_ago_default(element, compiler, **kw):
+    return f"(CURRENT_TIMESTAMP - {compiler.process(element.clauses, **kw)} * INTERVAL '1 hour')"
+
+
+@compiles(hours_ago, "sqlite")
+def _hours_ago_sqlite(element, compiler, **kw):
+    # CURRENT_TIMESTAMP's 'YYYY-MM-DD HH:MM:SS' text, so they compare as strings
+    return f"datetime('now', '-' || {compiler.process(element.clauses, **kw)} || ' hours')"
+
+
+class least(FunctionElement):
+    """`least(a, b)` - the smaller of two values."""
+
+    inherit_cache = True
+    name = "least"
+
+
+class greatest(FunctionElement):
+    """`greatest(a, b)` - the larger of two values."""
+
+    inherit_cache = True
+    name = "greatest"
+
+
+@compiles(least)
+@compiles(greatest)
+def _extreme_default(element, compiler, **kw):
+    return f"{element.name.upper()}({compiler.process(element.clauses, **kw)})"
+
+
+@compiles(least, "sqlite")
+@compiles(greatest, "sqlite")
+def _extreme_sqlite(element, compiler, **kw):
+    # SQLite's multi-argument min()/max() are scalar, not aggregates
+    function = "min" if element.name == "least" else "max"
+    return f"{function}({compiler.process(element.clauses, **kw)})"
@@ -0,0 +1,46 @@
+"""
+Startup-time report.
+
+Logs how long the app took to import and start, and warns when an
+analytics library was imported eagerly - those belong inside the handlers
+that use them.
+"""
+import logging
+import sys
+import time
+from typing import Dict
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+# Libraries that each add hundreds of milliseconds to import time
+HEAVY_MODULES = ("pandas", "numpy", "scipy", "pyarrow")
+
+APP_STARTUP_SECONDS = metrics.registry.register(metrics.Gauge(
+    "app_startup_seconds", "Time spent importing and starting the app",
+    ("phase",),
+))
+
+
+def report(import_started: float, startup_started: float) -> Dict[str, object]:
+    """Log and export the startup timings. Both arguments are perf_counter() values."""
+    now = time.perf_counter()
+    timings = {
+        'import_seconds': round(startup_started - import_started, 4),
+        'startup_seconds': round(now - startup_started, 4),
+        'total_seconds': round(now - import_started, 4),
+    }
+    eager = [name for name in HEAVY_MODULES if name in sys.modules]
+
+    APP_STARTUP_SECONDS.set(timings['import_seconds'], "import")
+    APP_STARTUP_SECONDS.set(timings['startup_seconds'], "startup")
+
+    logger.info(
+        f"App ready in {timings['total_seconds']:.3f}s "
+        f"(import {timings['import_seconds']:.3f}s, startup {timings['startup_seconds']:.3f}s)"
+    )
+    if eager:
+        logger.warning(f"Heavy modules imported at startup: {', '.join(eager)}")
+
+    return {**timings, 'eager_heavy_modules': eager}
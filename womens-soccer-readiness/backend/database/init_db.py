@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
 """
-Initialize the PostgreSQL database with the schema.
+Initialize the database with the schema.
 Run this script to create all tables and initial data.
+
+With USE_SQLITE=true the database is a local file (created on first
+connect), so only the migrations run.
 """
 
 import os
@@ -55,51 +58,47 @@ def create_database():
         print(f"Error creating database: {e}")
         return False
 
-def run_schema():
-    """Run the schema.sql file to create tables"""
-    schema_path = os.path.join(os.path.dirname(__file__), "schema.sql")
+def run_migrations():
+    """
+    Bring the schema up to date with Alembic.
     
-    if not os.path.exists(schema_path):
-        print(f"Schema file not found: {schema_path}")
-        return False
+    Migrations are the single way tables get created or changed -
+    the API no longer calls create_all() on startup. schema.sql stays
+    as the annotated PostgreSQL reference.
+    """
+    from alembic import command
+    from alembic.config import Config
+    
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     
     try:
-        conn = psycopg2.connect(settings.database_url)
-        cursor = conn.cursor()
-        
-        # Read and execute schema
-        with open(schema_path, 'r') as f:
-            schema_sql = f.read()
+        alembic_cfg = Config(os.path.join(backend_dir, "alembic.ini"))
+        alembic_cfg.set_main_option("script_location", os.path.join(backend_dir, "migrations"))
+        command.upgrade(alembic_cfg, "head")
         
-        cursor.execute(schema_sql)
-        conn.commit()
-        
-        print("Schema created successfully")
-        
-        cursor.close()
-        conn.close()
+        print("Migrations applied successfully")
         return True
         
     except Exception as e:
-        print(f"Error running schema: {e}")
+        print(f"Error running migrations: {e}")
         return False
 
 def main():
     """Main initialization function"""
     print("Initializing Women's Soccer Readiness Database...")
     
-    # Create database
-    if not create_database():
+    # Create database (PostgreSQL only - SQLite creates the file itself)
+    if not settings.use_sqlite and not create_database():
         print("Failed to create database")
         sys.exit(1)
     
-    # Run schema
-    if not run_schema():
+    # Run migrations
+    if not run_migrations():
         print("Failed to create schema")
         sys.exit(1)
     
     print("\nDatabase initialized successfully!")
-    print(f"Connection string: {settings.database_url}")
+    print(f"Connection string: {settings.sqlite_url if settings.use_sqlite else settings.database_url}")
     print("\nNext steps:")
     print("1. Run the synthetic data generator to populate test data")
     print("2. Start the FastAPI server with: uvicorn app.main:app --reload")
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Nightly partition maintenance for training_sessions and wellness_checks.
+
+Creates monthly partitions ahead of time and, if a retention window is
+configured, detaches old ones into the `archive` schema.
+Run from cron: python database/maintain_partitions.py
+"""
+
+import os
+import sys
+from datetime import date
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+from app.db import engine
+from app.services.partitions import add_months, detach_old_partitions, ensure_partitions, month_start
+
+def main():
+    """Main maintenance function"""
+    if engine.dialect.name != "postgresql":
+        print("Partitioning is PostgreSQL-only - nothing to do")
+        return
+
+    created = ensure_partitions(engine, months_ahead=settings.partition_months_ahead)
+    print(f"Created {len(created)} partition(s): {', '.join(created) or '-'}")
+
+    if settings.partition_detach_after_months > 0:
+        cutoff = add_months(month_start(date.today()), -settings.partition_detach_after_months)
+        detached = detach_old_partitions(engine, older_than=cutoff)
+        print(f"Detached {len(detached)} partition(s) ending on or before {cutoff}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Rescore only the players whose sessions or wellness checks changed.
+
+Imports and wellness submissions queue the days they affect in
+dirty_readiness_ranges; this rescores those stored days, refreshes the
+team summaries and empties the queue. Run it nightly before
+run_readiness.py: python database/recompute_readiness.py [--until YYYY-MM-DD]
+"""
+
+import argparse
+import os
+import sys
+from datetime import date
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db import SessionLocal
+from app.services.dirty_queue import DirtyQueue
+
+def main():
+    """Main recompute function"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--until", type=date.fromisoformat, help="Last day to rescore (default: today)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        queue = DirtyQueue(db)
+        print(f"{queue.pending()} players queued")
+        totals = queue.recompute(args.until)
+        print(f"Rescored {totals['player_days']} player-days for {totals['players']} players, "
+              f"refreshed {totals['team_days']} team summaries")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
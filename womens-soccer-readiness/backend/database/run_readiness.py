@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Compute and store a day's readiness for every team with active players.
+
+Meant for a nightly cron job: python database/run_readiness.py
+[--date YYYY-MM-DD] [--workers N] [--attempts N]. Exits non-zero when any
+team still failed after its retries.
+"""
+
+import argparse
+import logging
+import os
+import sys
+from datetime import date
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db import SessionLocal
+from app.services.scheduler import ReadinessScheduler
+
+def main():
+    """Main scheduling function"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--date", type=date.fromisoformat, default=date.today(), help="Day to score (default: today)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: SCHEDULER_WORKERS)")
+    parser.add_argument("--attempts", type=int, help="Attempts per team (default: SCHEDULER_MAX_ATTEMPTS)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    db = SessionLocal()
+    try:
+        run = ReadinessScheduler(db, workers=args.workers, max_attempts=args.attempts).run(args.date)
+        print(f"Run {run.run_id}: {run.status}, {run.succeeded_count}/{run.team_count} teams in {run.duration_s}s")
+        for team in run.teams:
+            if team.status == "failed":
+                print(f"  {team.team_id} failed after {team.attempts} attempts: {team.error}")
+        sys.exit(0 if run.failed_count == 0 else 1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Nightly retention job: archive seasons older than the retention window.
+
+Each team-season of training_sessions, wellness_checks and readiness_scores
+is written to ARCHIVE_DIR/<team_id>/<table>_<season>.parquet, recorded in
+archive_index, then deleted in batches of RETENTION_BATCH_SIZE rows.
+flag_events older than FLAG_EVENT_RETENTION_HOURS are deleted as well.
+Run from cron: python database/run_retention.py [--seasons N] [--dry-run]
+"""
+
+import argparse
+import os
+import sys
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+from app.db import SessionLocal
+from app.services.events import prune_flag_events
+from app.services.retention import RetentionService
+
+def main():
+    """Main retention function"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seasons", type=int, default=settings.retention_seasons,
+                        help="Seasons to keep in the database (default: RETENTION_SEASONS)")
+    parser.add_argument("--dry-run", action="store_true", help="Only list what would be archived")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if not args.dry_run:
+            pruned = prune_flag_events(db, settings.flag_event_retention_hours)
+            print(f"Pruned {pruned} flag events older than {settings.flag_event_retention_hours}h")
+
+        if args.seasons < 1:
+            print("Retention is off (RETENTION_SEASONS=0) - nothing to archive")
+            return
+
+        service = RetentionService(db)
+        print(f"Keeping seasons from {service.cutoff(args.seasons)} on")
+
+        if args.dry_run:
+            for team_id, table, season in service.pending(args.seasons):
+                print(f"Would archive {table} season {season} of team {team_id}")
+            return
+
+        for result in service.run(args.seasons):
+            print(f"Archived {result['archived']} {result['table']} rows "
+                  f"(season {result['season']}) -> {result['file_path']}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
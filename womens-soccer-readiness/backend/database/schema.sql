@@ -45,8 +45,11 @@ CREATE TABLE players (
 );
 
 -- Training sessions table
+-- Range-partitioned by month on date: readiness queries always hit a
+-- 28-day window, so the planner prunes to one or two partitions.
+-- The partition key must be part of the primary key.
 CREATE TABLE training_sessions (
-    session_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    session_id UUID NOT NULL DEFAULT uuid_generate_v4(),
     player_id UUID REFERENCES players(player_id) ON DELETE CASCADE,
     date DATE NOT NULL,
     session_type VARCHAR(50), -- 'training', 'match', 'recovery'
@@ -58,17 +61,25 @@ CREATE TABLE training_sessions (
     decelerations INTEGER,
     avg_hr INTEGER,
     max_hr INTEGER,
-    hr_zones JSONB, -- Time spent in each HR zone
+    hr_zones JSONB, -- % of the session in each HR zone
+    hr_zone1_min FLOAT, -- Minutes in each HR zone (summed by intensity reports)
+    hr_zone2_min FLOAT,
+    hr_zone3_min FLOAT,
+    hr_zone4_min FLOAT,
+    hr_zone5_min FLOAT,
     training_load FLOAT, -- Calculated training load score
     rpe INTEGER CHECK (rpe BETWEEN 1 AND 10), -- Rate of Perceived Exertion
     notes TEXT,
+    import_hash VARCHAR(32), -- Polar import de-duplication
+    raw_data JSONB, -- Original Polar CSV row
     created_at TIMESTAMP DEFAULT NOW(),
-    updated_at TIMESTAMP DEFAULT NOW()
-);
+    updated_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (session_id, date)
+) PARTITION BY RANGE (date);
 
--- Wellness checks table
+-- Wellness checks table (partitioned like training_sessions)
 CREATE TABLE wellness_checks (
-    check_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    check_id UUID NOT NULL DEFAULT uuid_generate_v4(),
     player_id UUID REFERENCES players(player_id) ON DELETE CASCADE,
     date DATE NOT NULL,
     sleep_hours FLOAT CHECK (sleep_hours BETWEEN 0 AND 24),
@@ -84,8 +95,19 @@ CREATE TABLE wellness_checks (
     injury_status VARCHAR(50), -- 'healthy', 'minor', 'moderate', 'severe'
     injury_notes TEXT,
     notes TEXT,
-    created_at TIMESTAMP DEFAULT NOW()
-);
+    resting_hr INTEGER CHECK (resting_hr BETWEEN 25 AND 120),
+    hrv FLOAT CHECK (hrv > 0), -- RMSSD, ms
+    resting_hr_z FLOAT, -- deviation from the running baseline when recorded
+    hrv_z FLOAT,
+    created_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (check_id, date)
+) PARTITION BY RANGE (date);
+
+-- Catch-all partitions so an insert outside the monthly range never fails.
+-- Monthly partitions (e.g. training_sessions_p2026_10) are created ahead of
+-- time and old ones detached by database/maintain_partitions.py.
+CREATE TABLE training_sessions_default PARTITION OF training_sessions DEFAULT;
+CREATE TABLE wellness_checks_default PARTITION OF wellness_checks DEFAULT;
 
 -- Readiness scores table
 CREATE TABLE readiness_scores (
@@ -104,6 +126,107 @@ CREATE TABLE readiness_scores (
     created_at TIMESTAMP DEFAULT NOW()
 );
 
+-- Team-by-day summary, refreshed by the readiness engine.
+-- Season trend charts read one row per day from here.
+CREATE TABLE team_daily_summaries (
+    team_id UUID REFERENCES teams(team_id) ON DELETE CASCADE,
+    date DATE,
+    player_count INTEGER NOT NULL,
+    average_readiness FLOAT,
+    green_count INTEGER NOT NULL,
+    yellow_count INTEGER NOT NULL,
+    red_count INTEGER NOT NULL,
+    session_count INTEGER NOT NULL,
+    total_load FLOAT,
+    mean_load FLOAT,
+    wellness_count INTEGER NOT NULL, -- players who submitted a wellness check
+    wellness_completion_rate FLOAT CHECK (wellness_completion_rate BETWEEN 0 AND 1),
+    updated_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (team_id, date)
+);
+
+-- Team-seasons moved to Parquet files by the retention job
+CREATE TABLE archive_index (
+    archive_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    team_id UUID NOT NULL REFERENCES teams(team_id) ON DELETE CASCADE,
+    table_name VARCHAR(50) NOT NULL,
+    season INTEGER NOT NULL,
+    start_date DATE NOT NULL,
+    end_date DATE NOT NULL, -- exclusive
+    row_count INTEGER NOT NULL,
+    file_path VARCHAR(500) NOT NULL, -- relative to ARCHIVE_DIR
+    created_at TIMESTAMP DEFAULT NOW(),
+    updated_at TIMESTAMP DEFAULT NOW(),
+    CONSTRAINT uq_archive_index_team_table_season UNIQUE (team_id, table_name, season)
+);
+
+-- Running per-player baselines (Welford: count, mean, sum of squared
+-- deviations) for morning resting HR and HRV
+CREATE TABLE metric_baselines (
+    player_id UUID REFERENCES players(player_id) ON DELETE CASCADE,
+    metric VARCHAR(20), -- 'resting_hr', 'hrv'
+    count INTEGER NOT NULL,
+    mean FLOAT NOT NULL,
+    m2 FLOAT NOT NULL,
+    last_value FLOAT,
+    last_date DATE,
+    updated_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (player_id, metric)
+);
+
+-- Nightly readiness runs (database/run_readiness.py) and how each team fared
+CREATE TABLE readiness_runs (
+    run_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    date DATE NOT NULL, -- the day scored
+    status VARCHAR(20) NOT NULL, -- 'running', 'succeeded', 'partial', 'failed'
+    workers INTEGER NOT NULL,
+    team_count INTEGER NOT NULL,
+    succeeded_count INTEGER NOT NULL,
+    failed_count INTEGER NOT NULL,
+    started_at TIMESTAMP NOT NULL,
+    finished_at TIMESTAMP,
+    duration_s FLOAT
+);
+
+CREATE TABLE readiness_run_teams (
+    run_id UUID REFERENCES readiness_runs(run_id) ON DELETE CASCADE,
+    team_id UUID REFERENCES teams(team_id) ON DELETE CASCADE,
+    status VARCHAR(20) NOT NULL, -- 'succeeded', 'failed'
+    attempts INTEGER NOT NULL,
+    player_count INTEGER,
+    duration_ms FLOAT, -- of the successful (or last) attempt
+    error TEXT,
+    files_error TEXT, -- snapshot/cube write failed after the scores were stored
+    finished_at TIMESTAMP,
+    PRIMARY KEY (run_id, team_id)
+);
+
+-- Players whose stored readiness is stale: session and wellness writes
+-- widen the range, the incremental recompute clears it
+CREATE TABLE dirty_readiness_ranges (
+    player_id UUID PRIMARY KEY REFERENCES players(player_id) ON DELETE CASCADE,
+    start_date DATE NOT NULL,
+    end_date DATE NOT NULL, -- inclusive
+    marked_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- Readiness flag changes, written with the scores (an outbox): every API
+-- process tails it into its SSE streams, old rows are pruned
+CREATE TABLE flag_events (
+    event_id SERIAL PRIMARY KEY,
+    team_id UUID NOT NULL REFERENCES teams(team_id) ON DELETE CASCADE,
+    event_type VARCHAR(30) NOT NULL DEFAULT 'readiness_flag', -- or 'import_completed'
+    -- readiness_flag events
+    player_id UUID REFERENCES players(player_id) ON DELETE CASCADE,
+    date DATE,
+    previous_flag VARCHAR(10), -- NULL: the day's first score
+    flag VARCHAR(10),
+    overall_score FLOAT,
+    data JSON, -- payload of any other event type
+    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+CREATE INDEX ix_flag_events_created_at ON flag_events(created_at);
+
 -- Polar data imports table (for tracking CSV uploads)
 CREATE TABLE polar_imports (
     import_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
@@ -118,12 +241,16 @@ CREATE TABLE polar_imports (
 );
 
 -- Indexes for performance
+-- (indexes on the partitioned parents are created on every partition)
 CREATE INDEX idx_players_team ON players(team_id);
+CREATE INDEX idx_players_team_lower_name ON players(team_id, lower(name));
 CREATE INDEX idx_training_sessions_player_date ON training_sessions(player_id, date DESC);
+CREATE INDEX idx_training_sessions_import_hash ON training_sessions(import_hash) WHERE import_hash IS NOT NULL;
 CREATE INDEX idx_wellness_checks_player_date ON wellness_checks(player_id, date DESC);
 CREATE INDEX idx_readiness_scores_player_date ON readiness_scores(player_id, date DESC);
 CREATE INDEX idx_readiness_scores_flag ON readiness_scores(readiness_flag);
 CREATE INDEX idx_users_email ON users(email);
+CREATE INDEX ix_readiness_runs_date ON readiness_runs(date);
 
 -- Unique constraints to prevent duplicate entries
 CREATE UNIQUE INDEX idx_training_sessions_unique ON training_sessions(player_id, date, session_type);
@@ -161,6 +288,6 @@ COMMENT ON TABLE wellness_checks IS 'Daily subjective wellness questionnaires';
 COMMENT ON TABLE readiness_scores IS 'Calculated readiness scores and recommendations';
 COMMENT ON TABLE polar_imports IS 'Track CSV file imports to prevent duplicates';
 
-COMMENT ON COLUMN training_sessions.acwr IS 'Acute:Chronic Workload Ratio - key injury risk metric';
+COMMENT ON COLUMN readiness_scores.acwr IS 'Acute:Chronic Workload Ratio - key injury risk metric';
 COMMENT ON COLUMN wellness_checks.cycle_phase IS 'Menstrual cycle phase for female-specific training adjustments';
 COMMENT ON COLUMN readiness_scores.readiness_flag IS 'Traffic light system: green=ready, yellow=caution, red=rest/modify';
\ No newline at end of file
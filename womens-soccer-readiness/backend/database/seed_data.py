@@ -18,6 +18,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from sqlalchemy.orm import Session
 from app.db import SessionLocal, engine
 from app.models import Team, User, Player, TrainingSession, WellnessCheck, ReadinessScore
+from app.services.baselines import BaselineTracker
+from app.services.intensity import zone_minutes_from_shares
 from passlib.context import CryptContext
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -169,6 +171,7 @@ def create_synthetic_data(db: Session):
     # Generate 10 weeks of data
     start_date = date.today() - timedelta(weeks=10)
     
+    tracker = BaselineTracker(db)
     for player in players:
         training_loads = []
         
@@ -183,6 +186,7 @@ def create_synthetic_data(db: Session):
                 # Training session data
                 session_type = random.choice(SESSION_TYPES)
                 duration = random.randint(60, 120) if session_type == "training" else random.randint(90, 110)
+                hr_zones = generate_hr_zones(150, player.max_hr)
                 
                 session = TrainingSession(
                     player_id=player.player_id,
@@ -196,7 +200,8 @@ def create_synthetic_data(db: Session):
                     decelerations=random.randint(20, 60),
                     avg_hr=random.randint(130, 170),
                     max_hr=random.randint(170, player.max_hr),
-                    hr_zones=generate_hr_zones(150, player.max_hr),
+                    hr_zones=hr_zones,
+                    **zone_minutes_from_shares(hr_zones, duration),
                     training_load=calculate_training_load(duration, 150, player.max_hr),
                     rpe=random.randint(4, 9)
                 )
@@ -206,6 +211,8 @@ def create_synthetic_data(db: Session):
             # Generate daily wellness checks
             for day in range(7):
                 check_date = week_start + timedelta(days=day)
+                resting_hr = round(random.gauss(player.baseline_rhr, 2.5))
+                hrv = max(5.0, random.gauss(player.baseline_hrv, 7))
                 
                 wellness = WellnessCheck(
                     player_id=player.player_id,
@@ -219,7 +226,10 @@ def create_synthetic_data(db: Session):
                     hydration=random.randint(2, 5),
                     nutrition_quality=random.randint(2, 5),
                     cycle_phase=random.choice(CYCLE_PHASES) if random.random() > 0.3 else None,
-                    injury_status="healthy" if random.random() > 0.1 else "minor"
+                    injury_status="healthy" if random.random() > 0.1 else "minor",
+                    resting_hr=resting_hr,
+                    hrv=hrv,
+                    **tracker.observe_wellness(player.player_id, check_date, resting_hr, hrv)
                 )
                 db.add(wellness)
                 
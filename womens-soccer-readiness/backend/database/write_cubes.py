@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Rewrite the memory-mapped season cubes of every team.
+
+The nightly run appends each new day and imports rewrite their team's
+cube; run this to build them the first time or after bulk changes:
+python database/write_cubes.py [--through YYYY-MM-DD]
+"""
+
+import argparse
+import os
+import sys
+from datetime import date
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select
+
+from app import models
+from app.db import SessionLocal
+from app.services.season_cube import SeasonCubeService
+
+def main():
+    """Main cube function"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--through", type=date.fromisoformat, help="Last day to include (default: today)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        cubes = SeasonCubeService(db)
+        for team_id in db.execute(select(models.Team.team_id)).scalars().all():
+            path = cubes.rebuild(team_id, args.through)
+            if path:
+                print(f"Wrote {path}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
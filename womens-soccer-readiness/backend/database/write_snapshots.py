@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Rewrite the season snapshots (Arrow files) of every team.
+
+The API refreshes a team's current-season snapshot after each readiness
+refresh; run this after bulk changes (imports, backfills, migrations) or
+to build an older season: python database/write_snapshots.py [--season N]
+"""
+
+import argparse
+import os
+import sys
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db import SessionLocal
+from app.services.snapshots import SnapshotService
+
+def main():
+    """Main snapshot function"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--season", type=int, help="Season to write (default: the current one)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        for path in SnapshotService(db).write_all(args.season):
+            print(f"Wrote {path}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
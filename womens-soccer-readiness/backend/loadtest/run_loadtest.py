@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+Match-day load test for the API, run entirely on this machine.
+
+Seeds a database with a deterministic season (SQLite in a temp dir by
+default, or --database-url), starts uvicorn on it, and replays a weighted
+mix of roster reads, wellness submissions, readiness reads, team readiness
+recalculations, summary reads and Polar uploads from concurrent clients.
+Reports throughput and p50/p95/p99 latency per route.
+
+Results are saved as JSON named after the git commit, so two commits run
+with the same options can be compared:
+
+    python loadtest/run_loadtest.py --concurrency 32 --duration 60
+    git checkout other-branch
+    python loadtest/run_loadtest.py --concurrency 32 --duration 60 \\
+        --compare loadtest/results/<first-commit>.json
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import math
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# Add backend directory to path
+sys.path.append(str(BACKEND_DIR))
+
+# Relative weights of each request type. Match day is read-heavy: staff
+# refresh the roster and readiness views while players submit wellness.
+DEFAULT_MIX = {
+    "roster": 30,
+    "wellness_submit": 25,
+    "player_readiness": 15,
+    "team_summary": 15,
+    "team_readiness": 10,
+    "polar_upload": 5,
+}
+
+# Scenario -> route label used in the report
+ROUTES = {
+    "roster": "GET /players/",
+    "wellness_submit": "POST /readiness/",
+    "player_readiness": "GET /readiness/",
+    "team_summary": "GET /teams/{team_id}/summary",
+    "team_readiness": "POST /teams/{team_id}/readiness",
+    "polar_upload": "POST /teams/{team_id}/polar-imports",
+}
+
+
+# --- Seeding -----------------------------------------------------------------
+
+def seed_database(database_url: str, teams: int, players: int, days: int, seed: int) -> None:
+    """
+    Rebuild the schema with Alembic and fill it with a reproducible season.
+
+    The database is wiped first: every run starts from identical data,
+    which is what makes results comparable across commits.
+    """
+    from alembic import command
+    from alembic.config import Config
+    from sqlalchemy import create_engine, insert, text
+
+    from app import models
+    from app.db import Base, configure_sqlite
+
+    rng = random.Random(seed)
+    engine = create_engine(database_url)
+    configure_sqlite(engine)
+
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            conn.execute(text("DROP SCHEMA IF EXISTS archive CASCADE"))
+            conn.execute(text("DROP SCHEMA public CASCADE"))
+            conn.execute(text("CREATE SCHEMA public"))
+        else:
+            Base.metadata.drop_all(conn)
+            conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+
+        config = Config(str(BACKEND_DIR / "alembic.ini"))
+        config.set_main_option("script_location", str(BACKEND_DIR / "migrations"))
+        config.attributes["connection"] = conn
+        command.upgrade(config, "head")
+
+    start = date.today() - timedelta(days=days)
+    with engine.begin() as conn:
+        for team_number in range(teams):
+            team_id = uuid.UUID(int=rng.getrandbits(128))
+            conn.execute(insert(models.Team), [{"team_id": team_id, "name": f"Load Test FC {team_number + 1}"}])
+            roster = [
+                {"player_id": uuid.UUID(int=rng.getrandbits(128)), "team_id": team_id,
+                 "name": f"Player {team_number + 1}-{number}", "position": rng.choice(["GK", "DEF", "MID", "FWD"]),
+                 "jersey_number": number, "is_active": True}
+                for number in range(1, players + 1)
+            ]
+            conn.execute(insert(models.Player), roster)
+
+            sessions, checks = [], []
+            for player in roster:
+                for offset in range(days):
+                    day = start + timedelta(days=offset)
+                    if day.weekday() != 6:
+                        sessions.append({
+                            "session_id": uuid.UUID(int=rng.getrandbits(128)), "player_id": player["player_id"],
+                            "date": day, "session_type": "training", "duration_min": rng.randint(45, 110),
+                            "training_load": round(rng.uniform(150, 450), 1),
+                        })
+                    checks.append({
+                        "check_id": uuid.UUID(int=rng.getrandbits(128)), "player_id": player["player_id"],
+                        "date": day, "sleep_quality": rng.randint(1, 5), "soreness": rng.randint(1, 5),
+                        "fatigue": rng.randint(1, 5), "stress": rng.randint(1, 5), "mood": rng.randint(1, 5),
+                    })
+            conn.execute(insert(models.TrainingSession), sessions)
+            conn.execute(insert(models.WellnessCheck), checks)
+    engine.dispose()
+
+
+# --- Server ------------------------------------------------------------------
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(env: Dict[str, str], port: int, workers: int) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+        cwd=BACKEND_DIR, env=env,
+    )
+
+
+def wait_until_ready(base_url: str, timeout: float = 30.0) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/metrics", timeout=1.0).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"API at {base_url} did not come up within {timeout:.0f}s")
+
+
+# --- Load --------------------------------------------------------------------
+
+class Fixtures:
+    """Team and player ids discovered from the running API."""
+
+    def __init__(self, players: List[Dict]):
+        self.teams: Dict[str, List[Dict]] = defaultdict(list)
+        # Sorted, so the same seed picks the same players whatever order the API returns
+        for player in sorted(players, key=lambda p: p["player_id"]):
+            if player.get("team_id"):
+                self.teams[player["team_id"]].append(player)
+        if not self.teams:
+            raise RuntimeError("No players with a team - seed the database first")
+        self.team_ids = sorted(self.teams)
+
+
+def polar_csv(rng: random.Random, roster: List[Dict]) -> bytes:
+    rows = ["Date,Name,Duration,Distance,HR Average,HR Max,Training Load"]
+    for player in rng.sample(roster, k=min(5, len(roster))):
+        day = date.today() - timedelta(days=rng.randint(0, 6))
+        minutes = rng.randint(30, 110)
+        rows.append(
+            f"{day},{player['name']},{minutes // 60:02d}:{minutes % 60:02d}:00,"
+            f"{rng.uniform(2, 11):.1f},{rng.randint(120, 165)},{rng.randint(170, 200)},{rng.randint(60, 450)}"
+        )
+    return ("\n".join(rows) + "\n").encode()
+
+
+async def send(client, scenario: str, rng: random.Random, fixtures: Fixtures):
+    team_id = rng.choice(fixtures.team_ids)
+    player = rng.choice(fixtures.teams[team_id])
+
+    if scenario == "roster":
+        return await client.get("/players/")
+    if scenario == "wellness_submit":
+        return await client.post("/readiness/", json={
+            "player_id": player["player_id"], "sleep_hours": round(rng.uniform(5, 10), 1),
+            "sleep_quality": rng.randint(1, 5), "soreness": rng.randint(1, 5),
+            "fatigue": rng.randint(1, 5), "stress": rng.randint(1, 5), "mood": rng.randint(1, 5),
+        })
+    if scenario == "player_readiness":
+        return await client.get("/readiness/", params={"player_id": player["player_id"], "limit": 30})
+    if scenario == "team_summary":
+        return await client.get(f"/teams/{team_id}/summary", params={"limit": 120})
+    if scenario == "team_readiness":
+        return await client.post(f"/teams/{team_id}/readiness")
+    if scenario == "polar_upload":
+        files = {"file": ("polar_export.csv", io.BytesIO(polar_csv(rng, fixtures.teams[team_id])), "text/csv")}
+        return await client.post(f"/teams/{team_id}/polar-imports", files=files)
+    raise ValueError(f"Unknown scenario {scenario}")
+
+
+async def worker(client, worker_id: int, seed: int, mix: Dict[str, int], fixtures: Fixtures,
+                 record_after: float, deadline: float, samples: List[Tuple[str, int, float]]):
+    # One RNG per worker: the request sequence depends only on seed and worker id
+    rng = random.Random(seed * 1000 + worker_id)
+    scenarios, weights = list(mix), list(mix.values())
+    while True:
+        scenario = rng.choices(scenarios, weights)[0]
+        started = time.perf_counter()
+        if started >= deadline:
+            return
+        try:
+            response = await send(client, scenario, rng, fixtures)
+            status = response.status_code
+        except Exception:
+            status = 0  # connection error / timeout
+        elapsed = time.perf_counter() - started
+        if started >= record_after:
+            samples.append((scenario, status, elapsed))
+
+
+async def run_load(base_url: str, concurrency: int, duration: float, warmup: float,
+                   seed: int, mix: Dict[str, int]) -> Tuple[List[Tuple[str, int, float]], float]:
+    import httpx
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        fixtures = Fixtures((await client.get("/players/")).json())
+        samples: List[Tuple[str, int, float]] = []
+        now = time.perf_counter()
+        record_after, deadline = now + warmup, now + warmup + duration
+        await asyncio.gather(*(
+            worker(client, i, seed, mix, fixtures, record_after, deadline, samples)
+            for i in range(concurrency)
+        ))
+    return samples, duration
+
+
+# --- Reporting ---------------------------------------------------------------
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile: a value that was actually observed."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _stats(latencies: List[float], errors: int, duration: float) -> Dict[str, float]:
+    values = sorted(latencies)
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "rps": round(len(values) / duration, 2),
+        "mean_ms": round(1000 * sum(values) / len(values), 2) if values else 0.0,
+        "p50_ms": round(1000 * percentile(values, 50), 2),
+        "p95_ms": round(1000 * percentile(values, 95), 2),
+        "p99_ms": round(1000 * percentile(values, 99), 2),
+        "max_ms": round(1000 * values[-1], 2) if values else 0.0,
+    }
+
+
+def summarize(samples: List[Tuple[str, int, float]], duration: float) -> Dict[str, Dict]:
+    by_route: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    for scenario, status, elapsed in samples:
+        by_route[ROUTES[scenario]].append(elapsed)
+        if not 200 <= status < 300:
+            errors[ROUTES[scenario]] += 1
+
+    routes = {route: _stats(latencies, errors[route], duration) for route, latencies in sorted(by_route.items())}
+    total = _stats([s[2] for s in samples], sum(errors.values()), duration)
+    return {"routes": routes, "total": total}
+
+
+def git_revision() -> Dict[str, object]:
+    def git(*args) -> str:
+        return subprocess.run(["git", *args], cwd=BACKEND_DIR, capture_output=True, text=True).stdout.strip()
+    commit = git("rev-parse", "--short", "HEAD") or "unknown"
+    return {"commit": commit, "dirty": bool(git("status", "--porcelain", "--", "."))}
+
+
+def print_report(summary: Dict[str, Dict], baseline: Optional[Dict] = None) -> None:
+    header = f"{'route':<40} {'req':>7} {'err':>5} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    print(header)
+    print("-" * len(header))
+    rows = list(summary["routes"].items()) + [("TOTAL", summary["total"])]
+    for route, stats in rows:
+        print(f"{route:<40} {stats['requests']:>7} {stats['errors']:>5} {stats['rps']:>8.1f} "
+              f"{stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f}")
+        if baseline:
+            before = baseline["total"] if route == "TOTAL" else baseline["routes"].get(route)
+            if before:
+                deltas = [
+                    _delta(stats[key], before[key], higher_is_better=(key == "rps"))
+                    for key in ("rps", "p50_ms", "p95_ms", "p99_ms")
+                ]
+                print(f"{'  vs baseline':<40} {'':>7} {'':>5} {deltas[0]:>8} {deltas[1]:>9} {deltas[2]:>9} {deltas[3]:>9}")
+
+
+def _delta(current: float, before: float, higher_is_better: bool) -> str:
+    if not before:
+        return "n/a"
+    change = 100 * (current - before) / before
+    better = change > 0 if higher_is_better else change < 0
+    return f"{change:+.0f}%{'' if abs(change) < 5 else (' ok' if better else ' !!')}"
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in ROUTES:
+            raise argparse.ArgumentTypeError(f"Unknown scenario {name!r}; choose from {', '.join(ROUTES)}")
+        mix[name.strip()] = int(weight)
+    return mix
+
+
+def main():
+    """Main load test function"""
+    parser = argparse.ArgumentParser(description="Local match-day load test")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=30, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="Unmeasured seconds before measuring")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for data and request mix")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX,
+                        help="Weights, e.g. roster=30,wellness_submit=25,polar_upload=5")
+    parser.add_argument("--teams", type=int, default=2)
+    parser.add_argument("--players", type=int, default=25, help="Players per team")
+    parser.add_argument("--days", type=int, default=120, help="Days of history to seed")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--database-url",
+                        help="Seed and serve this database instead of a temp SQLite file (it is wiped!)")
+    parser.add_argument("--base-url", help="Use an already running, already seeded API; skips seeding")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE",
+                        help="Extra environment for the server, e.g. USE_ASYNC_DB=true")
+    parser.add_argument("--output", type=Path, default=RESULTS_DIR, help="Directory for the JSON result")
+    parser.add_argument("--compare", type=Path, help="Earlier result JSON to compare against")
+    args = parser.parse_args()
+
+    server = None
+    tmp_dir = None
+    base_url = args.base_url
+    try:
+        if not base_url:
+            if args.database_url:
+                database_url = args.database_url
+            else:
+                tmp_dir = tempfile.TemporaryDirectory(prefix="soccer-loadtest-")
+                database_url = f"sqlite:///{tmp_dir.name}/loadtest.db"
+
+            env = dict(os.environ)
+            if database_url.startswith("sqlite"):
+                env.update({"USE_SQLITE": "true", "SQLITE_URL": database_url})
+            else:
+                env.update({"USE_SQLITE": "false", "DATABASE_URL": database_url})
+            env.update(dict(item.split("=", 1) for item in args.env))
+            os.environ.update(env)  # app.config reads these at import time
+
+            print(f"Seeding {args.teams} team(s) x {args.players} players x {args.days} days ...")
+            seed_database(database_url, args.teams, args.players, args.days, args.seed)
+
+            port = _free_port()
+            base_url = f"http://127.0.0.1:{port}"
+            server = start_server(env, port, args.workers)
+            wait_until_ready(base_url)
+
+        print(f"Running {args.concurrency} clients for {args.duration:.0f}s (+{args.warmup:.0f}s warm-up) ...")
+        samples, duration = asyncio.run(run_load(
+            base_url, args.concurrency, args.duration, args.warmup, args.seed, args.mix
+        ))
+    finally:
+        if server:
+            server.terminate()
+            server.wait(timeout=10)
+        if tmp_dir:
+            tmp_dir.cleanup()
+
+    summary = summarize(samples, duration)
+    revision = git_revision()
+    result = {
+        **revision,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "config": {
+            "concurrency": args.concurrency, "duration": args.duration, "warmup": args.warmup,
+            "seed": args.seed, "mix": args.mix, "teams": args.teams, "players": args.players,
+            "days": args.days, "workers": args.workers, "env": sorted(args.env),
+            "database": "external" if args.base_url else ("sqlite" if not args.database_url else args.database_url.split(":")[0]),
+        },
+        "machine": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        **summary,
+    }
+
+    baseline = None
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if baseline.get("config") != result["config"]:
+            print(f"Warning: {args.compare} was run with different options - deltas are not like for like")
+        print(f"\nCompared with {baseline.get('commit')} ({args.compare})")
+    print()
+    print_report(summary, baseline)
+
+    args.output.mkdir(parents=True, exist_ok=True)
+    name = revision["commit"] + ("-dirty" if revision["dirty"] else "")
+    path = args.output / f"{name}.json"
+    path.write_text(json.dumps(result, indent=2) + "\n")
+    print(f"\nSaved {path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Initial schema (tables as defined in app/models.py)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _timestamps(updated: bool = True):
+    columns = [sa.Column('created_at', sa.DateTime(), server_default=sa.func.now())]
+    if updated:
+        columns.append(sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now()))
+    return columns
+
+
+def upgrade() -> None:
+    op.create_table(
+        'teams',
+        sa.Column('team_id', sa.Uuid(), primary_key=True),
+        sa.Column('name', sa.String(100), nullable=False),
+        sa.Column('organization', sa.String(100)),
+        sa.Column('level', sa.String(50)),
+        *_timestamps(),
+    )
+
+    op.create_table(
+        'users',
+        sa.Column('user_id', sa.Uuid(), primary_key=True),
+        sa.Column('email', sa.String(255), nullable=False),
+        sa.Column('password_hash', sa.String(255), nullable=False),
+        sa.Column('full_name', sa.String(100), nullable=False),
+        sa.Column('role', sa.String(50), nullable=False),
+        sa.Column('team_id', sa.Uuid(), sa.ForeignKey('teams.team_id', ondelete='CASCADE')),
+        sa.Column('is_active', sa.Boolean()),
+        *_timestamps(),
+    )
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+    op.create_table(
+        'players',
+        sa.Column('player_id', sa.Uuid(), primary_key=True),
+        sa.Column('team_id', sa.Uuid(), sa.ForeignKey('teams.team_id', ondelete='CASCADE')),
+        sa.Column('name', sa.String(100), nullable=False),
+        sa.Column('position', sa.String(20)),
+        sa.Column('jersey_number', sa.Integer()),
+        sa.Column('birth_date', sa.Date()),
+        sa.Column('baseline_rhr', sa.Integer()),
+        sa.Column('baseline_hrv', sa.Float()),
+        sa.Column('max_hr', sa.Integer()),
+        sa.Column('notes', sa.Text()),
+        sa.Column('is_active', sa.Boolean()),
+        *_timestamps(),
+    )
+    op.create_index('ix_players_team_id', 'players', ['team_id'])
+
+    op.create_table(
+        'training_sessions',
+        sa.Column('session_id', sa.Uuid(), primary_key=True),
+        sa.Column('player_id', sa.Uuid(), sa.ForeignKey('players.player_id', ondelete='CASCADE')),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('session_type', sa.String(50)),
+        sa.Column('duration_min', sa.Integer()),
+        sa.Column('distance_m', sa.Float()),
+        sa.Column('high_speed_running_m', sa.Float()),
+        sa.Column('sprint_distance_m', sa.Float()),
+        sa.Column('accelerations', sa.Integer()),
+        sa.Column('decelerations', sa.Integer()),
+        sa.Column('avg_hr', sa.Integer()),
+        sa.Column('max_hr', sa.Integer()),
+        sa.Column('hr_zones', sa.JSON()),
+        sa.Column('training_load', sa.Float()),
+        sa.Column('rpe', sa.Integer(), sa.CheckConstraint('rpe BETWEEN 1 AND 10')),
+        sa.Column('notes', sa.Text()),
+        *_timestamps(),
+    )
+    op.create_index('ix_training_sessions_player_id', 'training_sessions', ['player_id'])
+    op.create_index('ix_training_sessions_date', 'training_sessions', ['date'])
+
+    op.create_table(
+        'wellness_checks',
+        sa.Column('check_id', sa.Uuid(), primary_key=True),
+        sa.Column('player_id', sa.Uuid(), sa.ForeignKey('players.player_id', ondelete='CASCADE')),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('sleep_hours', sa.Float(), sa.CheckConstraint('sleep_hours BETWEEN 0 AND 24')),
+        sa.Column('sleep_quality', sa.Integer(), sa.CheckConstraint('sleep_quality BETWEEN 1 AND 5')),
+        sa.Column('soreness', sa.Integer(), sa.CheckConstraint('soreness BETWEEN 1 AND 5')),
+        sa.Column('fatigue', sa.Integer(), sa.CheckConstraint('fatigue BETWEEN 1 AND 5')),
+        sa.Column('stress', sa.Integer(), sa.CheckConstraint('stress BETWEEN 1 AND 5')),
+        sa.Column('mood', sa.Integer(), sa.CheckConstraint('mood BETWEEN 1 AND 5')),
+        sa.Column('hydration', sa.Integer(), sa.CheckConstraint('hydration BETWEEN 1 AND 5')),
+        sa.Column('nutrition_quality', sa.Integer(), sa.CheckConstraint('nutrition_quality BETWEEN 1 AND 5')),
+        sa.Column('cycle_phase', sa.String(20)),
+        sa.Column('cycle_symptoms', sa.Text()),
+        sa.Column('injury_status', sa.String(50)),
+        sa.Column('injury_notes', sa.Text()),
+        sa.Column('notes', sa.Text()),
+        *_timestamps(updated=False),
+    )
+    op.create_index('ix_wellness_checks_player_id', 'wellness_checks', ['player_id'])
+    op.create_index('ix_wellness_checks_date', 'wellness_checks', ['date'])
+
+    op.create_table(
+        'readiness_scores',
+        sa.Column('score_id', sa.Uuid(), primary_key=True),
+        sa.Column('player_id', sa.Uuid(), sa.ForeignKey('players.player_id', ondelete='CASCADE')),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('overall_score', sa.Float(), sa.CheckConstraint('overall_score BETWEEN 0 AND 100')),
+        sa.Column('training_load_score', sa.Float(), sa.CheckConstraint('training_load_score BETWEEN 0 AND 100')),
+        sa.Column('wellness_score', sa.Float(), sa.CheckConstraint('wellness_score BETWEEN 0 AND 100')),
+        sa.Column('recovery_score', sa.Float(), sa.CheckConstraint('recovery_score BETWEEN 0 AND 100')),
+        sa.Column('acute_load', sa.Float()),
+        sa.Column('chronic_load', sa.Float()),
+        sa.Column('acwr', sa.Float()),
+        sa.Column('readiness_flag', sa.String(10), sa.CheckConstraint("readiness_flag IN ('green', 'yellow', 'red')")),
+        sa.Column('recommendations', postgresql.ARRAY(sa.Text()).with_variant(sa.JSON(), 'sqlite')),
+        *_timestamps(updated=False),
+    )
+    op.create_index('ix_readiness_scores_player_id', 'readiness_scores', ['player_id'])
+    op.create_index('ix_readiness_scores_date', 'readiness_scores', ['date'])
+    op.create_index('ix_readiness_scores_readiness_flag', 'readiness_scores', ['readiness_flag'])
+
+    op.create_table(
+        'polar_imports',
+        sa.Column('import_id', sa.Uuid(), primary_key=True),
+        sa.Column('player_id', sa.Uuid(), sa.ForeignKey('players.player_id', ondelete='CASCADE')),
+        sa.Column('file_name', sa.String(255)),
+        sa.Column('file_hash', sa.String(64)),
+        sa.Column('import_date', sa.DateTime(), server_default=sa.func.now()),
+        sa.Column('records_imported', sa.Integer()),
+        sa.Column('status', sa.String(20)),
+        sa.Column('error_message', sa.Text()),
+        *_timestamps(updated=False),
+    )
+
+
+def downgrade() -> None:
+    for table in ('polar_imports', 'readiness_scores', 'wellness_checks',
+                  'training_sessions', 'players', 'users', 'teams'):
+        op.drop_table(table)
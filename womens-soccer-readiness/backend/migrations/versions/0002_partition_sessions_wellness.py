@@ -0,0 +1,102 @@
+"""Range-partition training_sessions and wellness_checks by month
+
+PostgreSQL cannot turn an existing table into a partitioned one, so each
+table is rebuilt: rename, create the partitioned parent, create monthly
+partitions covering existing data (plus a few months ahead and a DEFAULT
+catch-all), copy rows, drop the old table.
+
+Other backends keep the plain table - partitioning is PostgreSQL-only.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+# table -> primary key column
+TABLES = {
+    'training_sessions': 'session_id',
+    'wellness_checks': 'check_id',
+}
+MONTHS_AHEAD = 3
+
+
+def _add_months(day: date, months: int) -> date:
+    index = day.year * 12 + (day.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _partition_table(table: str, pk: str) -> None:
+    bind = op.get_bind()
+    old = f"{table}_unpartitioned"
+
+    op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+    op.execute(f"""
+        CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)
+        PARTITION BY RANGE (date)
+    """)
+    op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY ({pk}, date)")
+    op.execute(f"""
+        ALTER TABLE {table} ADD FOREIGN KEY (player_id)
+        REFERENCES players(player_id) ON DELETE CASCADE
+    """)
+
+    first = bind.execute(sa.text(f"SELECT min(date) FROM {old}")).scalar() or date.today()
+    month = first.replace(day=1)
+    last = _add_months(date.today().replace(day=1), MONTHS_AHEAD)
+    while month <= last:
+        end = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE {table}_p{month.year:04d}_{month.month:02d} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        month = end
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+    op.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+    op.drop_table(old)
+
+    # Created on the parent, so every partition (current and future) gets them
+    op.create_index(f'ix_{table}_player_id', table, ['player_id'])
+    op.create_index(f'ix_{table}_date', table, ['date'])
+
+
+def _unpartition_table(table: str, pk: str) -> None:
+    old = f"{table}_partitioned"
+
+    op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+    op.execute(f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+    op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY ({pk})")
+    op.execute(f"""
+        ALTER TABLE {table} ADD FOREIGN KEY (player_id)
+        REFERENCES players(player_id) ON DELETE CASCADE
+    """)
+    op.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+    # Dropping the parent drops every partition with it
+    op.execute(f"DROP TABLE {old}")
+
+    op.create_index(f'ix_{table}_player_id', table, ['player_id'])
+    op.create_index(f'ix_{table}_date', table, ['date'])
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table, pk in TABLES.items():
+        _partition_table(table, pk)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table, pk in TABLES.items():
+        _unpartition_table(table, pk)
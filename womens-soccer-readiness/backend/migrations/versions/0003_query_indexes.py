@@ -0,0 +1,48 @@
+"""Indexes for the readiness and Polar import queries; import_hash/raw_data columns
+
+- (player_id, date) on training_sessions and wellness_checks replaces the
+  single-column player_id index: every readiness query filters one player
+  and a date window, often ordered by date.
+- import_hash + raw_data on training_sessions, used by the Polar parser to
+  skip sessions it has already imported.
+- (team_id, lower(name)) on players for matching Polar CSV names.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('training_sessions', sa.Column('import_hash', sa.String(32)))
+    op.add_column('training_sessions', sa.Column('raw_data', sa.JSON()))
+    op.create_index('ix_training_sessions_import_hash', 'training_sessions', ['import_hash'])
+
+    for table in ('training_sessions', 'wellness_checks'):
+        op.drop_index(f'ix_{table}_player_id', table_name=table)
+        op.create_index(f'ix_{table}_player_date', table, ['player_id', 'date'])
+
+    op.create_index(
+        'ix_players_team_lower_name', 'players',
+        ['team_id', sa.text('lower(name)')],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_players_team_lower_name', table_name='players')
+
+    for table in ('training_sessions', 'wellness_checks'):
+        op.drop_index(f'ix_{table}_player_date', table_name=table)
+        op.create_index(f'ix_{table}_player_id', table, ['player_id'])
+
+    op.drop_index('ix_training_sessions_import_hash', table_name='training_sessions')
+    op.drop_column('training_sessions', 'raw_data')
+    op.drop_column('training_sessions', 'import_hash')
@@ -0,0 +1,34 @@
+"""Partial index on training_sessions.import_hash
+
+Only Polar imports set import_hash. A full index is mostly NULLs; once
+SQLite has statistics its planner judges such an index unselective and
+scans the table for every de-duplication lookup. `import_hash = :x`
+implies NOT NULL, so both PostgreSQL and SQLite use the partial index.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+NOT_NULL = sa.text('import_hash IS NOT NULL')
+
+
+def upgrade() -> None:
+    op.drop_index('ix_training_sessions_import_hash', table_name='training_sessions')
+    op.create_index(
+        'ix_training_sessions_import_hash', 'training_sessions', ['import_hash'],
+        postgresql_where=NOT_NULL, sqlite_where=NOT_NULL,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_training_sessions_import_hash', table_name='training_sessions')
+    op.create_index('ix_training_sessions_import_hash', 'training_sessions', ['import_hash'])
@@ -0,0 +1,38 @@
+"""Team-by-day readiness summary table
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'team_daily_summaries',
+        sa.Column('team_id', sa.Uuid(), sa.ForeignKey('teams.team_id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('date', sa.Date(), primary_key=True),
+        sa.Column('player_count', sa.Integer(), nullable=False),
+        sa.Column('average_readiness', sa.Float()),
+        sa.Column('green_count', sa.Integer(), nullable=False),
+        sa.Column('yellow_count', sa.Integer(), nullable=False),
+        sa.Column('red_count', sa.Integer(), nullable=False),
+        sa.Column('session_count', sa.Integer(), nullable=False),
+        sa.Column('total_load', sa.Float()),
+        sa.Column('mean_load', sa.Float()),
+        sa.Column('wellness_count', sa.Integer(), nullable=False),
+        sa.Column('wellness_completion_rate', sa.Float(),
+                  sa.CheckConstraint('wellness_completion_rate BETWEEN 0 AND 1')),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('team_daily_summaries')
@@ -0,0 +1,35 @@
+"""Index of team-seasons archived to Parquet
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'archive_index',
+        sa.Column('archive_id', sa.Uuid(), primary_key=True),
+        sa.Column('team_id', sa.Uuid(), sa.ForeignKey('teams.team_id', ondelete='CASCADE'), nullable=False),
+        sa.Column('table_name', sa.String(50), nullable=False),
+        sa.Column('season', sa.Integer(), nullable=False),
+        sa.Column('start_date', sa.Date(), nullable=False),
+        sa.Column('end_date', sa.Date(), nullable=False),
+        sa.Column('row_count', sa.Integer(), nullable=False),
+        sa.Column('file_path', sa.String(500), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now()),
+        sa.UniqueConstraint('team_id', 'table_name', 'season', name='uq_archive_index_team_table_season'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('archive_index')
@@ -0,0 +1,43 @@
+"""Resting HR and HRV on wellness checks, running per-player baselines
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Added on the partitioned parent; PostgreSQL adds them to every partition
+    op.add_column('wellness_checks', sa.Column('resting_hr', sa.Integer(),
+                                               sa.CheckConstraint('resting_hr BETWEEN 25 AND 120')))
+    op.add_column('wellness_checks', sa.Column('hrv', sa.Float(), sa.CheckConstraint('hrv > 0')))
+    op.add_column('wellness_checks', sa.Column('resting_hr_z', sa.Float()))
+    op.add_column('wellness_checks', sa.Column('hrv_z', sa.Float()))
+
+    op.create_table(
+        'metric_baselines',
+        sa.Column('player_id', sa.Uuid(), sa.ForeignKey('players.player_id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('metric', sa.String(20), primary_key=True),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.Column('mean', sa.Float(), nullable=False),
+        sa.Column('m2', sa.Float(), nullable=False),
+        sa.Column('last_value', sa.Float()),
+        sa.Column('last_date', sa.Date()),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('metric_baselines')
+    op.drop_column('wellness_checks', 'hrv_z')
+    op.drop_column('wellness_checks', 'resting_hr_z')
+    op.drop_column('wellness_checks', 'hrv')
+    op.drop_column('wellness_checks', 'resting_hr')
@@ -0,0 +1,49 @@
+"""Scheduled readiness runs and per-team results
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'readiness_runs',
+        sa.Column('run_id', sa.Uuid(), primary_key=True),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False),
+        sa.Column('workers', sa.Integer(), nullable=False),
+        sa.Column('team_count', sa.Integer(), nullable=False),
+        sa.Column('succeeded_count', sa.Integer(), nullable=False),
+        sa.Column('failed_count', sa.Integer(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('finished_at', sa.DateTime()),
+        sa.Column('duration_s', sa.Float()),
+    )
+    op.create_index('ix_readiness_runs_date', 'readiness_runs', ['date'])
+
+    op.create_table(
+        'readiness_run_teams',
+        sa.Column('run_id', sa.Uuid(), sa.ForeignKey('readiness_runs.run_id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('team_id', sa.Uuid(), sa.ForeignKey('teams.team_id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('status', sa.String(20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('player_count', sa.Integer()),
+        sa.Column('duration_ms', sa.Float()),
+        sa.Column('error', sa.Text()),
+        sa.Column('finished_at', sa.DateTime()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('readiness_run_teams')
+    op.drop_index('ix_readiness_runs_date', table_name='readiness_runs')
+    op.drop_table('readiness_runs')
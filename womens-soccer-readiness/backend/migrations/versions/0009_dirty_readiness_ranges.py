@@ -0,0 +1,28 @@
+"""Queue of players whose stored readiness needs recomputing
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'dirty_readiness_ranges',
+        sa.Column('player_id', sa.Uuid(), sa.ForeignKey('players.player_id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('start_date', sa.Date(), nullable=False),
+        sa.Column('end_date', sa.Date(), nullable=False),
+        sa.Column('marked_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('dirty_readiness_ranges')
@@ -0,0 +1,88 @@
+"""Minutes per HR zone as numeric columns on training_sessions, backfilled from hr_zones
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+ZONE_COLUMNS = [f'hr_zone{zone}_min' for zone in range(1, 6)]
+BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # Skips columns a backfill that stopped part-way already committed
+    existing = {column['name'] for column in sa.inspect(bind).get_columns('training_sessions')}
+    # Added on the partitioned parent; PostgreSQL adds them to every partition
+    for column in ZONE_COLUMNS:
+        if column not in existing:
+            op.add_column('training_sessions', sa.Column(column, sa.Float()))
+
+    context = op.get_context()
+    if bind.dialect.name == 'postgresql' and _owns_transaction(context):
+        # ADD COLUMN holds an ACCESS EXCLUSIVE lock on training_sessions
+        # until commit. Commit it now, then let every batch commit on its
+        # own so imports and readiness reads only wait for row locks.
+        with context.autocommit_block():
+            _backfill()
+    else:
+        _backfill()
+
+
+def _owns_transaction(context) -> bool:
+    """False when env.py runs inside a caller's transaction (the test suite)."""
+    return context.environment_context.config.attributes.get('connection') is None
+
+
+def _backfill() -> None:
+    """
+    Convert existing hr_zones to minutes, one UPDATE per keyset batch.
+
+    Until now only seed data wrote hr_zones, as % of the session per zone
+    ({"zone1": 12, ...}), so minutes are share x duration_min. Rows without
+    a duration keep NULLs. The conversion runs in SQL (SQLAlchemy renders
+    the JSON access for PostgreSQL and SQLite), so a batch is a single
+    statement and rerunning one is harmless.
+    """
+    bind = op.get_bind()
+    sessions = sa.table(
+        'training_sessions',
+        sa.column('session_id', sa.Uuid()), sa.column('duration_min', sa.Integer()),
+        sa.column('hr_zones', sa.JSON()),
+        *(sa.column(column, sa.Float()) for column in ZONE_COLUMNS),
+    )
+    has_zones = (sessions.c.hr_zones.is_not(None), sessions.c.duration_min.is_not(None))
+    minutes = {
+        column: sa.func.round(
+            sa.cast(sessions.c.hr_zones[f'zone{zone}'].as_float() * sessions.c.duration_min / 100, sa.Numeric), 1
+        )
+        for zone, column in enumerate(ZONE_COLUMNS, start=1)
+    }
+
+    last_id = None
+    while True:
+        query = sa.select(sessions.c.session_id).where(*has_zones).order_by(sessions.c.session_id).limit(BATCH_SIZE)
+        if last_id is not None:
+            query = query.where(sessions.c.session_id > last_id)
+        ids = bind.execute(query).scalars().all()
+        if not ids:
+            break
+        bind.execute(
+            sessions.update()
+            .where(sessions.c.session_id.between(ids[0], ids[-1]), *has_zones)
+            .values(minutes)
+        )
+        last_id = ids[-1]
+
+
+def downgrade() -> None:
+    for column in reversed(ZONE_COLUMNS):
+        op.drop_column('training_sessions', column)
@@ -0,0 +1,22 @@
+"""Snapshot/cube write errors recorded apart from scoring errors
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('readiness_run_teams', sa.Column('files_error', sa.Text()))
+
+
+def downgrade() -> None:
+    op.drop_column('readiness_run_teams', 'files_error')
@@ -0,0 +1,34 @@
+"""Outbox of readiness flag changes, tailed by every API process
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0012'
+down_revision = '0011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'flag_events',
+        sa.Column('event_id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('team_id', sa.Uuid(), sa.ForeignKey('teams.team_id', ondelete='CASCADE'), nullable=False),
+        sa.Column('player_id', sa.Uuid(), sa.ForeignKey('players.player_id', ondelete='CASCADE'), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('previous_flag', sa.String(10)),
+        sa.Column('flag', sa.String(10), nullable=False),
+        sa.Column('overall_score', sa.Float()),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now(), nullable=False),
+    )
+    op.create_index('ix_flag_events_created_at', 'flag_events', ['created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_flag_events_created_at', table_name='flag_events')
+    op.drop_table('flag_events')
@@ -0,0 +1,46 @@
+"""One wellness check per player and day
+
+Readiness, season stores and snapshots all read a player's day as a single
+check, and a resubmitted check is now an upsert. Existing duplicates keep
+their latest submission (created_at, then check_id). The (player_id, date)
+index becomes unique; it includes the partition key, so PostgreSQL accepts
+it on the partitioned parent.
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0013'
+down_revision = '0012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    checks = sa.table(
+        'wellness_checks',
+        sa.column('check_id', sa.Uuid()), sa.column('player_id', sa.Uuid()),
+        sa.column('date', sa.Date()), sa.column('created_at', sa.DateTime()),
+    )
+    ranked = sa.select(
+        checks.c.check_id,
+        sa.func.row_number().over(
+            partition_by=(checks.c.player_id, checks.c.date),
+            order_by=(checks.c.created_at.desc().nulls_last(), checks.c.check_id.desc()),
+        ).label('newest'),
+    ).subquery()
+    op.get_bind().execute(
+        checks.delete().where(checks.c.check_id.in_(sa.select(ranked.c.check_id).where(ranked.c.newest > 1)))
+    )
+
+    op.drop_index('ix_wellness_checks_player_date', table_name='wellness_checks')
+    op.create_index('ix_wellness_checks_player_date', 'wellness_checks', ['player_id', 'date'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_wellness_checks_player_date', table_name='wellness_checks')
+    op.create_index('ix_wellness_checks_player_date', 'wellness_checks', ['player_id', 'date'])
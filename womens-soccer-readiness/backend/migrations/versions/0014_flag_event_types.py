@@ -0,0 +1,37 @@
+"""Event type and payload on flag_events, for finished imports
+
+Imports commit on whichever API replica received the upload; their
+`import_completed` event now goes through the same outbox as flag changes.
+Those rows have no player, day or flag.
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0014'
+down_revision = '0013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('flag_events') as batch:
+        batch.add_column(sa.Column('event_type', sa.String(30), nullable=False, server_default='readiness_flag'))
+        batch.add_column(sa.Column('data', sa.JSON()))
+        batch.alter_column('player_id', existing_type=sa.Uuid(), nullable=True)
+        batch.alter_column('date', existing_type=sa.Date(), nullable=True)
+        batch.alter_column('flag', existing_type=sa.String(10), nullable=True)
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM flag_events WHERE event_type <> 'readiness_flag'")
+    with op.batch_alter_table('flag_events') as batch:
+        batch.alter_column('flag', existing_type=sa.String(10), nullable=False)
+        batch.alter_column('date', existing_type=sa.Date(), nullable=False)
+        batch.alter_column('player_id', existing_type=sa.Uuid(), nullable=False)
+        batch.drop_column('data')
+        batch.drop_column('event_type')
@@ -0,0 +1,165 @@
+"""
+Fixtures for tests that need a real database.
+
+Point TEST_DATABASE_URL at a throwaway database - PostgreSQL, or a SQLite
+file for the embedded backend. Its tables are dropped and rebuilt with
+`alembic upgrade head` at the start of the run. Without it, database tests
+are skipped.
+"""
+import os
+import random
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import Session
+
+from app import models
+from app.db import Base, configure_sqlite
+from app.nplusone import detect_n_plus_one
+from app.services.partitions import PARTITIONED_TABLES, add_months, create_partition_sql
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+SEED_PLAYERS = 12
+SEED_DAYS = 60
+# Other clubs sharing the database, so the planner's statistics describe a
+# multi-team install rather than one squad. Their players are inactive:
+# anything that walks every active team (the nightly run) sees only ours.
+OTHER_CLUBS = 9
+
+
+def _reset_schema(engine) -> None:
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            conn.execute(text("DROP SCHEMA IF EXISTS archive CASCADE"))
+            conn.execute(text("DROP SCHEMA public CASCADE"))
+            conn.execute(text("CREATE SCHEMA public"))
+        else:
+            Base.metadata.drop_all(conn)
+            conn.execute(text("DROP TABLE IF EXISTS alembic_version"))
+
+        config = Config(str(BACKEND_DIR / "alembic.ini"))
+        config.set_main_option("script_location", str(BACKEND_DIR / "migrations"))
+        config.attributes["connection"] = conn
+        command.upgrade(config, "head")
+
+
+def _create_history_partitions(engine, start: date) -> None:
+    """The migration only creates partitions from today on; seed data goes further back."""
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as conn:
+        month = start.replace(day=1)
+        while month < date.today().replace(day=1):
+            for table in PARTITIONED_TABLES:
+                conn.execute(text(create_partition_sql(table, month)))
+            month = add_months(month, 1)
+
+
+def _history(rng, player_id, start: date):
+    """SEED_DAYS of training (Sundays off) and daily wellness checks."""
+    sessions, checks = [], []
+    for offset in range(SEED_DAYS):
+        day = start + timedelta(days=offset)
+        if day.weekday() != 6:
+            sessions.append(dict(
+                player_id=player_id, date=day, session_type="training",
+                duration_min=rng.randint(45, 110), training_load=rng.uniform(150, 450),
+            ))
+        checks.append(dict(
+            player_id=player_id, date=day,
+            sleep_quality=rng.randint(1, 5), soreness=rng.randint(1, 5),
+            fatigue=rng.randint(1, 5), stress=rng.randint(1, 5), mood=rng.randint(1, 5),
+        ))
+    return sessions, checks
+
+
+def _add_squad(db, rng, name: str, start: date, is_active: bool = True) -> models.Team:
+    team = models.Team(name=name, level="college")
+    db.add(team)
+    db.flush()
+    sessions, checks = [], []
+    for number in range(1, SEED_PLAYERS + 1):
+        player = models.Player(
+            team_id=team.team_id, name=f"Player {number}", is_active=is_active,
+            position=rng.choice(["GK", "DEF", "MID", "FWD"]), jersey_number=number,
+        )
+        db.add(player)
+        db.flush()
+        player_sessions, player_checks = _history(rng, player.player_id, start)
+        sessions += player_sessions
+        checks += player_checks
+    db.execute(insert(models.TrainingSession), sessions)
+    db.execute(insert(models.WellnessCheck), checks)
+    return team
+
+
+def _seed(engine) -> models.Team:
+    rng = random.Random(7)
+    today = date.today()
+    start = today - timedelta(days=SEED_DAYS)
+    _create_history_partitions(engine, start)
+
+    with Session(engine) as db:
+        team = _add_squad(db, rng, "Plan Test FC", start)
+        for number in range(1, OTHER_CLUBS + 1):
+            _add_squad(db, rng, f"Other Club {number}", start, is_active=False)
+        db.commit()
+        db.refresh(team)
+        db.expunge(team)
+
+    # Fresh statistics on both backends, as after a production ANALYZE (or
+    # SQLite's PRAGMA optimize): the query-plan tests must hold with them
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    return team
+
+
+@pytest.fixture(scope="session")
+def engine():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL not set")
+    engine = create_engine(TEST_DATABASE_URL)
+    configure_sqlite(engine)
+    _reset_schema(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def seeded_team(engine) -> models.Team:
+    return _seed(engine)
+
+
+@pytest.fixture
+def db(engine, seeded_team):
+    """A session whose changes are thrown away after the test."""
+    connection = engine.connect()
+    transaction = connection.begin()
+    if engine.dialect.name == "sqlite":
+        # pysqlite only opens a transaction before DML; without this, what a
+        # test commits (its savepoint released) would stay in the database
+        connection.exec_driver_sql("BEGIN")
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture
+def n_plus_one(request):
+    """
+    Fail the test if one statement shape runs more than `threshold` times.
+
+    Set `n_plus_one.threshold` in the test to tighten it.
+    """
+    with detect_n_plus_one(threshold=10, mode="raise", label=request.node.name) as detector:
+        yield detector
@@ -0,0 +1,123 @@
+"""
+Capture the SQL a piece of code issues and check how the database plans it.
+
+Why EXPLAIN with enable_seqscan off? On a small seeded database a
+sequential scan is often genuinely cheapest, so the planner's normal
+choice says nothing about indexes. With seq scans disabled the planner
+only falls back to one when no index can serve the query - which is
+exactly the regression we want to catch before production data does.
+
+SQLite has no such switch, but EXPLAIN QUERY PLAN reports a full table
+read as "SCAN <table>" (an index-only walk says "USING ... INDEX"). Its
+plans are checked as production makes them: the fixtures ANALYZE the seed
+(sqlite_stat1), and the seed holds enough other clubs that a team's or a
+player's rows are a small share of each table, so an index is the
+planner's own choice.
+"""
+import re
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.db import Base
+
+READ_PREFIXES = ("SELECT", "WITH", "UPDATE", "DELETE")
+# Savepoints come from the test fixtures, not the code under test
+IGNORED_PREFIXES = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+class QueryRecorder:
+    """Statements issued through an engine, with their driver-level parameters."""
+
+    def __init__(self):
+        self.statements: List[Tuple[str, object]] = []
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(IGNORED_PREFIXES):
+            return
+        self.statements.append((statement, parameters))
+
+    @property
+    def reads(self) -> List[Tuple[str, object]]:
+        """Statements worth explaining - INSERTs have no access path to check."""
+        return [
+            (statement, parameters) for statement, parameters in self.statements
+            if statement.lstrip().upper().startswith(READ_PREFIXES)
+        ]
+
+
+@contextmanager
+def record_queries(engine: Engine) -> Iterator[QueryRecorder]:
+    recorder = QueryRecorder()
+    event.listen(engine, "before_cursor_execute", recorder._record)
+    try:
+        yield recorder
+    finally:
+        event.remove(engine, "before_cursor_execute", recorder._record)
+
+
+def _walk(plan: Dict) -> Iterator[Dict]:
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _walk(child)
+
+
+def explain(conn: Connection, statement: str, parameters) -> Dict:
+    """PostgreSQL JSON plan for a captured statement, without running it."""
+    conn.execute(text("SET LOCAL enable_seqscan = off"))
+    result = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+    plan = result.scalar()
+    return plan[0]["Plan"]
+
+
+def explain_sqlite(conn: Connection, statement: str, parameters) -> List[str]:
+    """EXPLAIN QUERY PLAN detail lines, e.g. 'SEARCH players USING INDEX ...'."""
+    result = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    return [row[-1] for row in result]
+
+
+def seq_scans(plan: Dict) -> List[str]:
+    """Relations read with a sequential scan anywhere in the plan."""
+    return [node.get("Relation Name", "?") for node in _walk(plan) if node["Node Type"] == "Seq Scan"]
+
+
+def sqlite_table_scans(details: List[str]) -> List[str]:
+    # CTEs and subqueries are also reported as "SCAN <name>"; only tables
+    # matter, which SQLAlchemy may have aliased as <table>_1
+    return [
+        name for name in (
+            detail.split()[1] for detail in details
+            if detail.startswith("SCAN ") and "INDEX" not in detail
+        )
+        if re.sub(r"_\d+$", "", name) in Base.metadata.tables
+    ]
+
+
+def _full_scans(conn: Connection, statement: str, parameters) -> List[str]:
+    if conn.dialect.name == "sqlite":
+        return sqlite_table_scans(explain_sqlite(conn, statement, parameters))
+    with conn.begin():
+        return seq_scans(explain(conn, statement, parameters))
+
+
+def assert_uses_indexes(engine: Engine, recorder: QueryRecorder) -> None:
+    problems = []
+    with engine.connect() as conn:
+        for statement, parameters in recorder.reads:
+            scans = _full_scans(conn, statement, parameters)
+            if scans:
+                problems.append(f"Seq Scan on {', '.join(scans)}:\n{statement}")
+    assert not problems, "\n\n".join(problems)
+
+
+def assert_within_budget(recorder: QueryRecorder, budget: int, operation: str) -> None:
+    issued = len(recorder)
+    assert issued <= budget, (
+        f"{operation} issued {issued} statements (budget {budget}):\n"
+        + "\n".join(statement for statement, _ in recorder.statements)
+    )
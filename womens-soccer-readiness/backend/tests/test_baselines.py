@@ -0,0 +1,154 @@
+"""
+Running resting HR / HRV baselines: Welford state, z-scores, recommendations.
+"""
+import random
+import statistics
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import false, select
+
+from app import models
+from app.services.baselines import MIN_SAMPLES, BaselineTracker, running_sd, welford_update
+from app.services.readiness_calculator import ReadinessCalculator
+from query_plans import record_queries
+
+
+def test_welford_matches_batch_statistics():
+    rng = random.Random(3)
+    values = [rng.gauss(55, 3) for _ in range(200)]
+
+    count, mean, m2 = 0, 0.0, 0.0
+    for value in values:
+        count, mean, m2 = welford_update(count, mean, m2, value)
+
+    assert count == len(values)
+    assert mean == pytest.approx(statistics.mean(values))
+    assert running_sd(count, m2) == pytest.approx(statistics.stdev(values))
+
+
+def _player(db, team):
+    player = models.Player(team_id=team.team_id, name="Baseline Player", baseline_rhr=55, baseline_hrv=70.0)
+    db.add(player)
+    db.flush()
+    return player
+
+
+def test_observation_cost_does_not_grow_with_history(engine, db, seeded_team):
+    player = _player(db, seeded_team)
+    tracker = BaselineTracker(db)
+    start = date.today() - timedelta(days=40)
+    for offset in range(MIN_SAMPLES):
+        tracker.observe(player.player_id, 'resting_hr', 55 + offset % 3, start + timedelta(days=offset))
+    db.flush()
+
+    counts = []
+    for offset in range(MIN_SAMPLES, MIN_SAMPLES + 20):
+        with record_queries(engine) as recorder:
+            tracker.observe(player.player_id, 'resting_hr', 55 + offset % 3, start + timedelta(days=offset))
+            db.flush()
+        counts.append(len(recorder))
+
+    assert set(counts) == {2}  # read the state row, write it back
+
+
+def test_deviation_is_flagged_and_recommended(db, seeded_team):
+    player = _player(db, seeded_team)
+    tracker = BaselineTracker(db)
+    rng = random.Random(11)
+    today = date.today()
+    for offset in range(30, 0, -1):
+        day = today - timedelta(days=offset)
+        scores = tracker.observe_wellness(player.player_id, day, round(rng.gauss(55, 2)), rng.gauss(70, 5))
+        assert abs(scores['resting_hr_z']) < 4
+
+    scores = tracker.observe_wellness(player.player_id, today, 66, 45.0)
+    db.add(models.WellnessCheck(player_id=player.player_id, date=today, sleep_quality=4,
+                                fatigue=2, soreness=2, stress=2, mood=4,
+                                resting_hr=66, hrv=45.0, **scores))
+    db.flush()
+
+    baseline = db.execute(
+        select(models.MetricBaseline).where(models.MetricBaseline.player_id == player.player_id,
+                                            models.MetricBaseline.metric == 'resting_hr')
+    ).scalar_one()
+    assert baseline.count == 31
+    assert scores['resting_hr_z'] >= 2
+    assert scores['hrv_z'] <= -2
+
+    readiness = ReadinessCalculator(db).calculate_player_readiness(player.player_id, today)
+    assert readiness['details']['resting_hr_z'] == scores['resting_hr_z']
+    assert any("Resting HR" in r for r in readiness['recommendations'])
+    assert any("HRV" in r for r in readiness['recommendations'])
+
+
+def _state(db, player, metric='resting_hr'):
+    baseline = db.execute(
+        select(models.MetricBaseline).where(models.MetricBaseline.player_id == player.player_id,
+                                            models.MetricBaseline.metric == metric)
+    ).scalar_one()
+    return baseline.count, baseline.mean, running_sd(baseline.count, baseline.m2)
+
+
+def test_resubmitted_day_replaces_its_value_and_backfills_are_not_added(db, seeded_team):
+    player = _player(db, seeded_team)
+    tracker = BaselineTracker(db)
+    start = date.today() - timedelta(days=20)
+    values = [54, 57, 55, 58, 53, 56, 55, 59, 54, 56]
+    for offset, value in enumerate(values):
+        tracker.observe(player.player_id, 'resting_hr', value, start + timedelta(days=offset))
+
+    last_day = start + timedelta(days=len(values) - 1)
+    corrected = tracker.observe(player.player_id, 'resting_hr', 70, last_day)
+    assert tracker.observe(player.player_id, 'resting_hr', 60, last_day) < corrected  # same baseline
+    tracker.observe(player.player_id, 'resting_hr', 90, start - timedelta(days=1))
+
+    count, mean, sd = _state(db, player)
+    expected = values[:-1] + [60]
+    assert count == len(expected)
+    assert mean == pytest.approx(statistics.mean(expected))
+    assert sd == pytest.approx(statistics.stdev(expected))
+
+
+def test_resubmitted_day_without_a_value_removes_it(db, seeded_team):
+    player = _player(db, seeded_team)
+    tracker = BaselineTracker(db)
+    start = date.today() - timedelta(days=10)
+    values = [54, 57, 55, 58, 53, 56]
+    for offset, value in enumerate(values):
+        tracker.observe(player.player_id, 'resting_hr', value, start + timedelta(days=offset))
+
+    last_day = start + timedelta(days=len(values) - 1)
+    assert tracker.observe(player.player_id, 'resting_hr', None, last_day) is None
+    count, mean, sd = _state(db, player)
+    assert count == len(values) - 1
+    assert mean == pytest.approx(statistics.mean(values[:-1]))
+    assert sd == pytest.approx(statistics.stdev(values[:-1]))
+
+    # Resubmitting the value again adds it once
+    tracker.observe(player.player_id, 'resting_hr', 60, last_day)
+    assert _state(db, player)[:2] == (len(values), pytest.approx(statistics.mean(values[:-1] + [60])))
+
+
+def test_first_measurement_survives_a_concurrent_first_insert(db, seeded_team, monkeypatch):
+    player = _player(db, seeded_team)
+    execute = db.execute
+    lookups = []
+
+    def execute_racing_another_request(statement, *args, **kwargs):
+        if getattr(statement, 'is_select', False) and not lookups:
+            lookups.append(execute(statement, *args, **kwargs).scalar_one_or_none())
+            # The other request's first measurement lands right after our lookup
+            db.add(models.MetricBaseline(player_id=player.player_id, metric='resting_hr', count=1,
+                                         mean=50.0, m2=0.0, last_value=50.0,
+                                         last_date=date.today() - timedelta(days=1)))
+            db.flush()
+            return execute(statement.where(false()), *args, **kwargs)
+        return execute(statement, *args, **kwargs)
+
+    monkeypatch.setattr(db, 'execute', execute_racing_another_request)
+    BaselineTracker(db).observe(player.player_id, 'resting_hr', 56, date.today())
+    monkeypatch.undo()
+
+    assert lookups == [None]
+    assert _state(db, player)[:2] == (2, 53.0)
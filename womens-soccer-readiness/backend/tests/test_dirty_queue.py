@@ -0,0 +1,101 @@
+"""
+Incremental recompute: only queued players are rescored, and the result
+matches a full refresh of the same days.
+"""
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app import models
+from app.services.dirty_queue import SESSION_REACH_DAYS, DirtyQueue
+from app.services.readiness_calculator import ReadinessCalculator
+
+
+DAY = date.today() - timedelta(days=5)
+
+
+def _stored_scores(db, day):
+    return dict(db.execute(
+        select(models.ReadinessScore.player_id, models.ReadinessScore.overall_score)
+        .where(models.ReadinessScore.date == day)
+    ).all())
+
+
+def test_marks_merge_into_one_range_per_player(db, seeded_team):
+    player_id = db.execute(
+        select(models.Player.player_id).where(models.Player.team_id == seeded_team.team_id)
+    ).scalars().first()
+    queue = DirtyQueue(db)
+    queue.mark_sessions([(player_id, DAY), (player_id, DAY - timedelta(days=3))])
+    queue.mark_wellness(player_id, DAY - timedelta(days=10))
+
+    row = db.execute(
+        select(models.DirtyReadinessRange).where(models.DirtyReadinessRange.player_id == player_id)
+    ).scalar_one()
+    assert (row.start_date, row.end_date) == (DAY - timedelta(days=10), DAY + timedelta(days=SESSION_REACH_DAYS))
+    assert queue.pending() == 1
+
+
+def test_recompute_rescores_only_dirty_players(db, seeded_team):
+    calculator = ReadinessCalculator(db)
+    days = [DAY - timedelta(days=2), DAY]
+    for day in days:
+        calculator.refresh_team_day(seeded_team.team_id, day)
+    before = {day: _stored_scores(db, day) for day in days}
+
+    # A heavy session the day before the first scored day
+    player_id = next(iter(before[DAY]))
+    session_day = days[0] - timedelta(days=1)
+    db.add(models.TrainingSession(
+        player_id=player_id, date=session_day, session_type="match",
+        duration_min=95, training_load=2500,
+    ))
+    queue = DirtyQueue(db)
+    queue.mark_sessions([(player_id, session_day)])
+    db.commit()
+
+    totals = queue.recompute(until=DAY)
+    assert totals == {'players': 1, 'player_days': 2, 'team_days': 2}
+    # The session reaches SESSION_REACH_DAYS past it: the days after DAY wait for later runs
+    row = db.execute(select(models.DirtyReadinessRange)).scalar_one()
+    assert (row.start_date, row.end_date) == (DAY + timedelta(days=1), session_day + timedelta(days=SESSION_REACH_DAYS))
+    assert queue.recompute(until=DAY)['players'] == 0
+
+    for day in days:
+        after = _stored_scores(db, day)
+        assert after[player_id] != before[day][player_id]
+        assert {p: s for p, s in after.items() if p != player_id} == \
+            {p: s for p, s in before[day].items() if p != player_id}
+        assert after[player_id] == calculator.calculate_player_readiness(player_id, day)['overall_score']
+
+        summary = db.get(models.TeamDailySummary, (seeded_team.team_id, day))
+        expected = calculator.calculate_team_readiness(seeded_team.team_id, day)
+        assert summary.average_readiness == pytest.approx(expected['average_readiness'])
+        assert (summary.green_count, summary.yellow_count, summary.red_count) == \
+            (expected['green_count'], expected['yellow_count'], expected['red_count'])
+
+
+def test_days_after_until_are_rescored_by_a_later_run(db, seeded_team, monkeypatch):
+    rebuilt = []
+    monkeypatch.setattr(DirtyQueue, '_rebuild_cubes', lambda self, team_ids: rebuilt.append(team_ids))
+    calculator = ReadinessCalculator(db)
+    later_day = DAY + timedelta(days=2)
+    calculator.refresh_team_day(seeded_team.team_id, later_day)
+    player_id = next(iter(_stored_scores(db, later_day)))
+
+    db.add(models.TrainingSession(player_id=player_id, date=DAY, session_type="match",
+                                  duration_min=95, training_load=2500))
+    queue = DirtyQueue(db)
+    queue.mark_sessions([(player_id, DAY)])
+    db.commit()
+
+    assert queue.recompute(until=DAY + timedelta(days=1))['player_days'] == 0
+    assert rebuilt == [set()]  # nothing rescored, no cube to rebuild
+    assert _stored_scores(db, later_day)[player_id] != \
+        calculator.calculate_player_readiness(player_id, later_day)['overall_score']
+
+    assert queue.recompute(until=later_day)['player_days'] == 1
+    assert rebuilt[-1] == {seeded_team.team_id}
+    assert _stored_scores(db, later_day)[player_id] == \
+        calculator.calculate_player_readiness(player_id, later_day)['overall_score']
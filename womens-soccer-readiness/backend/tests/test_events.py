@@ -0,0 +1,135 @@
+"""
+Readiness flag events: recorded when a stored flag changes, relayed to the
+team's SSE subscribers once committed - never by read-only previews.
+"""
+import asyncio
+from datetime import date, timedelta
+
+from sqlalchemy import func, select, text, update
+
+from app import models
+from app.services.events import EventBroker, FlagEventRelay, prune_flag_events
+from app.services.polar_parser import PolarCSVParser
+from app.services.readiness_calculator import ReadinessCalculator
+from app.sql import hours_ago
+
+DAY = date.today() - timedelta(days=2)
+
+
+def _cursor(db) -> int:
+    """The newest event id before the test: what earlier tests left is not ours."""
+    return db.execute(select(func.coalesce(func.max(models.FlagEvent.event_id), 0))).scalar_one()
+
+
+def _events(db, team_id, after: int):
+    return db.execute(
+        select(models.FlagEvent)
+        .where(models.FlagEvent.team_id == team_id, models.FlagEvent.date == DAY,
+               models.FlagEvent.event_id > after)
+        .order_by(models.FlagEvent.event_id)
+    ).scalars().all()
+
+
+def _relayed(relay, db, team_id):
+    """Events a subscriber of the team receives from one poll."""
+    async def scenario():
+        queue = relay.broker.subscribe(str(team_id))
+        relay.poll(db)
+        await asyncio.sleep(0)  # let call_soon_threadsafe deliver
+        return [queue.get_nowait() for _ in range(queue.qsize())]
+    return asyncio.run(scenario())
+
+
+def test_previews_record_nothing(db, seeded_team):
+    cursor = _cursor(db)
+    ReadinessCalculator(db).calculate_team_readiness(seeded_team.team_id, DAY)
+    assert _events(db, seeded_team.team_id, cursor) == []
+
+
+def test_only_changed_stored_flags_are_recorded(db, seeded_team):
+    cursor = _cursor(db)
+    calculator = ReadinessCalculator(db)
+    summary = calculator.refresh_team_day(seeded_team.team_id, DAY)
+    first = _events(db, seeded_team.team_id, cursor)
+    assert len(first) == summary['player_count']
+    assert all(event.previous_flag is None and event.date == DAY for event in first)
+
+    calculator.refresh_team_day(seeded_team.team_id, DAY)
+    assert len(_events(db, seeded_team.team_id, cursor)) == len(first)  # same flags: nothing new
+
+    changed = first[0]
+    stale = next(flag for flag in ('green', 'yellow', 'red') if flag != changed.flag)
+    db.execute(
+        update(models.ReadinessScore)
+        .where(models.ReadinessScore.player_id == changed.player_id, models.ReadinessScore.date == DAY)
+        .values(readiness_flag=stale)
+    )
+    # Another day's score is not a transition of this one
+    calculator.refresh_players_day([changed.player_id], DAY - timedelta(days=1), seeded_team.team_id)
+    calculator.refresh_players_day([changed.player_id], DAY, seeded_team.team_id)
+    latest = _events(db, seeded_team.team_id, cursor)[-1]
+    assert (latest.player_id, latest.date, latest.previous_flag, latest.flag) == \
+        (changed.player_id, DAY, stale, changed.flag)
+
+
+def test_relay_publishes_committed_events_once(db, seeded_team):
+    relay = FlagEventRelay(None, EventBroker())
+    assert _relayed(relay, db, seeded_team.team_id) == []  # first poll only finds the end
+
+    summary = ReadinessCalculator(db).refresh_team_day(seeded_team.team_id, DAY)
+    events = _relayed(relay, db, seeded_team.team_id)
+    assert len(events) == summary['player_count']
+    assert {event['event'] for event in events} == {'readiness_flag'}
+    assert events[0]['data']['date'] == DAY and events[0]['data']['previous_flag'] is None
+    assert _relayed(relay, db, seeded_team.team_id) == []
+
+
+def test_relay_picks_up_ids_committed_out_of_order(db, seeded_team):
+    relay = FlagEventRelay(None, EventBroker())
+    relay.poll(db)
+    cursor = relay.cursor
+    player_id = db.execute(
+        select(models.Player.player_id).where(models.Player.team_id == seeded_team.team_id).limit(1)
+    ).scalar_one()
+
+    def add(event_id):
+        db.add(models.FlagEvent(event_id=event_id, team_id=seeded_team.team_id, player_id=player_id,
+                                date=DAY, flag='red'))
+        db.flush()
+
+    add(cursor + 2)  # committed first, by the shorter transaction
+    assert len(_relayed(relay, db, seeded_team.team_id)) == 1
+    add(cursor + 1)
+    assert [event['data']['flag'] for event in _relayed(relay, db, seeded_team.team_id)] == ['red']
+    assert relay.cursor == cursor + 2 and not relay._gaps
+
+
+def test_imports_are_relayed_from_the_outbox(db, seeded_team, tmp_path):
+    relay = FlagEventRelay(None, EventBroker())
+    relay.poll(db)
+    export = tmp_path / "polar_export.csv"
+    export.write_text("Date,Name,Duration,Distance,HR Average,HR Max,Training Load\n"
+                      f"{DAY},Player 1,01:10:00,6.0,150,185,300\n")
+
+    parser = PolarCSVParser(db, seeded_team.team_id)
+    assert parser.parse_csv(str(export))['success']
+    assert parser.commit_sessions()
+
+    events = _relayed(relay, db, seeded_team.team_id)
+    assert [(event['event'], event['data']['sessions_count']) for event in events] == [('import_completed', 1)]
+
+
+def test_prune_uses_the_database_clock(db, seeded_team):
+    if db.get_bind().dialect.name == "postgresql":
+        # created_at defaults to now() in the server's zone, not UTC
+        db.execute(text("SET LOCAL TIME ZONE 'Etc/GMT+12'"))
+    cursor = _cursor(db)
+    for _ in range(2):
+        db.add(models.FlagEvent(team_id=seeded_team.team_id, event_type='import_completed', data={}))
+    db.flush()
+    old = db.execute(select(func.max(models.FlagEvent.event_id))).scalar_one()
+    db.execute(update(models.FlagEvent).where(models.FlagEvent.event_id == old).values(created_at=hours_ago(30)))
+
+    assert prune_flag_events(db, 6) >= 1
+    left = db.execute(select(models.FlagEvent.event_id).where(models.FlagEvent.event_id > cursor)).scalars().all()
+    assert left == [old - 1]
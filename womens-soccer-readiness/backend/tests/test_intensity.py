@@ -0,0 +1,78 @@
+"""
+HR-zone minutes: filled by the Polar import, summed per player in SQL.
+"""
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app import models
+from app.services.intensity import IntensityService, zone_minutes_from_shares
+from app.services.polar_parser import PolarCSVParser
+from query_plans import record_queries
+
+
+DAY = date.today() - timedelta(days=1)
+
+POLAR_CSV = """Date,Name,Duration,Distance,HR Average,HR Max,Training Load,Time in HR zone 1 (50 - 59 %),Time in HR zone 2 (60 - 69 %),Time in HR zone 3 (70 - 79 %),Time in HR zone 4 (80 - 89 %),Time in HR zone 5 (90 - 100 %)
+{day},Zone Player,01:30:00,7.1,151,186,330,00:10:00,00:20:30,00:30:00,00:18:00,00:06:00
+{day},Zone Player,00:40:00,3.0,128,165,90,00:25:00,00:10:00,,,
+"""
+
+
+def test_shares_become_minutes():
+    minutes = zone_minutes_from_shares({"zone1": 10, "zone2": 30, "zone3": 25, "zone4": 20, "zone5": 15}, 90)
+    assert minutes == {"hr_zone1_min": 9.0, "hr_zone2_min": 27.0, "hr_zone3_min": 22.5,
+                       "hr_zone4_min": 18.0, "hr_zone5_min": 13.5}
+    assert set(zone_minutes_from_shares({"zone1": 10}, None).values()) == {None}
+
+
+def test_polar_import_fills_zone_minutes(db, seeded_team, tmp_path):
+    path = tmp_path / "polar_zones.csv"
+    path.write_text(POLAR_CSV.format(day=DAY))
+    parser = PolarCSVParser(db, seeded_team.team_id)
+    assert parser.parse_csv(str(path))['success']
+    db.flush()
+
+    sessions = db.execute(
+        select(models.TrainingSession)
+        .join(models.Player, models.Player.player_id == models.TrainingSession.player_id)
+        .where(models.Player.name == "Zone Player")
+        .order_by(models.TrainingSession.duration_min.desc())
+    ).scalars().all()
+    zones = [[s.hr_zone1_min, s.hr_zone2_min, s.hr_zone3_min, s.hr_zone4_min, s.hr_zone5_min] for s in sessions]
+    assert zones == [[10.0, 20.5, 30.0, 18.0, 6.0], [25.0, 10.0, None, None, None]]
+
+
+def test_distribution_sums_in_one_query(engine, db, seeded_team):
+    players = db.execute(
+        select(models.Player).where(models.Player.team_id == seeded_team.team_id).order_by(models.Player.name)
+    ).scalars().all()
+    start = DAY - timedelta(days=6)
+    sessions = db.execute(
+        select(models.TrainingSession)
+        .where(models.TrainingSession.player_id.in_([p.player_id for p in players]),
+               models.TrainingSession.date >= start, models.TrainingSession.date <= DAY)
+    ).scalars().all()
+    for number, session in enumerate(sessions):
+        if number % 5:  # every fifth session has no breakdown
+            minutes = zone_minutes_from_shares({"zone1": 10, "zone2": 30, "zone3": 30, "zone4": 20, "zone5": 10},
+                                               session.duration_min)
+            for column, value in minutes.items():
+                setattr(session, column, value)
+    db.flush()
+
+    with record_queries(engine) as recorder:
+        report = IntensityService(db).team_distribution(seeded_team.team_id, start, DAY)
+    assert len(recorder) == 1
+
+    by_player = {entry['player_id']: entry for entry in report['players']}
+    for player in players:
+        own = [s for s in sessions if s.player_id == player.player_id]
+        entry = by_player[player.player_id]
+        assert entry['sessions'] == len(own)
+        assert entry['sessions_without_zones'] == sum(1 for s in own if s.hr_zone1_min is None)
+        high = sum((s.hr_zone4_min or 0) + (s.hr_zone5_min or 0) for s in own)
+        assert entry['high_intensity_minutes'] == pytest.approx(high, abs=0.1)
+    assert report['team']['sessions'] == len(sessions)
+    assert report['team']['high_intensity_share'] == pytest.approx(0.3, abs=0.01)
@@ -0,0 +1,79 @@
+"""
+The N+1 detector: statement shapes, where a loop is reported, and the
+store-backed team refresh staying free of per-player queries.
+"""
+from datetime import date, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select, text
+
+from app import models
+from app.nplusone import (NPlusOneError, NPlusOneMiddleware, NPlusOneWarning, detect_n_plus_one,
+                          statement_shape)
+from app.services.readiness_calculator import ReadinessCalculator
+from app.services.season_store import SeasonStore
+
+
+def test_shapes_ignore_parameters_and_list_lengths():
+    assert statement_shape("SELECT * FROM t WHERE id IN (%(id_1_1)s, %(id_1_2)s) AND d = %(d_1)s") == \
+        statement_shape("SELECT * FROM t\n WHERE id IN (%(id_1_1)s) AND d = %(d_1)s")
+    assert statement_shape("INSERT INTO t (a, b) VALUES (?, ?), (?, ?)") == \
+        statement_shape("INSERT INTO t (a, b) VALUES (?, ?)")
+    assert statement_shape("SELECT a FROM t") != statement_shape("SELECT b FROM t")
+
+
+def _scores_one_by_one(db, player_ids):
+    for player_id in player_ids:
+        db.execute(select(models.Player.name).where(models.Player.player_id == player_id)).one()
+
+
+def test_loop_is_reported_at_its_line(db, seeded_team):
+    player_ids = db.execute(
+        select(models.Player.player_id).where(models.Player.team_id == seeded_team.team_id)
+    ).scalars().all()
+
+    with pytest.raises(NPlusOneError, match=r"tests/test_nplusone.py:\d+ in _scores_one_by_one"):
+        with detect_n_plus_one(threshold=3):
+            _scores_one_by_one(db, player_ids)
+
+    with pytest.warns(NPlusOneWarning):
+        with detect_n_plus_one(threshold=3, mode="warn") as detector:
+            _scores_one_by_one(db, player_ids)
+    assert detector.violations and list(detector.violations.values())[0].count == len(player_ids)
+
+
+def test_store_backed_team_refresh_has_no_per_player_queries(db, seeded_team, n_plus_one):
+    n_plus_one.threshold = 2
+    day = date.today() - timedelta(days=1)
+    store = SeasonStore.load_days(db, seeded_team.team_id, day, day)
+    ReadinessCalculator(db, store=store).refresh_team_day(seeded_team.team_id, day)
+
+
+def test_middleware_fails_the_response_before_it_is_sent():
+    engine = create_engine("sqlite://")
+    app = FastAPI()
+    app.add_middleware(NPlusOneMiddleware, threshold=2, mode="raise")
+
+    @app.get("/swallowed")
+    def swallowed():
+        with engine.connect() as conn:
+            for n in range(4):
+                try:
+                    conn.execute(text("SELECT :n"), {"n": n})
+                except NPlusOneError:
+                    pass  # a route that catches too broadly
+        return {"ok": True}
+
+    @app.get("/fine")
+    def fine():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return {"ok": True}
+
+    client = TestClient(app)
+    response = client.get("/swallowed")
+    assert response.status_code == 500
+    assert "N+1 queries in GET /swallowed" in response.json()["detail"]
+    assert client.get("/fine").json() == {"ok": True}
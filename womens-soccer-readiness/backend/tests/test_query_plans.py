@@ -0,0 +1,129 @@
+"""
+Query-plan regression tests for the readiness engine and the Polar importer.
+
+Each test records every statement an operation issues against the seeded
+database, then checks two things:
+- no statement needs a sequential scan (see query_plans.py), and
+- the operation stays within its statement budget.
+
+Budgets are deliberately tight. If a change legitimately needs more
+queries, raise the budget in the same PR so reviewers see it.
+"""
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import func, select
+
+from app import models
+from app.services.polar_parser import PolarCSVParser
+from app.services.readiness_calculator import ReadinessCalculator
+from app.services.trends import TeamTrendsService
+from query_plans import assert_uses_indexes, assert_within_budget, record_queries
+
+# Statements per operation
+PLAYER_READINESS_BUDGET = 3          # ACWR window, latest wellness, last session
+TEAM_READINESS_BUDGET_BASE = 1       # active players, then the per-player budget each
+TEAM_REFRESH_BUDGET_EXTRA = 6        # delete + insert scores, flag events, load and wellness totals, summary upsert
+POLAR_IMPORT_BUDGET_PER_PLAYER = 2   # name lookup, player insert when new
+POLAR_IMPORT_BUDGET_BASE = 2         # import_hash lookup for the whole file, batched session insert
+TEAM_TRENDS_BUDGET = 1               # the whole date range, every position
+
+POLAR_CSV = """Date,Name,Duration,Distance,HR Average,HR Max,Training Load
+{d1},Player 1,01:15:00,6.2,148,182,310
+{d1},Player 2,00:25:00,2.1,120,160,80
+{d2},Player 1,01:35:00,8.4,152,188,360
+{d2},New Signing,01:05:00,5.9,145,179,240
+"""
+
+
+@pytest.fixture
+def polar_csv(tmp_path):
+    today = date.today()
+    path = tmp_path / "polar_export.csv"
+    path.write_text(POLAR_CSV.format(d1=today - timedelta(days=2), d2=today - timedelta(days=1)))
+    return path
+
+
+def _first_player(db, team):
+    return db.execute(
+        select(models.Player).where(models.Player.team_id == team.team_id).limit(1)
+    ).scalar_one()
+
+
+def test_player_readiness_uses_indexes(engine, db, seeded_team):
+    player = _first_player(db, seeded_team)
+    calculator = ReadinessCalculator(db)
+
+    with record_queries(engine) as recorder:
+        readiness = calculator.calculate_player_readiness(player.player_id, date.today())
+
+    assert readiness['flag'] in ('green', 'yellow', 'red')
+    assert_within_budget(recorder, PLAYER_READINESS_BUDGET, "calculate_player_readiness")
+    assert_uses_indexes(engine, recorder)
+
+
+def test_team_readiness_uses_indexes(engine, db, seeded_team):
+    calculator = ReadinessCalculator(db)
+
+    with record_queries(engine) as recorder:
+        team = calculator.calculate_team_readiness(seeded_team.team_id, date.today())
+
+    budget = TEAM_READINESS_BUDGET_BASE + team['player_count'] * PLAYER_READINESS_BUDGET
+    assert team['player_count'] > 0
+    assert_within_budget(recorder, budget, "calculate_team_readiness")
+    assert_uses_indexes(engine, recorder)
+
+
+def test_team_refresh_uses_indexes(engine, db, seeded_team):
+    calculator = ReadinessCalculator(db)
+
+    with record_queries(engine) as recorder:
+        summary = calculator.refresh_team_day(seeded_team.team_id, date.today() - timedelta(days=1))
+
+    budget = (TEAM_READINESS_BUDGET_BASE + summary['player_count'] * PLAYER_READINESS_BUDGET
+              + TEAM_REFRESH_BUDGET_EXTRA)
+    assert summary['wellness_count'] == summary['player_count']
+    assert_within_budget(recorder, budget, "refresh_team_day")
+    assert_uses_indexes(engine, recorder)
+
+
+def test_team_trends_is_one_query(engine, db, seeded_team):
+    end = date.today() - timedelta(days=1)
+
+    with record_queries(engine) as recorder:
+        trends = TeamTrendsService(db).team_trends(seeded_team.team_id, end - timedelta(days=29), end)
+
+    assert len(trends['team']['acwr_p50']) == len(trends['dates']) == 30
+    assert_within_budget(recorder, TEAM_TRENDS_BUDGET, "team_trends")
+    assert_uses_indexes(engine, recorder)
+
+
+def test_polar_import_uses_indexes(engine, db, seeded_team, polar_csv):
+    parser = PolarCSVParser(db, seeded_team.team_id)
+
+    with record_queries(engine) as recorder:
+        result = parser.parse_csv(str(polar_csv))
+        db.flush()
+
+    assert result['success'], result
+    budget = result['players_count'] * POLAR_IMPORT_BUDGET_PER_PLAYER + POLAR_IMPORT_BUDGET_BASE
+    assert_within_budget(recorder, budget, "PolarCSVParser.parse_csv")
+    assert_uses_indexes(engine, recorder)
+
+
+def test_polar_reimport_skips_known_sessions(engine, db, seeded_team, polar_csv):
+    def imported_count():
+        return db.execute(
+            select(func.count()).select_from(models.TrainingSession)
+            .where(models.TrainingSession.import_hash.is_not(None))
+        ).scalar_one()
+
+    PolarCSVParser(db, seeded_team.team_id).parse_csv(str(polar_csv))
+    db.flush()
+    first = imported_count()
+
+    PolarCSVParser(db, seeded_team.team_id).parse_csv(str(polar_csv))
+    db.flush()
+
+    assert first == 4
+    assert imported_count() == first
@@ -0,0 +1,271 @@
+"""
+Golden equivalence: every way of producing readiness must agree exactly
+with calculate_player_readiness, on randomized histories that hit the
+edge cases - gaps, same-day sessions, missing or blank wellness, zero
+chronic load, a return from absence, sessions scored by sRPE only.
+
+Paths compared, per player-day:
+  per-player  ReadinessCalculator.calculate_player_readiness (the reference)
+  team        calculate_team_readiness
+  store       calculate_team_readiness over a SeasonStore
+  cube        the same over a memory-mapped season cube
+  stored      refresh_team_day rows, as the nightly scheduler writes them
+  recompute   DirtyQueue.recompute after late data (our backfill path)
+
+More seeds: EQUIVALENCE_SEEDS=1,2,3,4,5. Timings print with `pytest -s`.
+"""
+import os
+import random
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app import models
+from app.config import settings
+from app.services.baselines import BaselineTracker
+from app.services.dirty_queue import DirtyQueue
+from app.services.readiness_calculator import ReadinessCalculator
+from app.services.season_cube import SeasonCubeService, open_cube
+from app.services.season_store import SeasonStore
+
+
+SEEDS = [int(seed) for seed in os.getenv("EQUIVALENCE_SEEDS", "1,2,3").split(",")]
+
+LAST_DAY = date.today() - timedelta(days=1)
+FIRST_DAY = LAST_DAY - timedelta(days=13)
+HISTORY_START = FIRST_DAY - timedelta(days=35)
+
+# As in database/seed_data.py
+SESSION_TYPES = ["training", "match", "recovery"]
+CYCLE_PHASES = ["menstrual", "follicular", "ovulation", "luteal"]
+
+# Per profile: P(session on a day), P(second session that day), P(session
+# without a device load - sRPE then, if it has an RPE), P(wellness check),
+# P(check with no answers)
+PROFILES = {
+    "regular": (0.85, 0.10, 0.05, 0.90, 0.05),
+    "doubles": (0.80, 0.60, 0.05, 0.85, 0.05),
+    "gap": (0.90, 0.20, 0.00, 0.80, 0.05),
+    "zero_chronic": (0.70, 0.20, 1.00, 0.90, 0.00),
+    "spike": (0.75, 0.20, 0.00, 0.90, 0.05),
+    "no_wellness": (0.85, 0.10, 0.10, 0.00, 0.00),
+    "sparse_wellness": (0.60, 0.10, 0.10, 0.35, 0.30),
+    "new": (0.00, 0.00, 0.00, 0.00, 0.00),
+}
+
+
+def _history_days():
+    return [HISTORY_START + timedelta(days=offset) for offset in range((LAST_DAY - HISTORY_START).days + 1)]
+
+
+def _scored_days():
+    return [FIRST_DAY + timedelta(days=offset) for offset in range((LAST_DAY - FIRST_DAY).days + 1)]
+
+
+def _session(rng, player, profile, day, none_load_p):
+    session_type = rng.choice(SESSION_TYPES)
+    duration = rng.randint(60, 120) if session_type == "training" else rng.randint(90, 110)
+    avg_hr = rng.randint(130, 170)
+    rpe = rng.randint(4, 9) if rng.random() > 0.3 else None
+    if rng.random() < none_load_p:
+        load = None if profile != "zero_chronic" or rng.random() < 0.5 else 0.0
+        if profile == "zero_chronic":
+            rpe = None
+    else:
+        load = round(duration * avg_hr / player.max_hr * rng.uniform(0.8, 1.2), 2)
+        if profile == "spike" and day > LAST_DAY - timedelta(days=10):
+            load *= 3
+    return models.TrainingSession(
+        player_id=player.player_id, date=day, session_type=session_type, duration_min=duration,
+        distance_m=rng.uniform(3000, 8000) if rng.random() > 0.2 else None,
+        high_speed_running_m=rng.uniform(500, 2000) if rng.random() > 0.2 else None,
+        sprint_distance_m=rng.uniform(100, 500) if rng.random() > 0.3 else None,
+        accelerations=rng.randint(20, 60) if rng.random() > 0.2 else None,
+        avg_hr=avg_hr if rng.random() > 0.2 else None, max_hr=rng.randint(170, player.max_hr),
+        training_load=load, rpe=rpe,
+    )
+
+
+def _check(rng, tracker, player, day, blank_p):
+    if rng.random() < blank_p:
+        answers = dict.fromkeys(("sleep_quality", "soreness", "fatigue", "stress", "mood"))
+    else:
+        # Players skip questions now and then
+        answers = {name: (rng.randint(1, 5) if rng.random() > 0.15 else None)
+                   for name in ("sleep_quality", "soreness", "fatigue", "stress", "mood")}
+    resting_hr = round(rng.gauss(player.baseline_rhr or 58, 2.5)) if rng.random() > 0.25 else None
+    hrv = max(5.0, rng.gauss(player.baseline_hrv or 60, 7)) if rng.random() > 0.25 else None
+    return models.WellnessCheck(
+        player_id=player.player_id, date=day, **answers,
+        cycle_phase=rng.choice(CYCLE_PHASES) if rng.random() > 0.3 else None,
+        resting_hr=resting_hr, hrv=hrv,
+        **tracker.observe_wellness(player.player_id, day, resting_hr, hrv),
+    )
+
+
+def _generate_team(db, seed):
+    """A squad with one player per profile plus a few random ones; {player_id: profile}."""
+    rng = random.Random(seed)
+    team = models.Team(name=f"Equivalence FC {seed}", level="college")
+    db.add(team)
+    db.flush()
+
+    profiles = list(PROFILES) + [rng.choice(list(PROFILES)) for _ in range(4)]
+    players = {}
+    tracker = BaselineTracker(db)
+    for number, profile in enumerate(profiles, start=1):
+        player = models.Player(
+            team_id=team.team_id, name=f"{profile} {number}", position=rng.choice(["GK", "DEF", "MID", "FWD"]),
+            jersey_number=number, max_hr=rng.randint(185, 200),
+            # Some players have no coach-entered baselines: no z-scores during warm-up
+            baseline_rhr=rng.randint(50, 70) if rng.random() > 0.3 else None,
+            baseline_hrv=rng.uniform(40, 80) if rng.random() > 0.3 else None,
+        )
+        db.add(player)
+        db.flush()
+        players[player.player_id] = profile
+
+        session_p, double_p, none_load_p, check_p, blank_p = PROFILES[profile]
+        absent_from = HISTORY_START + timedelta(days=5)
+        back_on = LAST_DAY - timedelta(days=3)
+        for day in _history_days():
+            if profile == "gap" and absent_from <= day < back_on:
+                continue
+            if rng.random() < session_p:
+                db.add(_session(rng, player, profile, day, none_load_p))
+                if rng.random() < double_p:
+                    db.add(_session(rng, player, profile, day, none_load_p))
+            if rng.random() < check_p:
+                db.add(_check(rng, tracker, player, day, blank_p))
+
+    # Left out of every team path
+    db.add(models.Player(team_id=team.team_id, name="inactive", is_active=False))
+    db.flush()
+    return team, players
+
+
+@contextmanager
+def _timed(timings, path):
+    started = time.perf_counter()
+    yield
+    timings[path] = timings.get(path, 0.0) + (time.perf_counter() - started) * 1000
+
+
+def _by_player(scores):
+    return {score['player_id']: score for score in scores}
+
+
+def _assert_same(path, players, day, actual, expected):
+    assert set(actual) == set(expected), f"{path} {day}: different players"
+    for player_id, want in expected.items():
+        got = actual[player_id]
+        where = f"{path} {players[player_id]} {day}"
+        assert got['overall_score'] == want['overall_score'], where
+        assert got['flag'] == want['flag'], where
+        assert got['components'] == want['components'], where
+        assert got['details'] == want['details'], where
+        assert got['workload'] == want['workload'], where
+        assert got['recommendations'] == want['recommendations'], where
+
+
+def _assert_stored(path, db, players, day, expected):
+    rows = {row.player_id: row for row in db.execute(
+        select(models.ReadinessScore).where(models.ReadinessScore.player_id.in_(list(players)),
+                                            models.ReadinessScore.date == day)
+    ).scalars()}
+    assert set(rows) == set(expected), f"{path} {day}: different players"
+    for player_id, want in expected.items():
+        row = rows[player_id]
+        where = f"{path} {players[player_id]} {day}"
+        assert row.overall_score == want['overall_score'], where
+        assert row.readiness_flag == want['flag'], where
+        assert (row.acwr, row.training_load_score, row.wellness_score, row.recovery_score) == (
+            want['components']['acwr'], want['components']['acwr_normalized'],
+            want['components']['wellness'], want['components']['recovery']), where
+        assert (row.acute_load, row.chronic_load) == (want['details']['acute_load'],
+                                                      want['details']['chronic_load']), where
+        assert row.recommendations == want['recommendations'], where
+
+
+def _reference(db, players, timings):
+    calculator = ReadinessCalculator(db)
+    with _timed(timings, "per-player"):
+        return {day: {player_id: calculator.calculate_player_readiness(player_id, day) for player_id in players}
+                for day in _scored_days()}
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_every_readiness_path_matches_per_player(db, tmp_path, monkeypatch, seed):
+    monkeypatch.setattr(settings, "cube_dir", str(tmp_path))
+    team, players = _generate_team(db, seed)
+    team_id = team.team_id
+    timings = {}
+    expected = _reference(db, players, timings)
+
+    # The edge cases actually came up
+    details = [score['details'] for scores in expected.values() for score in scores.values()]
+    assert any(d['chronic_load'] == 0 and d['days_since_last_session'] == 0 for d in details)  # no sessions
+    assert any(score['components']['acwr'] >= 1.5 for scores in expected.values() for score in scores.values())
+    assert any(d['resting_hr_z'] is None for d in details) and any(d['hrv_z'] is not None for d in details)
+    workloads = [score['workload'] for scores in expected.values() for score in scores.values()]
+    assert any(w['monotony'] is None for w in workloads) and any(w['monotony'] is not None for w in workloads)
+    assert any(w['acwr']['sprint_distance'] is not None for w in workloads)
+
+    with _timed(timings, "team"):
+        calculator = ReadinessCalculator(db)
+        team_scores = {day: _by_player(calculator.calculate_team_readiness(team_id, day)['player_scores'])
+                       for day in _scored_days()}
+    with _timed(timings, "store"):
+        calculator = ReadinessCalculator(db, store=SeasonStore.load_days(db, team_id, FIRST_DAY, LAST_DAY))
+        store_scores = {day: _by_player(calculator.calculate_team_readiness(team_id, day)['player_scores'])
+                        for day in _scored_days()}
+    with _timed(timings, "cube"):
+        cubes = SeasonCubeService(db, season_start_month=FIRST_DAY.month)
+        cube = open_cube(cubes.rebuild(team_id, LAST_DAY), team_id)
+        calculator = ReadinessCalculator(db, store=cube)
+        cube_scores = {day: _by_player(calculator.calculate_team_readiness(team_id, day)['player_scores'])
+                       for day in _scored_days()}
+    for day in _scored_days():
+        _assert_same("team", players, day, team_scores[day], expected[day])
+        _assert_same("store", players, day, store_scores[day], expected[day])
+        _assert_same("cube", players, day, cube_scores[day], expected[day])
+
+    # What the scheduler's workers do for each night
+    with _timed(timings, "stored"):
+        for day in _scored_days():
+            store = SeasonStore.load_days(db, team_id, day, day)
+            ReadinessCalculator(db, store=store).refresh_team_day(team_id, day)
+    for day in _scored_days():
+        _assert_stored("stored", db, players, day, expected[day])
+
+    # Late data: an import of past sessions and a corrected check, then the
+    # dirty-range recompute instead of a full refresh
+    rng = random.Random(seed + 1000)
+    queue = DirtyQueue(db)
+    late = []
+    for player_id in rng.sample(list(players), 4):
+        day = rng.choice(_scored_days())
+        db.add(models.TrainingSession(player_id=player_id, date=day, session_type="match",
+                                      duration_min=95, training_load=rng.uniform(300, 900)))
+        late.append((player_id, day))
+    check = db.execute(
+        select(models.WellnessCheck)
+        .where(models.WellnessCheck.player_id.in_(list(players)), models.WellnessCheck.date == FIRST_DAY)
+    ).scalars().first()
+    check.fatigue, check.soreness = 5, 5
+    queue.mark_sessions(late)
+    queue.mark_wellness(check.player_id, check.date)
+    db.flush()
+
+    expected = _reference(db, players, {})
+    with _timed(timings, "recompute"):
+        queue.recompute(until=LAST_DAY)
+    for day in _scored_days():
+        _assert_stored("recompute", db, players, day, expected[day])
+
+    player_days = len(players) * len(_scored_days())
+    print(f"\nseed {seed}: {player_days} player-days - " +
+          ", ".join(f"{path} {ms:.0f} ms" for path, ms in timings.items()))
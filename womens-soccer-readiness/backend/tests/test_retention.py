@@ -0,0 +1,83 @@
+"""
+Archiving a season must move exactly the rows it wrote to Parquet - no more.
+"""
+from datetime import date, timedelta
+
+from sqlalchemy import func, select
+
+from app import models
+from app.services.retention import RetentionService
+
+SEASON = 2019
+SEASON_DAYS = [date(2019, 9, 1) + timedelta(days=offset) for offset in range(10)]
+
+
+def _old_team(db) -> models.Player:
+    team = models.Team(name="Archive Test FC", level="college")
+    db.add(team)
+    db.flush()
+    player = models.Player(team_id=team.team_id, name="Archived Player", position="MID", jersey_number=8)
+    db.add(player)
+    db.flush()
+    for day in SEASON_DAYS:
+        db.add(models.TrainingSession(
+            player_id=player.player_id, date=day, session_type="training",
+            duration_min=90, training_load=300.0, hr_zones={"zone1": 40, "zone2": 60},
+        ))
+    db.commit()
+    return player
+
+
+def test_archive_reads_back_and_keeps_rows_added_mid_run(db, tmp_path, monkeypatch):
+    player = _old_team(db)
+    retention = RetentionService(db, archive_dir=str(tmp_path), batch_size=3, season_start_month=8)
+
+    write_parquet = RetentionService._write_parquet
+    late_day = SEASON_DAYS[-1] + timedelta(days=1)
+
+    def write_then_late_import(self, *args):
+        row_count = write_parquet(self, *args)
+        # A Polar import for the same season, committed after the archive read
+        db.add(models.TrainingSession(player_id=player.player_id, date=late_day,
+                                      session_type="training", training_load=111.0))
+        db.commit()
+        return row_count
+
+    monkeypatch.setattr(RetentionService, "_write_parquet", write_then_late_import)
+    result = retention.archive_season(player.team_id, "training_sessions", SEASON)
+    assert result['archived'] == len(SEASON_DAYS)
+
+    rows = retention.read_archive(player.team_id, "training_sessions", SEASON, player_id=player.player_id)
+    assert sorted(row['date'] for row in rows) == SEASON_DAYS
+    assert all(row['training_load'] == 300.0 for row in rows)
+    assert rows[0]['hr_zones'] == {"zone1": 40, "zone2": 60}
+
+    left = db.execute(
+        select(models.TrainingSession.date, models.TrainingSession.training_load)
+        .where(models.TrainingSession.player_id == player.player_id)
+    ).all()
+    assert [tuple(row) for row in left] == [(late_day, 111.0)]
+
+    entry = db.execute(
+        select(models.ArchiveIndex.row_count).where(models.ArchiveIndex.team_id == player.team_id)
+    ).scalar_one()
+    assert entry == len(SEASON_DAYS)
+
+
+def test_rerun_archives_the_rows_left_behind(db, tmp_path):
+    player = _old_team(db)
+    retention = RetentionService(db, archive_dir=str(tmp_path), season_start_month=8)
+    retention.archive_season(player.team_id, "training_sessions", SEASON)
+
+    late_day = SEASON_DAYS[-1] + timedelta(days=1)
+    db.add(models.TrainingSession(player_id=player.player_id, date=late_day,
+                                  session_type="training", training_load=111.0))
+    db.commit()
+    assert retention.archive_season(player.team_id, "training_sessions", SEASON)['archived'] == 1
+
+    rows = retention.read_archive(player.team_id, "training_sessions", SEASON)
+    assert sorted(row['date'] for row in rows) == SEASON_DAYS + [late_day]
+    assert db.execute(
+        select(func.count()).select_from(models.TrainingSession)
+        .where(models.TrainingSession.player_id == player.player_id)
+    ).scalar() == 0
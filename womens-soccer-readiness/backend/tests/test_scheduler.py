@@ -0,0 +1,122 @@
+"""
+A scheduled run must store the same scores as refreshing each team by hand.
+"""
+import os
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.services import scheduler
+from app.services.scheduler import ReadinessScheduler
+
+DAY = date.today() - timedelta(days=10)
+
+_refresh_team = scheduler._refresh_team
+
+
+@pytest.fixture
+def scheduler_db(engine, seeded_team):
+    """A session plus a second, smaller team: two shards for two workers."""
+    with Session(engine) as db:
+        other = models.Team(name="Scheduler Test FC", level="club")
+        db.add(other)
+        db.flush()
+        db.add_all([models.Player(team_id=other.team_id, name=f"Reserve {n}") for n in range(3)])
+        db.commit()
+        try:
+            yield db, other
+        finally:
+            # Workers commit through their own connections: clean up by hand
+            db.rollback()
+            db.execute(delete(models.ReadinessRun))
+            db.execute(delete(models.ReadinessScore).where(models.ReadinessScore.date == DAY))
+            db.execute(delete(models.TeamDailySummary).where(models.TeamDailySummary.date == DAY))
+            db.execute(delete(models.FlagEvent).where(
+                models.FlagEvent.date == DAY,
+                models.FlagEvent.team_id.in_([seeded_team.team_id, other.team_id]),
+            ))
+            db.execute(delete(models.Player).where(models.Player.team_id == other.team_id))
+            db.execute(delete(models.Team).where(models.Team.team_id == other.team_id))
+            db.commit()
+
+
+def _scheduler(db, engine, **kwargs) -> ReadinessScheduler:
+    options = dict(workers=2, worker_connections=1, max_attempts=2,
+                   database_url=engine.url.render_as_string(hide_password=False), write_files=False)
+    options.update(kwargs)
+    return ReadinessScheduler(db, **options)
+
+
+def test_run_scores_every_team_in_worker_processes(engine, seeded_team, scheduler_db):
+    db, other = scheduler_db
+    run = _scheduler(db, engine).run(DAY)
+
+    assert run.status == 'succeeded'
+    assert run.team_count == run.succeeded_count == 2
+    assert run.duration_s is not None
+    results = {team.team_id: team for team in run.teams}
+    assert results[seeded_team.team_id].player_count > results[other.team_id].player_count == 3
+    assert all(team.attempts == 1 and team.duration_ms > 0 for team in results.values())
+
+    active = db.execute(
+        select(func.count()).select_from(models.Player)
+        .where(models.Player.is_active == True)
+    ).scalar_one()
+    scored = db.execute(
+        select(func.count()).select_from(models.ReadinessScore)
+        .where(models.ReadinessScore.date == DAY)
+    ).scalar_one()
+    assert scored == active
+    summaries = db.execute(
+        select(func.count()).select_from(models.TeamDailySummary)
+        .where(models.TeamDailySummary.date == DAY)
+    ).scalar_one()
+    assert summaries == 2
+
+
+_crash_marker = None
+
+
+def _die_once(team_id, day, write_files=True):
+    """Kill the worker process the first time it is called, like the OOM killer."""
+    if not os.path.exists(_crash_marker):
+        open(_crash_marker, 'w').close()
+        os._exit(1)
+    return _refresh_team(team_id, day, write_files)
+
+
+def test_dead_worker_is_retried_on_a_new_pool(engine, scheduler_db, tmp_path, monkeypatch):
+    db, _ = scheduler_db
+    # Workers are forked from this process, so they see the patched module
+    monkeypatch.setitem(globals(), '_crash_marker', str(tmp_path / 'crashed'))
+    monkeypatch.setattr(scheduler, '_refresh_team', _die_once)
+    monkeypatch.setattr(scheduler, 'RETRY_BACKOFF_S', 0.05)
+
+    run = _scheduler(db, engine).run(DAY)
+
+    assert run.status == 'succeeded'
+    assert run.succeeded_count == 2
+    assert max(team.attempts for team in run.teams) == 2
+    assert all(team.error is None for team in run.teams)
+
+
+def test_file_errors_are_recorded_apart_from_scoring(engine, scheduler_db, monkeypatch):
+    db, other = scheduler_db
+
+    def broken_write(self, team_id, *args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr('app.services.snapshots.SnapshotService.write_team', broken_write)
+    run = _scheduler(db, engine, write_files=True).run(DAY)
+
+    assert run.status == 'succeeded'
+    for team in run.teams:
+        assert team.status == 'succeeded' and team.attempts == 1
+        assert team.files_error == "OSError: disk full"
+    assert db.execute(
+        select(func.count()).select_from(models.ReadinessScore)
+        .where(models.ReadinessScore.date == DAY)
+    ).scalar_one() > 0
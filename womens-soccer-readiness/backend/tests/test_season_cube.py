@@ -0,0 +1,83 @@
+"""
+Season cubes: a memory-mapped cube must read back as the store it was
+written from, and appended days must appear to readers already mapping it.
+"""
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from app import models
+from app.config import settings
+from app.services.readiness_calculator import ReadinessCalculator
+from app.services.retention import season_of
+from app.services.season_cube import SeasonCubeService, cube_path, open_cube
+from app.services.season_store import SeasonStore
+
+
+YESTERDAY = date.today() - timedelta(days=1)
+
+
+@pytest.fixture
+def cubes(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "cube_dir", str(tmp_path))
+    return SeasonCubeService(db, season_start_month=YESTERDAY.month)
+
+
+def _assert_same(cube: SeasonStore, store: SeasonStore, first_day: date, last_day: date):
+    assert cube.player_ids == store.player_ids
+    first = (first_day - store.start_date).days
+    last = (last_day - store.start_date).days + 1
+    offset = (store.start_date - cube.start_date).days
+    for name in SeasonStore.METRICS:
+        np.testing.assert_array_equal(
+            getattr(cube, name)[:, first + offset:last + offset], getattr(store, name)[:, first:last], err_msg=name
+        )
+
+
+def test_cube_reads_back_and_scores_like_the_database(db, seeded_team, cubes):
+    path = cubes.rebuild(seeded_team.team_id, YESTERDAY)
+    assert path == cube_path(seeded_team.team_id, season_of(YESTERDAY, YESTERDAY.month))
+
+    cube = open_cube(path, seeded_team.team_id)
+    assert cube.end_date == YESTERDAY and not cube.writable
+    store = SeasonStore.load_days(db, seeded_team.team_id, YESTERDAY, YESTERDAY)
+    _assert_same(cube, store, store.start_date, YESTERDAY)
+
+    from_cube = ReadinessCalculator(db, store=cube)
+    from_queries = ReadinessCalculator(db)
+    for player_id in cube.player_ids:
+        actual = from_cube.calculate_player_readiness(player_id, YESTERDAY)
+        expected = from_queries.calculate_player_readiness(player_id, YESTERDAY)
+        assert actual['overall_score'] == pytest.approx(expected['overall_score'], abs=0.01)
+        assert actual['flag'] == expected['flag']
+
+
+def test_appended_days_reach_open_readers(db, seeded_team, cubes):
+    path = cubes.rebuild(seeded_team.team_id, YESTERDAY - timedelta(days=3))
+    reader = open_cube(path, seeded_team.team_id)
+    inode = path.stat().st_ino
+    assert reader.end_date == YESTERDAY - timedelta(days=3)
+
+    assert cubes.append(seeded_team.team_id, YESTERDAY) == path
+    assert path.stat().st_ino == inode  # appended in place, not rewritten
+
+    again = open_cube(path, seeded_team.team_id)
+    assert again.end_date == YESTERDAY
+    assert reader.end_date == YESTERDAY - timedelta(days=3)  # a store handed out earlier doesn't change
+    assert np.shares_memory(again.load, reader.load)  # same mapping, not remapped
+    store = SeasonStore.load_days(db, seeded_team.team_id, YESTERDAY, YESTERDAY)
+    _assert_same(again, store, YESTERDAY - timedelta(days=3), YESTERDAY)
+
+
+def test_new_player_rewrites_the_cube(db, seeded_team, cubes):
+    path = cubes.rebuild(seeded_team.team_id, YESTERDAY - timedelta(days=1))
+    inode = path.stat().st_ino
+    db.add(models.Player(team_id=seeded_team.team_id, name="Late Signing"))
+    db.flush()
+
+    cubes.append(seeded_team.team_id, YESTERDAY)
+    assert path.stat().st_ino != inode
+    cube = open_cube(path, seeded_team.team_id)
+    assert len(cube.player_ids) == len(SeasonStore.load_days(db, seeded_team.team_id, YESTERDAY, YESTERDAY).player_ids)
+    assert cube.end_date == YESTERDAY
@@ -0,0 +1,91 @@
+"""
+Season stores must give the calculator exactly what its queries would.
+"""
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import func, select
+
+from app import models
+from app.routes.readiness import add_readiness
+from app.schemas.wellness import WellnessCheckCreate
+from app.services.readiness_calculator import ReadinessCalculator
+from app.services.season_store import SeasonStore
+from query_plans import record_queries
+
+
+LAST_DAY = date.today() - timedelta(days=1)
+FIRST_DAY = LAST_DAY - timedelta(days=6)
+
+
+def _days():
+    return [FIRST_DAY + timedelta(days=offset) for offset in range((LAST_DAY - FIRST_DAY).days + 1)]
+
+
+def test_store_scores_match_queries(engine, db, seeded_team):
+    with record_queries(engine) as recorder:
+        store = SeasonStore.load_days(db, seeded_team.team_id, FIRST_DAY, LAST_DAY)
+    assert len(recorder) == 3  # squad, sessions, wellness checks
+
+    from_queries = ReadinessCalculator(db)
+    from_store = ReadinessCalculator(db, store=store)
+    for player_id in store.player_ids:
+        for day in _days():
+            expected = from_queries.calculate_player_readiness(player_id, day)
+            with record_queries(engine) as recorder:
+                actual = from_store.calculate_player_readiness(player_id, day)
+            assert len(recorder) == 0
+            assert actual['overall_score'] == pytest.approx(expected['overall_score'], abs=0.01)
+            assert actual['flag'] == expected['flag']
+            assert actual['components'] == pytest.approx(expected['components'], abs=0.01)
+            assert actual['details'] == pytest.approx(expected['details'], abs=0.1)
+            assert actual['recommendations'] == expected['recommendations']
+
+
+def test_writes_applied_in_place_match_a_reload(db, seeded_team):
+    store = SeasonStore.load_days(db, seeded_team.team_id, FIRST_DAY, LAST_DAY)
+    player_id = store.player_ids[0]
+    rest_day = LAST_DAY - timedelta(days=2)
+
+    session = models.TrainingSession(player_id=player_id, date=rest_day, session_type="extra",
+                                     training_load=333.0, distance_m=4200.0, avg_hr=151, max_hr=188)
+    db.add(session)
+    check = db.execute(
+        select(models.WellnessCheck).where(models.WellnessCheck.player_id == player_id,
+                                           models.WellnessCheck.date == LAST_DAY)
+    ).scalar_one()
+    check.fatigue, check.resting_hr, check.resting_hr_z = 5, 61, 2.4
+    db.flush()
+
+    store.apply_session(player_id, rest_day, 333.0, 4200.0, 151, 188)
+    store.apply_wellness(player_id, LAST_DAY,
+                         ReadinessCalculator.score_wellness(check.sleep_quality, check.fatigue, check.soreness,
+                                                            check.stress, check.mood),
+                         resting_hr=61, hrv=check.hrv, resting_hr_z=2.4, hrv_z=check.hrv_z)
+
+    reloaded = SeasonStore.load_days(db, seeded_team.team_id, FIRST_DAY, LAST_DAY)
+    for name in SeasonStore.METRICS:
+        np.testing.assert_allclose(getattr(store, name), getattr(reloaded, name), rtol=1e-6, err_msg=name)
+
+
+def test_resubmitted_check_replaces_the_day(db, seeded_team):
+    store = SeasonStore.load_days(db, seeded_team.team_id, FIRST_DAY, LAST_DAY)
+    player_id = store.player_ids[0]
+    for fatigue, resting_hr in ((1, 52), (5, 64)):
+        row = add_readiness(WellnessCheckCreate(player_id=player_id, date=LAST_DAY, sleep_quality=3,
+                                                soreness=3, fatigue=fatigue, stress=3, mood=3,
+                                                resting_hr=resting_hr), db)
+    assert (row.fatigue, row.resting_hr) == (5, 64)
+    assert db.execute(
+        select(func.count()).select_from(models.WellnessCheck)
+        .where(models.WellnessCheck.player_id == player_id, models.WellnessCheck.date == LAST_DAY)
+    ).scalar() == 1
+
+    score = ReadinessCalculator.score_wellness(3, 5, 3, 3, 3)
+    store.apply_wellness(player_id, LAST_DAY, score, resting_hr=64, resting_hr_z=row.resting_hr_z)
+    reloaded = SeasonStore.load_days(db, seeded_team.team_id, FIRST_DAY, LAST_DAY)
+    for name in ('wellness_score', 'resting_hr', 'resting_hr_z', 'has_check'):
+        np.testing.assert_allclose(getattr(store, name), getattr(reloaded, name), rtol=1e-6, err_msg=name)
+    assert ReadinessCalculator(db).calculate_player_readiness(player_id, LAST_DAY)['components']['wellness'] == \
+        ReadinessCalculator(db, store=reloaded).calculate_player_readiness(player_id, LAST_DAY)['components']['wellness']
@@ -0,0 +1,108 @@
+"""
+Season snapshots must hold the same numbers as the tables they were built from.
+"""
+from datetime import date, timedelta
+from uuid import UUID
+
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from app import models
+from app.config import settings
+from app.db import get_read_db
+from app.routes import teams
+from app.services.dirty_queue import DirtyQueue
+from app.services.readiness_calculator import ReadinessCalculator
+from app.services.snapshots import SnapshotService, _open_snapshot
+
+
+YESTERDAY = date.today() - timedelta(days=1)
+
+
+@pytest.fixture
+def snapshots(db, tmp_path):
+    return SnapshotService(db, snapshot_dir=str(tmp_path), season_start_month=YESTERDAY.month)
+
+
+def test_snapshot_slice_matches_database(db, seeded_team, snapshots):
+    yesterday = YESTERDAY
+    ReadinessCalculator(db).refresh_team_day(seeded_team.team_id, yesterday)
+    season = snapshots.current_season(yesterday)
+    path = snapshots.write_team(seeded_team.team_id, season, today=yesterday)
+    assert path is not None
+    assert not _open_snapshot(path)[1].flags.owndata  # dates searched in the mapped file
+
+    table = snapshots.read(seeded_team.team_id, season, yesterday, yesterday)
+    matrices = SnapshotService.to_matrices(table)
+    players = matrices['players']
+    assert matrices['dates'] == [yesterday]
+    assert table.num_rows == len(players) > 0
+
+    for column, player in enumerate(players):
+        player_id = UUID(player['player_id'])
+        load = db.execute(
+            select(func.sum(models.TrainingSession.training_load)).where(
+                models.TrainingSession.player_id == player_id,
+                models.TrainingSession.date == yesterday,
+            )
+        ).scalar()
+        score = db.execute(
+            select(models.ReadinessScore.overall_score).where(
+                models.ReadinessScore.player_id == player_id,
+                models.ReadinessScore.date == yesterday,
+            )
+        ).scalar_one()
+        assert matrices['training_load'][0][column] == (None if load is None else pytest.approx(load, abs=0.01))
+        assert matrices['overall_score'][0][column] == pytest.approx(score, abs=0.01)
+
+
+def test_missing_snapshot_reads_as_none(seeded_team, snapshots):
+    assert snapshots.read(seeded_team.team_id, 1999) is None
+
+
+def test_etag_names_the_team_and_season(db, seeded_team, snapshots, monkeypatch):
+    monkeypatch.setattr(settings, 'snapshot_dir', str(snapshots.snapshot_dir))
+    season = snapshots.current_season(YESTERDAY)
+    paths = [snapshots.write_team(seeded_team.team_id, year, today=YESTERDAY) for year in (season - 1, season)]
+    for path in paths:  # rewritten in the same instant
+        os.utime(path, ns=(paths[0].stat().st_mtime_ns, paths[0].stat().st_mtime_ns))
+    app = FastAPI()
+    app.include_router(teams.router)
+    app.dependency_overrides[get_read_db] = lambda: db
+    client = TestClient(app)
+    url = f"/teams/{seeded_team.team_id}/snapshot"
+
+    etags = [client.get(url, params={"season": year}).headers["etag"] for year in (season - 1, season)]
+    assert etags[0] != etags[1]
+    assert str(seeded_team.team_id) in etags[1]
+    assert client.get(url, params={"season": season}, headers={"If-None-Match": etags[1]}).status_code == 304
+    assert client.get(url, params={"season": season - 1}, headers={"If-None-Match": etags[1]}).status_code == 200
+
+
+def test_recompute_rewrites_the_snapshot(db, seeded_team, snapshots, monkeypatch):
+    monkeypatch.setattr(settings, 'snapshot_dir', str(snapshots.snapshot_dir))
+    monkeypatch.setattr(settings, 'season_start_month', snapshots.season_start_month)
+    ReadinessCalculator(db).refresh_team_day(seeded_team.team_id, YESTERDAY)
+    season = snapshots.current_season(YESTERDAY)
+    snapshots.write_team(seeded_team.team_id, season)
+    before = snapshots.read(seeded_team.team_id, season, YESTERDAY, YESTERDAY)
+    player_id = UUID(SnapshotService.to_matrices(before)['players'][0]['player_id'])
+
+    db.add(models.TrainingSession(player_id=player_id, date=YESTERDAY, session_type="match",
+                                  duration_min=95, training_load=2500))
+    queue = DirtyQueue(db)
+    queue.mark_sessions([(player_id, YESTERDAY)])
+    db.commit()
+    queue.recompute(until=YESTERDAY)
+
+    after = SnapshotService.to_matrices(snapshots.read(seeded_team.team_id, season, YESTERDAY, YESTERDAY))
+    score = db.execute(
+        select(models.ReadinessScore.overall_score)
+        .where(models.ReadinessScore.player_id == player_id, models.ReadinessScore.date == YESTERDAY)
+    ).scalar_one()
+    assert after['overall_score'][0][0] == pytest.approx(score, abs=0.01)
+    assert after['overall_score'][0][0] != SnapshotService.to_matrices(before)['overall_score'][0][0]
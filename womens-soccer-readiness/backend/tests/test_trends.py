@@ -0,0 +1,117 @@
+"""
+Team trends must agree with the readiness engine over the same sessions.
+"""
+import math
+from collections import defaultdict
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app import models
+from app.schemas.trends import TeamTrends
+from app.services.readiness_calculator import ReadinessCalculator
+from app.services.trends import PERCENTILES, TeamTrendsService
+
+
+def _calculator_acwrs(db, team, day):
+    """(ACWR, acute load) of every active player, by position, as the engine scores them."""
+    calculator = ReadinessCalculator(db)
+    by_position = defaultdict(list)
+    players = db.execute(
+        select(models.Player.player_id, models.Player.position)
+        .where(models.Player.team_id == team.team_id, models.Player.is_active == True)
+    ).all()
+    for player_id, position in players:
+        acwr, details = calculator._calculate_acwr(player_id, day)
+        by_position[position or 'Unknown'].append((acwr, details['acute_load']))
+    return by_position
+
+
+def _nearest_rank(values, p):
+    values = sorted(values)
+    return values[math.ceil(p / 100 * len(values)) - 1]
+
+
+def _training_day():
+    """A recent day with sessions on it and on day-7 and day-28 (seed data skips Sundays)."""
+    day = date.today() - timedelta(days=1)
+    return day if day.weekday() != 6 else day - timedelta(days=1)
+
+
+def test_trends_match_the_calculator(db, seeded_team):
+    end = _training_day()
+    # No sessions at all: the engine's neutral 1.0, not a missing ACWR
+    db.add(models.Player(team_id=seeded_team.team_id, name="New Signing", position="GK"))
+    db.flush()
+    trends = TeamTrendsService(db).team_trends(seeded_team.team_id, end - timedelta(days=6), end)
+    reference = _calculator_acwrs(db, seeded_team, end)
+
+    everyone = [acwr for values in reference.values() for acwr, _ in values]
+    for p in PERCENTILES:
+        assert trends['team'][f'acwr_p{p}'][-1] == pytest.approx(_nearest_rank(everyone, p), abs=1e-3)
+    for position, values in reference.items():
+        acwrs = [acwr for acwr, _ in values]
+        series = trends['positions'][position]
+        assert series['players'][-1] == len(values)
+        assert series['acwr_p50'][-1] == pytest.approx(_nearest_rank(acwrs, 50), abs=1e-3)
+        assert series['acwr_mean'][-1] == pytest.approx(sum(acwrs) / len(acwrs), abs=1e-3)
+        assert series['acute_load'][-1] == pytest.approx(sum(acute for _, acute in values) / len(values), abs=0.1)
+
+    bands = ('acwr_low', 'acwr_optimal', 'acwr_high', 'acwr_danger')
+    assert sum(trends['team'][band][-1] for band in bands) == len(everyone)
+
+
+def test_workload_series_match_the_calculator(db, seeded_team):
+    end = _training_day()
+    sessions = db.execute(
+        select(models.TrainingSession)
+        .join(models.Player, models.Player.player_id == models.TrainingSession.player_id)
+        .where(models.Player.team_id == seeded_team.team_id,
+               models.TrainingSession.date >= end - timedelta(days=28))
+    ).scalars().all()
+    for number, session in enumerate(sessions):
+        session.distance_m = 3000.0 + 37 * (number % 50)
+        # Sessions with RPE but no device load count as sRPE
+        if number % 9 == 0:
+            session.training_load, session.rpe, session.duration_min = None, 6, 75
+    db.flush()
+
+    calculator = ReadinessCalculator(db)
+    player_ids = db.execute(
+        select(models.Player.player_id)
+        .where(models.Player.team_id == seeded_team.team_id, models.Player.is_active == True)
+    ).scalars().all()
+    profiles = [calculator.calculate_player_readiness(player_id, end) for player_id in player_ids]
+
+    def mean(values):
+        values = [value for value in values if value is not None]
+        return sum(values) / len(values) if values else None
+
+    team = TeamTrendsService(db).team_trends(seeded_team.team_id, end, end, workload=True)['team']
+    assert team['acwr_mean'][-1] == pytest.approx(mean(p['components']['acwr'] for p in profiles), abs=0.01)
+    assert team['acute_load'][-1] == pytest.approx(mean(p['details']['acute_load'] for p in profiles), abs=0.1)
+    for metric in ('distance', 'high_speed_running', 'sprint_distance', 'accelerations'):
+        expected = mean(p['workload']['acwr'][metric] for p in profiles)
+        assert team[f'{metric}_acwr_mean'][-1] == (None if expected is None else pytest.approx(expected, abs=0.01))
+    assert team['sprint_distance_acwr_mean'][-1] is None  # nobody has any
+    assert team['monotony_mean'][-1] == pytest.approx(mean(p['workload']['monotony'] for p in profiles), abs=0.01)
+    assert team['strain_mean'][-1] == pytest.approx(mean(p['workload']['strain'] for p in profiles), abs=0.1)
+
+    default = TeamTrendsService(db).team_trends(seeded_team.team_id, end, end)['team']
+    assert 'monotony_mean' not in default and default['acwr_mean'] == team['acwr_mean']
+
+
+def test_empty_squad_has_a_value_for_every_day(db):
+    team = models.Team(name="Empty Squad FC", level="college")
+    db.add(team)
+    db.flush()
+    end = date.today()
+    trends = TeamTrendsService(db).team_trends(team.team_id, end - timedelta(days=6), end, workload=True)
+
+    assert len(trends['dates']) == 7
+    assert trends['positions'] == {}
+    assert all(len(series) == 7 for series in trends['team'].values())
+    assert trends['team']['players'] == [0] * 7
+    assert trends['team']['acwr_mean'] == [None] * 7
+    TeamTrends.model_validate(trends)
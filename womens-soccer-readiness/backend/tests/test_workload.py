@@ -0,0 +1,61 @@
+"""
+Session-RPE load and the multi-metric workload profile: one window query,
+every metric's ratio, Foster monotony and strain.
+"""
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+
+from app import models
+from app.services.readiness_calculator import (
+    WINDOW_DAYS, WORKLOAD_METRICS, ReadinessCalculator, workload_profile,
+)
+from query_plans import record_queries
+
+
+DAY = date.today() - timedelta(days=1)
+
+
+def test_profile_ratios_monotony_and_strain():
+    daily = np.zeros((len(WORKLOAD_METRICS), WINDOW_DAYS))
+    week = [300.0, 0.0, 450.0, 300.0, 0.0, 600.0, 150.0]
+    daily[0, -7:] = week
+    daily[0, :-8] = 200.0
+    daily[1, -3:] = 5000.0  # distance: this week only
+
+    profile = workload_profile(daily)
+
+    acute, chronic = sum(week), sum(week) + 200.0 * (WINDOW_DAYS - 8)
+    assert profile['acute']['load'] == acute and profile['chronic']['load'] == chronic
+    assert profile['acwr']['load'] == round((acute / 7) / (chronic / 28), 2)
+    assert profile['acwr']['distance'] == 4.0
+    assert profile['acwr']['accelerations'] is None  # no chronic load
+    monotony = np.mean(week) / np.std(week)
+    assert profile['monotony'] == round(monotony, 2)
+    assert profile['strain'] == round(sum(week) * monotony, 1)
+
+    assert workload_profile(np.zeros_like(daily))['monotony'] is None
+
+
+def test_srpe_fills_missing_load_without_extra_queries(engine, db, seeded_team):
+    player_id = db.execute(
+        select(models.Player.player_id).where(models.Player.team_id == seeded_team.team_id)
+    ).scalars().first()
+    calculator = ReadinessCalculator(db)
+    before = calculator.calculate_player_readiness(player_id, DAY)
+
+    # Logged without a monitor: RPE 6 for 50 minutes is 300 AU
+    db.add(models.TrainingSession(player_id=player_id, date=DAY, session_type="extra",
+                                  duration_min=50, rpe=6, high_speed_running_m=640.0, accelerations=31))
+    db.flush()
+    with record_queries(engine) as recorder:
+        after = calculator.calculate_player_readiness(player_id, DAY)
+    assert len(recorder) == 3  # the same ACWR window, wellness and last-session queries
+
+    assert after['details']['acute_load'] == pytest.approx(before['details']['acute_load'] + 300, abs=0.1)
+    assert after['workload']['acute']['load'] == after['details']['acute_load']
+    assert after['workload']['acute']['high_speed_running'] == 640.0
+    assert after['workload']['acute']['accelerations'] == 31.0
+    assert after['workload']['acwr']['accelerations'] == 4.0
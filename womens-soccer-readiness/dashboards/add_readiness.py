@@ -1,17 +1,15 @@
 import streamlit as st
-import requests
-import os
 
-API_URL = os.getenv("API_URL", "http://127.0.0.1:8000/")
+import client
 
 st.title("Add Readiness Entry")
 
-player_id = st.number_input("Player ID", min_value=1, step=1)
-fatigue = st.slider("Fatigue (1-10)", 1, 10, 5)
+player_id = st.text_input("Player ID")
+fatigue = st.slider("Fatigue (1-5)", 1, 5, 3)
 sleep_hours = st.number_input("Sleep Hours", min_value=0.0, max_value=12.0, step=0.5)
 
 if st.button("Submit Readiness"):
-    response = requests.post(API_URL + "readiness/", json={
+    response = client.post_json("readiness/", {
         "player_id": player_id,
         "fatigue": fatigue,
         "sleep_hours": sleep_hours
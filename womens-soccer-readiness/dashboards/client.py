@@ -0,0 +1,174 @@
+"""
+Shared API access for the Streamlit dashboards.
+
+Streamlit re-runs the whole page script on every widget interaction, so a
+bare `requests.get` per rerun means a new TCP (and TLS) connection and a
+full download each time. This module gives every page:
+
+- one pooled `requests.Session` per server process (st.cache_resource),
+  so connections are reused across reruns and users;
+- reads cached with st.cache_data, keyed on the team's data versions from
+  `GET /teams/{id}/version` - a rerun costs one tiny version check, and the
+  data is downloaded again only after it changed;
+- batch helpers that fetch several resources concurrently over the pool;
+- `stream_events` for the API's server-sent event streams.
+"""
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+API_URL = os.getenv("API_URL", "http://127.0.0.1:8000/")
+POOL_SIZE = int(os.getenv("API_POOL_SIZE", "10"))
+TIMEOUT = (5, 30)  # connect, read seconds
+STREAM_TIMEOUT = (5, 60)  # the API sends a keepalive every 15 seconds
+VERSION_TTL = 5    # seconds between version checks of one team
+
+
+@st.cache_resource
+def http_session() -> requests.Session:
+    """The process-wide pooled session. Idempotent requests retry on connection errors."""
+    session = requests.Session()
+    retry = Retry(total=2, backoff_factor=0.2, allowed_methods=frozenset({"GET"}))
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _get(session: requests.Session, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    response = session.get(API_URL + path, params=params, timeout=TIMEOUT)
+    response.raise_for_status()
+    return response.json()
+
+
+def get_json(path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    return _get(http_session(), path, params)
+
+
+def post_json(path: str, payload: Dict[str, Any]) -> requests.Response:
+    """POST and return the response; callers show errors from its body."""
+    return http_session().post(API_URL + path, json=payload, timeout=TIMEOUT)
+
+
+def get_many(requests_: Sequence[Tuple[str, Optional[Dict[str, Any]]]]) -> List[Any]:
+    """Fetch several (path, params) GETs concurrently; results in the same order."""
+    # Resolve the session here: worker threads have no Streamlit script context
+    session = http_session()
+    if len(requests_) <= 1:
+        return [_get(session, path, params) for path, params in requests_]
+    with ThreadPoolExecutor(max_workers=min(POOL_SIZE, len(requests_))) as pool:
+        return list(pool.map(lambda request: _get(session, *request), requests_))
+
+
+@st.cache_data(ttl=VERSION_TTL, show_spinner=False)
+def data_versions(team_id: str) -> Dict[str, str]:
+    """Change markers for the team's data (see the API's /teams/{id}/version)."""
+    return get_json(f"teams/{team_id}/version")
+
+
+# Cached reads. `version` is part of the cache key only: when the API
+# reports a new version the old entry is simply never asked for again.
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _squad_readiness(team_id: str, day: Optional[str], version: str) -> List[Dict[str, Any]]:
+    return get_json(f"teams/{team_id}/readiness", {"day": day} if day else None)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _team_summary(team_id: str, days: int, version: str) -> List[Dict[str, Any]]:
+    return get_json(f"teams/{team_id}/summary", {"limit": days})
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _player_histories(player_ids: Tuple[str, ...], days: int, version: str) -> Dict[str, List[Dict[str, Any]]]:
+    histories = get_many([("readiness/", {"player_id": player_id, "limit": days}) for player_id in player_ids])
+    return dict(zip(player_ids, histories))
+
+
+def squad_readiness(team_id: str, day: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Every active player with their score for `day` (default: latest scored day)."""
+    versions = data_versions(team_id)
+    return _squad_readiness(team_id, day, f"{versions['players']}|{versions['readiness']}")
+
+
+def team_summary(team_id: str, days: int = 60) -> List[Dict[str, Any]]:
+    """Daily team summary rows, oldest first."""
+    return _team_summary(team_id, days, data_versions(team_id)["readiness"])
+
+
+def player_histories(team_id: str, player_ids: Sequence[str], days: int = 28) -> Dict[str, List[Dict[str, Any]]]:
+    """Recent readiness scores of several players, fetched concurrently."""
+    return _player_histories(tuple(sorted(player_ids)), days, data_versions(team_id)["readiness"])
+
+
+@st.cache_resource
+def _snapshots() -> Dict[Tuple[str, Optional[int]], Tuple[str, Any]]:
+    """Last snapshot per (team, season) with its ETag, shared by all sessions."""
+    return {}
+
+
+def season_snapshot(team_id: str, season: Optional[int] = None):
+    """
+    The team's season snapshot as a DataFrame (one row per day and player).
+
+    Revalidated with If-None-Match on every call: an unchanged snapshot is
+    an empty 304, so only a rewritten file is downloaded again.
+    """
+    import pyarrow as pa
+
+    cache = _snapshots()
+    key = (team_id, season)
+    cached = cache.get(key)
+    response = http_session().get(
+        API_URL + f"teams/{team_id}/snapshot",
+        params={"season": season} if season is not None else None,
+        headers={"If-None-Match": cached[0]} if cached else None,
+        timeout=TIMEOUT,
+    )
+    if response.status_code == 304 and cached:
+        return cached[1]
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    frame = pa.ipc.open_stream(response.content).read_all().to_pandas()
+    cache[key] = (response.headers.get("ETag"), frame)
+    return frame
+
+
+def _read_events(response: requests.Response) -> Iterator[Tuple[str, Any]]:
+    event_type, data_lines = "message", []
+    for line in response.iter_lines(decode_unicode=True):
+        if line is None:
+            continue
+        if line == "":
+            if data_lines:
+                yield event_type, json.loads("\n".join(data_lines))
+            event_type, data_lines = "message", []
+        elif line.startswith("event:"):
+            event_type = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[len("data:"):].strip())
+        # comments (": keepalive") and retry hints are ignored
+
+
+def stream_events(path: str) -> Iterator[Tuple[str, Any]]:
+    """
+    Yield (event_type, data) pairs from a text/event-stream endpoint.
+
+    The stream holds one of the pooled connections until the caller stops
+    iterating or the server closes it.
+    """
+    with http_session().get(API_URL + path, stream=True, timeout=STREAM_TIMEOUT) as response:
+        response.raise_for_status()
+        yield from _read_events(response)
+
+
+def invalidate() -> None:
+    """Forget version checks after a write, so the next read sees it immediately."""
+    data_versions.clear()
@@ -0,0 +1,29 @@
+import requests
+import streamlit as st
+
+import client
+
+# Flag colours match the readiness engine's traffic-light system
+FLAG_ICONS = {"green": "🟢", "yellow": "🟡", "red": "🔴"}
+
+st.title("Live Readiness Alerts")
+
+team_id = st.text_input("Team ID")
+
+if team_id and st.toggle("Listen for changes"):
+    # One long-lived request instead of polling: the API pushes flag
+    # transitions and finished imports as they happen
+    feed = st.container()
+    try:
+        for event_type, data in client.stream_events(f"teams/{team_id}/events"):
+            if event_type == "readiness_flag":
+                icon = FLAG_ICONS.get(data["flag"], "⚪")
+                message = f"{icon} Player {data['player_id']} is now **{data['flag']}** ({data['date']})"
+                if data["flag"] == "red":
+                    feed.error(message)
+                else:
+                    feed.info(message)
+            elif event_type == "import_completed":
+                feed.success(f"Polar import finished: {data['sessions_count']} sessions")
+    except requests.RequestException as e:
+        st.error(f"Event stream closed: {e}")
@@ -0,0 +1,83 @@
+import requests
+import streamlit as st
+
+import client
+
+# Flag colours match the readiness engine's traffic-light system
+FLAG_ICONS = {"green": "🟢", "yellow": "🟡", "red": "🔴"}
+
+st.title("Team Readiness")
+
+team_id = st.text_input("Team ID")
+if not team_id:
+    st.stop()
+
+try:
+    # One API call for the whole squad; reruns are served from cache
+    # until the API reports a new readiness version
+    squad = client.squad_readiness(team_id)
+except requests.RequestException as e:
+    st.error(f"Could not load the squad: {e}")
+    st.stop()
+
+scored = [player for player in squad if player["readiness_flag"]]
+day = scored[0]["date"] if scored else None
+st.caption(f"Scores for {day}" if day else "No readiness scores yet")
+
+columns = st.columns(4)
+for column, flag in zip(columns, ("green", "yellow", "red")):
+    column.metric(f"{FLAG_ICONS[flag]} {flag.title()}",
+                  sum(1 for player in scored if player["readiness_flag"] == flag))
+scores = [player["overall_score"] for player in scored if player["overall_score"] is not None]
+columns[3].metric("Average", f"{sum(scores) / len(scores):.0f}" if scores else "-")
+
+if st.button("Recalculate today"):
+    response = client.post_json(f"teams/{team_id}/readiness", {})
+    if response.status_code == 200:
+        client.invalidate()
+        st.rerun()
+    else:
+        st.error("Error: " + response.text)
+
+st.dataframe(
+    [
+        {
+            "": FLAG_ICONS.get(player["readiness_flag"], "⚪"),
+            "#": player["jersey_number"],
+            "Player": player["name"],
+            "Position": player["position"],
+            "Score": player["overall_score"],
+            "ACWR": player["acwr"],
+            "Recommendation": (player["recommendations"] or [""])[0],
+        }
+        for player in squad
+    ],
+    hide_index=True,
+)
+
+summary = client.team_summary(team_id)
+if summary:
+    st.subheader("Season trend")
+    st.line_chart(summary, x="date", y=["average_readiness", "wellness_completion_rate"])
+
+snapshot = client.season_snapshot(team_id)
+if snapshot is not None and len(snapshot):
+    st.subheader("Season load and wellness")
+    daily = snapshot.groupby("date").agg(
+        training_load=("training_load", "sum"), wellness=("wellness_score", "mean")
+    )
+    st.bar_chart(daily, y="training_load")
+    st.line_chart(daily, y="wellness")
+
+names = {player["player_id"]: player["name"] for player in squad}
+selected = st.multiselect("Compare players", options=list(names), format_func=names.get)
+if selected:
+    histories = client.player_histories(team_id, selected)
+    st.line_chart(
+        [
+            {"date": score["date"], "player": names[player_id], "score": score["overall_score"]}
+            for player_id, scores in histories.items()
+            for score in scores
+        ],
+        x="date", y="score", color="player",
+    )